@@ -4,10 +4,26 @@ import streamlit as st
 from config import setup_page_config, apply_custom_css
 from data_loader import load_data, get_season_races, get_race_options
 from race_display import display_race_page
+from prefetch import prefetch_adjacent_rounds, display_prefetch_stats
+from career_display import display_career_page
+from circuit_display import display_circuit_page
+from records_display import display_records_page
+from head_to_head_display import display_head_to_head_page
+from season_display import display_season_comparison_page
 
 setup_page_config()
 apply_custom_css()
 
+# Pages in the sidebar selector: label -> display function taking the data dictionary
+PAGES = {
+    "🏁 Races": lambda data: create_top_navigation(data),
+    "👤 Careers": display_career_page,
+    "🗺️ Circuits": display_circuit_page,
+    "⚔️ Head to Head": display_head_to_head_page,
+    "📊 Seasons": display_season_comparison_page,
+    "🏆 Records": display_records_page,
+}
+
 def main():
     """Main application function"""
     # Load data
@@ -15,8 +31,9 @@ def main():
     if data is None:
         st.stop()
     
-    # Create top navigation for race selection
-    create_top_navigation(data)
+    # Page selection, race pages by default
+    page = st.sidebar.radio("Page", list(PAGES), key="page_select")
+    PAGES[page](data)
 
 def create_top_navigation(data):
     """Create top navigation with season and race selection using selectboxes"""
@@ -87,6 +104,10 @@ def create_top_navigation(data):
         
         # Display selected race page
         display_race_page(selected_race, data)
+        
+        # Warm up the neighbouring rounds for the next navigation
+        prefetch_adjacent_rounds(selected_race, season_races, data)
+        display_prefetch_stats()
     else:
         st.error("No races found for selected season")
 
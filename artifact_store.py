@@ -0,0 +1,123 @@
+"""Local store of precomputed per-race artifacts for the F1 Dashboard
+
+precompute.py writes one gzip-compressed JSON record per race into ARTIFACT_DIR
+together with a manifest naming the data snapshot it was built from. The app
+reads these directly and falls back to a live build when the store is missing
+or was built from a different snapshot of f1_data.
+"""
+
+import os
+import json
+import gzip
+import hashlib
+from functools import lru_cache
+
+from race_artifacts import build_race_artifacts
+
+DATA_DIR = 'f1_data'
+ARTIFACT_DIR = 'artifacts'
+MANIFEST_FILE = 'manifest.json'
+ARTIFACT_FORMAT = 10
+
+_snapshot_hashes = {}
+
+def data_snapshot_signature(data_dir=DATA_DIR):
+    """Cheap signature of the data files: (name, size, mtime) of every CSV"""
+    signature = []
+    for name in sorted(os.listdir(data_dir)):
+        if name.endswith('.csv'):
+            stat = os.stat(os.path.join(data_dir, name))
+            signature.append((name, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+def data_snapshot_hash(data_dir=DATA_DIR):
+    """Content hash of the data files, recomputed only when their signature changes"""
+    signature = data_snapshot_signature(data_dir)
+    if signature not in _snapshot_hashes:
+        digest = hashlib.sha1()
+        for name, _, _ in signature:
+            digest.update(name.encode())
+            with open(os.path.join(data_dir, name), 'rb') as f:
+                digest.update(f.read())
+        _snapshot_hashes[signature] = digest.hexdigest()
+    return _snapshot_hashes[signature]
+
+def race_artifact_path(race_id, artifact_dir=ARTIFACT_DIR):
+    """Path of the artifact file for a race"""
+    return os.path.join(artifact_dir, 'races', f"{int(race_id)}.json.gz")
+
+def json_default(value):
+    """Serialize numpy scalars that slip into the records"""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def serialize_artifacts(artifacts):
+    """Encode race artifacts as compact gzip-compressed JSON"""
+    payload = json.dumps(artifacts, separators=(',', ':'), default=json_default, allow_nan=False)
+    return gzip.compress(payload.encode('utf-8'), compresslevel=6)
+
+def deserialize_artifacts(blob):
+    """Decode race artifacts written by serialize_artifacts"""
+    return json.loads(gzip.decompress(blob))
+
+def write_race_artifacts(artifacts, artifact_dir=ARTIFACT_DIR):
+    """Write one race's artifacts to the store"""
+    path = race_artifact_path(artifacts['raceId'], artifact_dir)
+    with open(path, 'wb') as f:
+        f.write(serialize_artifacts(artifacts))
+    return path
+
+def write_manifest(snapshot, race_count, artifact_dir=ARTIFACT_DIR):
+    """Record which data snapshot the store was built from"""
+    manifest = {'format': ARTIFACT_FORMAT, 'snapshot': snapshot, 'races': race_count}
+    with open(os.path.join(artifact_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f)
+    return manifest
+
+def read_manifest(artifact_dir=ARTIFACT_DIR):
+    """Read the store manifest, or None if there is no usable store"""
+    path = os.path.join(artifact_dir, MANIFEST_FILE)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    return _read_manifest(path, mtime)
+
+@lru_cache(maxsize=4)
+def _read_manifest(path, mtime):
+    """Read and validate a manifest file (cached per modification time)"""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('format') == ARTIFACT_FORMAT else None
+
+def store_is_current(artifact_dir=ARTIFACT_DIR, data_dir=DATA_DIR):
+    """Check that the store exists and was built from the current data files"""
+    manifest = read_manifest(artifact_dir)
+    return manifest is not None and manifest['snapshot'] == data_snapshot_hash(data_dir)
+
+@lru_cache(maxsize=256)
+def _load_race_artifacts(path, snapshot):
+    """Read one race's artifacts (cached per snapshot)"""
+    try:
+        with open(path, 'rb') as f:
+            return deserialize_artifacts(f.read())
+    except (OSError, ValueError):
+        return None
+
+def load_race_artifacts(race_id, artifact_dir=ARTIFACT_DIR, data_dir=DATA_DIR):
+    """Look up a race's precomputed artifacts, or None if the store is missing or stale"""
+    manifest = read_manifest(artifact_dir)
+    if manifest is None or manifest['snapshot'] != data_snapshot_hash(data_dir):
+        return None
+    return _load_race_artifacts(race_artifact_path(race_id, artifact_dir), manifest['snapshot'])
+
+def get_race_artifacts(race_id, data):
+    """Return a race's artifacts from the store, building them live when not precomputed"""
+    artifacts = load_race_artifacts(race_id)
+    if artifacts is None:
+        artifacts = build_race_artifacts(race_id, data)
+    return artifacts
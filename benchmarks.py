@@ -0,0 +1,505 @@
+"""
+Benchmarks for the F1 Dashboard data layer
+
+Usage:
+    python benchmarks.py [--repeat N] [--race RACE_ID] [--api]
+"""
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+
+import data_loader
+import f1_query
+from dataset import get_data_files, read_tables, get_dataset
+from lap_analysis import race_trace
+from career_stats import FINGERPRINTED_TABLES, career_stats, career_summary, update_career_stats
+from records import record_tables, update_records
+from qualifying_pace import build_qualifying_gaps, season_qualifying_gaps
+from reliability import classify_statuses, build_reliability, season_reliability
+from season_summary import summarize_seasons, compare_seasons
+from grid_odds import build_grid_odds, slot_rates
+from positions_gained import build_positions_gained, transition_matrix, scope_rows, climbers
+from ratings import driver_ratings, update_ratings, ratings_after
+from contention import build_contention, contention_after, title_clinch
+from points_systems import POINTS_SYSTEMS, finish_table, what_if_standings, what_if_champions
+from head_to_head import build_driver_index, build_teammate_pairs, head_to_head, teammates_of
+
+# Race used by the query microbenchmarks (2024 Abu Dhabi Grand Prix)
+BENCH_RACE_ID = 1144
+
+def bench_cold_load(repeat=5):
+    """Time a cold parse of every data file, serially and with the thread pool"""
+    files = get_data_files()
+    timings = {}
+    for label, parallel in [('serial', False), ('parallel', True)]:
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            tables = read_tables(files, parallel=parallel)
+            runs.append(time.perf_counter() - start)
+        failed = [key for key, table in tables.items() if isinstance(table, Exception)]
+        if failed:
+            raise RuntimeError(f"Could not parse: {', '.join(failed)}")
+        timings[label] = statistics.median(runs)
+    return timings
+
+def bench_hot_reload(timeout=30.0):
+    """Append a driver to a copy of f1_data and time until the watcher swaps it in
+
+    Runs in a temporary working directory. Also records the slowest load_data
+    call while waiting, which must stay a plain lookup (no reload pause).
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copytree(os.path.join(cwd, 'f1_data'), os.path.join(tmp, 'f1_data'))
+        os.chdir(tmp)
+        try:
+            data_loader.clear_data_cache()
+            data = data_loader.load_data(watch=False)
+            drivers_before = len(data['drivers'])
+            data_loader.start_data_watcher(interval=0.2)
+
+            with open(os.path.join('f1_data', 'drivers.csv'), 'a') as f:
+                f.write('9999,benchmark,\\N,BEN,Bench,Mark,2000-01-01,Test,\n')
+            written = time.perf_counter()
+
+            slowest_call = 0.0
+            while time.perf_counter() - written < timeout:
+                start = time.perf_counter()
+                data = data_loader.load_data(watch=False)
+                slowest_call = max(slowest_call, time.perf_counter() - start)
+                if len(data['drivers']) == drivers_before + 1:
+                    break
+                time.sleep(0.01)
+            else:
+                raise RuntimeError("Changed drivers.csv was not picked up by the watcher")
+            swap_latency = time.perf_counter() - written
+        finally:
+            data_loader.stop_data_watcher(timeout=5)
+            os.chdir(cwd)
+            data_loader.clear_data_cache()
+    return {'swap latency': swap_latency, 'slowest load_data': slowest_call}
+
+def bench_queries(race_id=BENCH_RACE_ID, repeat=20):
+    """Median time of each f1_query function over the shared dataset"""
+    data = get_dataset()
+    race_results = f1_query.race_results(race_id, data)
+    driver1, driver2 = (race_results['driverId'].tolist() + [None, None])[:2]
+    queries = {
+        'race_summary': lambda: f1_query.race_summary(race_id, data),
+        'starting_grid': lambda: f1_query.starting_grid(race_id, data),
+        'race_results': lambda: f1_query.race_results(race_id, data),
+        'standings_after': lambda: f1_query.standings_after(race_id, data),
+        'qualifying_table': lambda: f1_query.qualifying_table(race_id, data),
+        'pit_comparison': lambda: f1_query.pit_comparison(race_id, driver1, driver2, data),
+        'overtakes': lambda: f1_query.overtakes(race_id, data),
+        'race_trace': lambda: f1_query.race_trace(race_id, data),
+        'race_strategy': lambda: f1_query.race_strategy(race_id, data),
+        'lap_distribution': lambda: f1_query.lap_distribution(race_id, data),
+        'race_replay': lambda: f1_query.race_replay(race_id, data),
+    }
+    timings = {}
+    for name, query in queries.items():
+        query()  # Warm up the cached lookups
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query()
+            runs.append(time.perf_counter() - start)
+        timings[name] = statistics.median(runs)
+    return timings
+
+def bench_race_trace(laps=80, drivers=26, repeat=20):
+    """Median race trace time for a synthetic full-length race with retirements"""
+    rng = np.random.default_rng(0)
+    last_lap = np.where(np.arange(drivers) < drivers - 6, laps, rng.integers(1, laps, drivers))
+    lap_ids, driver_ids = np.meshgrid(np.arange(1, laps + 1), np.arange(drivers), indexing='ij')
+    completed = lap_ids <= last_lap[None, :]
+    race_laps = pd.DataFrame({
+        'lap': lap_ids[completed],
+        'driverId': driver_ids[completed],
+        'milliseconds': rng.normal(90000, 800, completed.sum()).astype(int),
+    })
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        race_trace(race_laps)
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs)
+
+def bench_careers(repeat=5):
+    """Median time of full and incremental career and record builds after a new race, and a career lookup"""
+    data = get_dataset()
+    raced = data['races'][data['races']['raceId'].isin(data['results']['raceId'])]
+    last_race = raced.sort_values('date')['raceId'].iloc[-1]
+    before = {key: value for key, value in data.items() if key not in ('_career', '_records')}
+    for key in FINGERPRINTED_TABLES:
+        before[key] = data[key][data[key]['raceId'] != last_race]
+    driver_id = int(data['results'].loc[data['results']['raceId'] == last_race, 'driverId'].iloc[0])
+
+    runs = {label: [] for label in ['careers full', 'careers incremental', 'career lookup',
+                                    'records full', 'records incremental']}
+    for _ in range(repeat):
+        snapshot = dict(before)
+        start = time.perf_counter()
+        career_stats(snapshot)
+        runs['careers full'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        record_tables(snapshot)
+        runs['records full'].append(time.perf_counter() - start)
+
+        # Ingest the last race: only its season, winner and drivers' streaks are recomputed
+        previous_career = snapshot['_career']
+        snapshot = dict(snapshot, **{key: data[key] for key in FINGERPRINTED_TABLES})
+        start = time.perf_counter()
+        update_career_stats(snapshot, list(FINGERPRINTED_TABLES))
+        runs['careers incremental'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        update_records(snapshot, list(FINGERPRINTED_TABLES), previous_career)
+        runs['records incremental'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        career_summary(driver_id, snapshot)
+        runs['career lookup'].append(time.perf_counter() - start)
+    return {label: statistics.median(times) for label, times in runs.items()}
+
+def bench_head_to_head(driver1_id=1, driver2_id=844, repeat=5):
+    """Median time of the head-to-head index and teammate builds, and of a comparison and teammate lookup"""
+    data = get_dataset()
+    runs = {label: [] for label in ['driver index', 'teammate pairs', 'head to head', 'teammate lookup']}
+    for _ in range(repeat):
+        snapshot = {key: value for key, value in data.items() if key not in ('_driver_index', '_teammates')}
+        start = time.perf_counter()
+        snapshot['_driver_index'] = build_driver_index(snapshot)
+        runs['driver index'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        snapshot['_teammates'] = build_teammate_pairs(snapshot)
+        runs['teammate pairs'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        head_to_head(driver1_id, driver2_id, snapshot)
+        runs['head to head'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        teammates_of(driver1_id, snapshot)
+        runs['teammate lookup'].append(time.perf_counter() - start)
+    return {label: statistics.median(times) for label, times in runs.items()}
+
+def bench_qualifying_pace(year=2024, repeat=5):
+    """Median time of the all-races qualifying gap pass and of a season slice"""
+    data = get_dataset()
+    runs = {label: [] for label in ['all races', 'season slice']}
+    for _ in range(repeat):
+        snapshot = {key: value for key, value in data.items() if key != '_qualifying_gaps'}
+        start = time.perf_counter()
+        snapshot['_qualifying_gaps'] = build_qualifying_gaps(snapshot)
+        runs['all races'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        season_qualifying_gaps(year, snapshot, 'Best')
+        runs['season slice'].append(time.perf_counter() - start)
+    return {label: statistics.median(times) for label, times in runs.items()}
+
+def bench_positions_gained(year=2024, repeat=5):
+    """Median time of the all-results positions-gained pass and of a season heatmap and climbers lookup"""
+    data = get_dataset()
+    runs = {label: [] for label in ['all results', 'season lookup']}
+    for _ in range(repeat):
+        snapshot = {key: value for key, value in data.items() if key != '_positions_gained'}
+        start = time.perf_counter()
+        snapshot['_positions_gained'] = build_positions_gained(snapshot)
+        runs['all results'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        transition_matrix(snapshot, year=year)
+        climbers(scope_rows(snapshot, year=year))
+        runs['season lookup'].append(time.perf_counter() - start)
+    return {label: statistics.median(times) for label, times in runs.items()}
+
+def bench_reliability(year=2024, repeat=5):
+    """Median time of classifying the statuses, the all-seasons reliability pass and a season lookup"""
+    data = get_dataset()
+    runs = {label: [] for label in ['classify statuses', 'all seasons', 'season lookup']}
+    for _ in range(repeat):
+        snapshot = {key: value for key, value in data.items() if key != '_reliability'}
+        start = time.perf_counter()
+        classify_statuses(snapshot['status'])
+        runs['classify statuses'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        snapshot['_reliability'] = build_reliability(snapshot)
+        runs['all seasons'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        season_reliability(year, snapshot)
+        runs['season lookup'].append(time.perf_counter() - start)
+    return {label: statistics.median(times) for label, times in runs.items()}
+
+def bench_grid_odds(repeat=5):
+    """Median time of the all-results grid conversion bincount and of one grid card's slot lookups"""
+    data = get_dataset()
+    runs = {label: [] for label in ['all results', 'slot lookup']}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        odds = build_grid_odds(data)
+        runs['all results'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        slot_rates(odds, 1, first=2014, last=2023)
+        slot_rates(odds, 1, circuit_id=1, last=2023)
+        runs['slot lookup'].append(time.perf_counter() - start)
+    return {label: statistics.median(times) for label, times in runs.items()}
+
+def bench_season_summary(repeat=5):
+    """Median time of summarizing every season, re-summarizing one season and a comparison lookup"""
+    data = get_dataset()
+    runs = {label: [] for label in ['all seasons', 'one season', 'compare lookup']}
+    for _ in range(repeat):
+        snapshot = {key: value for key, value in data.items() if key != '_season_summary'}
+        start = time.perf_counter()
+        snapshot['_season_summary'] = summarize_seasons(snapshot)
+        runs['all seasons'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        summarize_seasons(snapshot, {2024})
+        runs['one season'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        compare_seasons([2021, 2022, 2023, 2024], snapshot)
+        runs['compare lookup'].append(time.perf_counter() - start)
+    return {label: statistics.median(times) for label, times in runs.items()}
+
+def bench_ratings(repeat=5):
+    """Median time of a full-history ratings rebuild, the one-race incremental step and a lookup"""
+    data = get_dataset()
+    raced = data['races'][data['races']['raceId'].isin(data['results']['raceId'])]
+    last_race = raced.sort_values('date')['raceId'].iloc[-1]
+    before = {key: value for key, value in data.items() if key not in ('_career', '_ratings')}
+    for key in FINGERPRINTED_TABLES:
+        before[key] = data[key][data[key]['raceId'] != last_race]
+
+    runs = {label: [] for label in ['full history', 'new race', 'lookup']}
+    for _ in range(repeat):
+        snapshot = dict(before)
+        career_stats(snapshot)
+        start = time.perf_counter()
+        driver_ratings(snapshot)
+        runs['full history'].append(time.perf_counter() - start)
+
+        # Ingest the last race: ratings resume from the checkpoint before it
+        previous_career = snapshot['_career']
+        snapshot = dict(snapshot, **{key: data[key] for key in FINGERPRINTED_TABLES})
+        update_career_stats(snapshot, list(FINGERPRINTED_TABLES))
+        start = time.perf_counter()
+        update_ratings(snapshot, list(FINGERPRINTED_TABLES), previous_career)
+        runs['new race'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        ratings_after(last_race, snapshot)
+        runs['lookup'].append(time.perf_counter() - start)
+    return {label: statistics.median(times) for label, times in runs.items()}
+
+def bench_contention(race_id=BENCH_RACE_ID, repeat=5):
+    """Median time of the all-season contention batch pass and of a standings-page lookup"""
+    data = get_dataset()
+    year = int(data['races'].set_index('raceId').loc[race_id, 'year'])
+    runs = {label: [] for label in ['all seasons', 'lookup']}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build_contention(data)
+        runs['all seasons'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        contention_after(race_id, data)
+        title_clinch(year, data)
+        runs['lookup'].append(time.perf_counter() - start)
+    return {label: statistics.median(times) for label, times in runs.items()}
+
+def bench_what_if(year=2024, repeat=5):
+    """Median time of extracting the finishing rows, re-scoring one season and re-scoring every champion"""
+    data = get_dataset()
+    system = POINTS_SYSTEMS['1991']
+    runs = {label: [] for label in ['finishing rows', 'season standings', 'all champions']}
+    for _ in range(repeat):
+        snapshot = {key: value for key, value in data.items() if key != '_finishes'}
+        start = time.perf_counter()
+        finish_table(snapshot)
+        runs['finishing rows'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        what_if_standings(year, snapshot, system)
+        runs['season standings'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        what_if_champions(snapshot, system)
+        runs['all champions'].append(time.perf_counter() - start)
+    return {label: statistics.median(times) for label, times in runs.items()}
+
+def _free_port():
+    """An unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+async def _fetch_all(urls, concurrency, headers_for=None):
+    """Fetch urls with bounded concurrency; returns (latencies, status codes, wall time)"""
+    client = AsyncHTTPClient(max_clients=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], []
+
+    async def fetch(url):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.fetch(url, headers=headers_for(url) if headers_for else None,
+                                              decompress_response=False)
+                statuses.append(response.code)
+            except HTTPClientError as e:
+                statuses.append(e.code)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(fetch(url) for url in urls))
+    return latencies, statuses, time.perf_counter() - start
+
+def bench_api(season=2024, requests=500, concurrency=16, timeout=60.0):
+    """Load-test a local race_api instance: cold builds, warm gzip hits and 304 revalidations"""
+    port = _free_port()
+    server = subprocess.Popen([sys.executable, 'race_api.py', '--port', str(port)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f'http://127.0.0.1:{port}'
+    try:
+        started = time.perf_counter()
+        while True:
+            try:
+                season_races = urllib.request.urlopen(f'{base}/season/{season}')
+                race_ids = [race['raceId'] for race in json.load(season_races)['races']]
+                break
+            except OSError:
+                if time.perf_counter() - started > timeout:
+                    raise RuntimeError("race_api did not start")
+                time.sleep(0.2)
+
+        paths = [f'/race/{race_id}' for race_id in race_ids] + [f'/standings/{race_id}' for race_id in race_ids]
+        gzip_headers = {'Accept-Encoding': 'gzip'}
+        etags = {}
+
+        async def run():
+            results = {}
+            results['cold'] = await _fetch_all([base + path for path in paths], concurrency, lambda url: gzip_headers)
+            warm_urls = [base + paths[i % len(paths)] for i in range(requests)]
+            results['warm gzip'] = await _fetch_all(warm_urls, concurrency, lambda url: gzip_headers)
+            client = AsyncHTTPClient()
+            for path in paths:
+                response = await client.fetch(base + path, headers=gzip_headers, decompress_response=False)
+                etags[base + path] = response.headers['Etag']
+            results['revalidate 304'] = await _fetch_all(
+                warm_urls, concurrency, lambda url: dict(gzip_headers, **{'If-None-Match': etags[url]}))
+            return results
+
+        results = asyncio.run(run())
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {}
+    for label, (latencies, statuses, elapsed) in results.items():
+        latencies = sorted(latencies)
+        report[label] = {
+            'requests': len(latencies),
+            'req/s': len(latencies) / elapsed,
+            'p50 ms': latencies[len(latencies) // 2] * 1000,
+            'p99 ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+            'statuses': sorted(set(statuses)),
+        }
+    return report
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the F1 Dashboard data layer")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per measurement (median is reported)")
+    parser.add_argument('--race', type=int, default=BENCH_RACE_ID, help="raceId for the query benchmarks")
+    parser.add_argument('--api', action='store_true', help="also load-test a local race_api instance")
+    args = parser.parse_args(argv)
+
+    timings = bench_cold_load(args.repeat)
+    print(f"Cold load, {len(get_data_files())} files (median of {args.repeat}):")
+    for label, seconds in timings.items():
+        print(f"  {label:<10} {seconds * 1000:8.1f} ms")
+    print(f"  speedup    {timings['serial'] / timings['parallel']:8.2f}x")
+
+    timings = bench_hot_reload()
+    print("Hot reload after editing drivers.csv:")
+    for label, seconds in timings.items():
+        print(f"  {label:<18} {seconds * 1000:8.1f} ms")
+
+    timings = bench_queries(args.race, args.repeat)
+    print(f"Queries for race {args.race} (median of {args.repeat}):")
+    for label, seconds in timings.items():
+        print(f"  {label:<18} {seconds * 1000:8.1f} ms")
+
+    timings = bench_careers(args.repeat)
+    print(f"Career aggregates and records (median of {args.repeat}):")
+    for label, seconds in timings.items():
+        print(f"  {label:<18} {seconds * 1000:8.1f} ms")
+
+    timings = bench_head_to_head(repeat=args.repeat)
+    print(f"Head to head, drivers 1 and 844 (median of {args.repeat}):")
+    for label, seconds in timings.items():
+        print(f"  {label:<18} {seconds * 1000:8.1f} ms")
+
+    timings = bench_qualifying_pace(repeat=args.repeat)
+    print(f"Qualifying gaps (median of {args.repeat}):")
+    for label, seconds in timings.items():
+        print(f"  {label:<18} {seconds * 1000:8.1f} ms")
+
+    timings = bench_positions_gained(repeat=args.repeat)
+    print(f"Positions gained (median of {args.repeat}):")
+    for label, seconds in timings.items():
+        print(f"  {label:<18} {seconds * 1000:8.1f} ms")
+
+    timings = bench_reliability(repeat=args.repeat)
+    print(f"Reliability (median of {args.repeat}):")
+    for label, seconds in timings.items():
+        print(f"  {label:<18} {seconds * 1000:8.1f} ms")
+
+    timings = bench_grid_odds(args.repeat)
+    print(f"Grid slot conversion (median of {args.repeat}):")
+    for label, seconds in timings.items():
+        print(f"  {label:<18} {seconds * 1000:8.1f} ms")
+
+    timings = bench_season_summary(args.repeat)
+    print(f"Season summaries (median of {args.repeat}):")
+    for label, seconds in timings.items():
+        print(f"  {label:<18} {seconds * 1000:8.1f} ms")
+
+    timings = bench_ratings(args.repeat)
+    print(f"Driver ratings (median of {args.repeat}):")
+    for label, seconds in timings.items():
+        print(f"  {label:<18} {seconds * 1000:8.1f} ms")
+
+    timings = bench_contention(args.race, args.repeat)
+    print(f"Title contention (median of {args.repeat}):")
+    for label, seconds in timings.items():
+        print(f"  {label:<18} {seconds * 1000:8.1f} ms")
+
+    timings = bench_what_if(repeat=args.repeat)
+    print(f"What-if points, 2024 under 1991 rules (median of {args.repeat}):")
+    for label, seconds in timings.items():
+        print(f"  {label:<18} {seconds * 1000:8.1f} ms")
+
+    seconds = bench_race_trace(repeat=args.repeat)
+    print(f"Race trace, 80 laps x 26 drivers (median of {args.repeat}): {seconds * 1000:.1f} ms")
+
+    if args.api:
+        report = bench_api()
+        print("race_api load test (2024 season, concurrency 16):")
+        for label, stats in report.items():
+            print(f"  {label:<16} {stats['requests']:5d} requests  {stats['req/s']:8.1f} req/s  "
+                  f"p50 {stats['p50 ms']:6.1f} ms  p99 {stats['p99 ms']:6.1f} ms  status {stats['statuses']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Career page display functions"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from career_stats import career_stats, career_summary
+
+# Career totals shown as metrics: (column, label)
+CAREER_METRICS = [
+    ('starts', 'Starts'), ('wins', 'Wins'), ('podiums', 'Podiums'), ('poles', 'Poles'),
+    ('points', 'Points'), ('dnfs', 'DNFs'), ('fastest_laps', 'Fastest Laps'), ('championships', 'Titles'),
+]
+
+SEASON_LABELS = {
+    'year': 'Season', 'starts': 'Starts', 'wins': 'Wins', 'podiums': 'Podiums', 'poles': 'Poles',
+    'points': 'Points', 'dnfs': 'DNFs', 'fastest_laps': 'Fastest Laps', 'best_finish': 'Best Finish',
+    'championship_position': 'Championship', 'championship_points': 'Championship Points',
+}
+
+def career_options(data, kind):
+    """Selectable ids and display names, most recent and most successful first"""
+    careers = career_stats(data)['careers'][kind]
+    careers = careers.sort_values(['last_season', 'wins', 'points'], ascending=False)
+    if kind == 'drivers':
+        drivers = data['drivers'].set_index('driverId')
+        names = drivers['forename'] + ' ' + drivers['surname']
+    else:
+        names = data['constructors'].set_index('constructorId')['name']
+    labels = (names.reindex(careers.index).fillna('Unknown') + ' (' + careers['first_season'].astype(str) +
+              '-' + careers['last_season'].astype(str) + ')')
+    return list(careers.index), labels.to_dict()
+
+def display_career_page(data):
+    """Display career totals and season-by-season results of a driver or constructor"""
+    st.markdown("# 👤 Career Statistics")
+
+    try:
+        kind_label = st.radio("Show:", ["Drivers", "Constructors"], horizontal=True, key="career_kind")
+        kind = kind_label.lower()
+        entity_ids, labels = career_options(data, kind)
+        entity_id = st.selectbox(f"Select {kind_label[:-1]}", entity_ids, format_func=labels.get, key=f"career_{kind}")
+
+        totals, seasons = career_summary(entity_id, data, kind)
+        if totals is None:
+            st.info("No race results for this selection")
+            return
+
+        st.markdown(f"### {labels[entity_id]}")
+        columns = st.columns(len(CAREER_METRICS))
+        for column, (key, label) in zip(columns, CAREER_METRICS):
+            value = totals[key]
+            column.metric(label, f"{value:g}" if key == 'points' else int(value))
+
+        seasons = seasons.reset_index()
+        fig_seasons = px.bar(
+            seasons,
+            x='year',
+            y='points',
+            hover_data={'wins': True, 'podiums': True, 'championship_position': True},
+            title="Points per Season",
+            labels={'year': 'Season', 'points': 'Points', 'championship_position': 'Championship'}
+        )
+        fig_seasons.update_layout(height=400, xaxis_title="Season", yaxis_title="Points", font=dict(size=14))
+        st.plotly_chart(fig_seasons, use_container_width=True)
+
+        st.markdown("**Season by Season:**")
+        display_seasons = seasons.rename(columns=SEASON_LABELS)
+        for col in ['Best Finish', 'Championship']:
+            display_seasons[col] = display_seasons[col].map(lambda v: '-' if pd.isna(v) else f"P{int(v)}")
+        st.dataframe(
+            display_seasons.sort_values('Season', ascending=False)[list(SEASON_LABELS.values())],
+            use_container_width=True,
+            hide_index=True
+        )
+    except Exception as e:
+        st.error(f"Error loading career statistics: {e}")
+        st.info("Career statistics not available")
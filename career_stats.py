@@ -0,0 +1,203 @@
+"""Career and season aggregates for drivers and constructors
+
+Builds per-season totals (starts, wins, podiums, poles, points, DNFs,
+fastest laps, championship position) for every driver and constructor in
+one groupby pass over results, qualifying and the standings, and sums them
+into career totals. The aggregates live in the data dictionary under
+'_career'. When data files change, only the seasons whose races changed are
+re-aggregated. Like race_artifacts, this module must not import streamlit.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Tables the aggregates are derived from
+CAREER_SOURCES = ['races', 'results', 'qualifying', 'driver_standings', 'constructor_standings']
+
+# Race-level tables fingerprinted per raceId to find the races that changed, and
+# the columns the aggregates, records and season summaries read from each
+FINGERPRINTED_TABLES = {
+    'results': ['driverId', 'constructorId', 'grid', 'position', 'positionText', 'positionOrder', 'points',
+                'rank', 'milliseconds', 'statusId'],
+    'qualifying': ['driverId', 'constructorId', 'position'],
+    'driver_standings': ['driverId', 'points', 'position'],
+    'constructor_standings': ['constructorId', 'points', 'position'],
+}
+
+SEASON_COLUMNS = ['starts', 'wins', 'podiums', 'poles', 'points', 'dnfs', 'fastest_laps',
+                  'best_finish', 'championship_position', 'championship_points']
+
+# positionText of entries that never took the start (failed to qualify, withdrawn)
+NON_STARTERS = ['F', 'W']
+# positionText of standings rows excluded (E) or disqualified (D) from the championship
+EXCLUDED_POSITIONS = ['E', 'D']
+
+def race_fingerprints(data, tables=FINGERPRINTED_TABLES, previous=None):
+    """One hash per raceId and table, so changed races can be found without diffing rows
+
+    Only the given tables are hashed; the columns of the others are taken
+    from the previous fingerprints.
+    """
+    fingerprints = {}
+    if previous is not None:
+        fingerprints.update({key: previous[key].dropna() for key in previous.columns
+                             if key in FINGERPRINTED_TABLES and key not in tables})
+    for key in tables:
+        table = data.get(key)
+        if table is None or table.empty:
+            continue
+        hashes = pd.util.hash_pandas_object(table[FINGERPRINTED_TABLES[key]], index=False)
+        fingerprints[key] = hashes.groupby(table['raceId'].to_numpy()).sum()
+    races = data['races'].set_index('raceId')
+    fingerprints['year'] = races['year']
+    return pd.DataFrame(fingerprints)
+
+def pole_sitters(results, qualifying):
+    """raceId, driverId and constructorId of each pole sitter
+
+    The pole sitter is the driver who started from grid slot 1, after grid
+    penalties, as in the official records; qualifying position 1 only stands
+    in for races whose results have no grid slot 1 (not yet run).
+    """
+    from_grid = results.loc[results['grid'] == 1, ['raceId', 'driverId', 'constructorId']].drop_duplicates('raceId')
+    from_qualifying = qualifying.loc[(pd.to_numeric(qualifying['position'], errors='coerce') == 1) &
+                                     ~qualifying['raceId'].isin(from_grid['raceId']),
+                                     ['raceId', 'driverId', 'constructorId']]
+    return pd.concat([from_grid, from_qualifying]).drop_duplicates('raceId')
+
+def _final_standings(standings, races, key):
+    """Championship position and points after the last race of each season"""
+    standings = standings.join(races[['year', 'round']], on='raceId', how='inner')
+    last_round = standings.groupby('year')['round'].transform('max')
+    final = standings[standings['round'] == last_round]
+    return final.set_index([key, 'year'])[['position', 'points']].rename(
+        columns={'position': 'championship_position', 'points': 'championship_points'})
+
+def season_aggregates(data, years=None):
+    """Per-season totals of every driver and constructor, optionally for some seasons only
+
+    Returns:
+        dict: 'drivers' and 'constructors' DataFrames indexed by (id, year)
+    """
+    races = data['races']
+    if years is not None:
+        races = races[races['year'].isin(years)]
+    races = races.set_index('raceId')
+    race_years = races['year']
+
+    results = data['results']
+    results = results[results['raceId'].isin(race_years.index)]
+    qualifying = data.get('qualifying', pd.DataFrame(columns=['raceId', 'driverId', 'constructorId', 'position']))
+    qualifying = qualifying[qualifying['raceId'].isin(race_years.index)]
+
+    position = pd.to_numeric(results['position'], errors='coerce')
+    entries = pd.DataFrame({
+        'driverId': results['driverId'].to_numpy(),
+        'constructorId': results['constructorId'].to_numpy(),
+        'raceId': results['raceId'].to_numpy(),
+        'year': results['raceId'].map(race_years).to_numpy(),
+        'starts': (~results['positionText'].isin(NON_STARTERS)).to_numpy(),
+        'wins': (position == 1).to_numpy(),
+        'podiums': (position <= 3).to_numpy(),
+        'points': pd.to_numeric(results['points'], errors='coerce').fillna(0).to_numpy(),
+        'dnfs': (results['positionText'] == 'R').to_numpy(),
+        'fastest_laps': (pd.to_numeric(results['rank'], errors='coerce') == 1).to_numpy(),
+        'best_finish': position.to_numpy(),
+    })
+    poles = pole_sitters(results, qualifying)
+    poles = poles.assign(year=poles['raceId'].map(race_years), poles=1)
+
+    aggregates = {}
+    for kind, key, standings_key in [('drivers', 'driverId', 'driver_standings'),
+                                     ('constructors', 'constructorId', 'constructor_standings')]:
+        grouped = entries.groupby([key, 'year'])
+        seasons = grouped[['starts', 'wins', 'podiums', 'points', 'dnfs', 'fastest_laps']].sum()
+        seasons['best_finish'] = grouped['best_finish'].min()
+        if kind == 'constructors':
+            # A constructor starts a race once, however many cars it entered
+            seasons['starts'] = entries[entries['starts']].groupby([key, 'year'])['raceId'].nunique()
+        seasons['poles'] = poles.groupby([key, 'year'])['poles'].sum()
+        standings = data.get(standings_key)
+        if standings is not None:
+            standings = standings[standings['raceId'].isin(race_years.index)]
+            seasons = seasons.join(_final_standings(standings, races, key))
+        else:
+            seasons['championship_position'] = np.nan
+            seasons['championship_points'] = np.nan
+        seasons[['starts', 'poles']] = seasons[['starts', 'poles']].fillna(0)
+        int_columns = ['starts', 'wins', 'podiums', 'poles', 'dnfs', 'fastest_laps']
+        seasons[int_columns] = seasons[int_columns].astype(int)
+        aggregates[kind] = seasons[SEASON_COLUMNS].sort_index()
+    return aggregates
+
+def career_totals(seasons):
+    """Career totals from per-season aggregates, one row per driver or constructor"""
+    grouped = seasons.groupby(level=0)
+    careers = grouped[['starts', 'wins', 'podiums', 'poles', 'points', 'dnfs', 'fastest_laps']].sum()
+    careers['seasons'] = grouped.size()
+    years = seasons.reset_index(level=1)['year']
+    careers['first_season'] = years.groupby(level=0).min()
+    careers['last_season'] = years.groupby(level=0).max()
+    careers['best_finish'] = grouped['best_finish'].min()
+    careers['championships'] = (seasons['championship_position'] == 1).groupby(level=0).sum()
+    return careers
+
+def _build(data, seasons, fingerprints, changed_races=()):
+    """Career state stored in the data dictionary"""
+    return {
+        'fingerprints': fingerprints,
+        'changed_races': set(changed_races),
+        'seasons': seasons,
+        'careers': {kind: career_totals(table) for kind, table in seasons.items()},
+    }
+
+def career_stats(data):
+    """Career state of a snapshot, built in full on first access"""
+    if '_career' not in data:
+        data['_career'] = _build(data, season_aggregates(data), race_fingerprints(data))
+    return data['_career']
+
+def changed_races(previous, fingerprints):
+    """raceIds whose fingerprints differ, including races added or removed"""
+    old, new = previous.align(fingerprints, join='outer')
+    differs = ~((old == new) | (old.isna() & new.isna())).all(axis=1)
+    return old.index[differs]
+
+def update_career_stats(data, changed):
+    """Re-aggregate only the seasons whose races changed after a snapshot refresh
+
+    Called with the keys of the reloaded tables. Does nothing until the
+    aggregates have been built once, or when no source table changed. The
+    raceIds that changed are kept in the new state as 'changed_races'.
+    """
+    current = data.get('_career')
+    if current is None or not set(changed) & set(CAREER_SOURCES):
+        return current
+    fingerprints = race_fingerprints(data, [key for key in FINGERPRINTED_TABLES if key in changed],
+                                     current['fingerprints'])
+    race_ids = changed_races(current['fingerprints'], fingerprints)
+    years = (set(current['fingerprints']['year'].reindex(race_ids).dropna()) |
+             set(fingerprints['year'].reindex(race_ids).dropna()))
+    if not years:
+        data['_career'] = dict(current, fingerprints=fingerprints, changed_races=set())
+        return data['_career']
+
+    updated = season_aggregates(data, years)
+    seasons = {}
+    for kind, table in current['seasons'].items():
+        kept = table[~table.index.get_level_values('year').isin(years)]
+        seasons[kind] = pd.concat([kept, updated[kind]]).sort_index()
+    data['_career'] = _build(data, seasons, fingerprints, race_ids)
+    return data['_career']
+
+def career_summary(entity_id, data, kind='drivers'):
+    """Career totals and per-season rows of one driver or constructor
+
+    Returns:
+        tuple: (totals dict or None, seasons DataFrame indexed by year)
+    """
+    stats = career_stats(data)
+    careers, seasons = stats['careers'][kind], stats['seasons'][kind]
+    if entity_id not in careers.index:
+        return None, seasons.iloc[0:0].droplevel(0)
+    return careers.loc[entity_id].to_dict(), seasons.loc[entity_id]
@@ -0,0 +1,107 @@
+"""Circuit page display functions"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from circuit_stats import circuit_index, circuit_history
+from race_display import display_circuit_image, display_circuit_details
+
+# Entries shown in the most-wins charts
+TOP_WINNERS = 10
+
+def format_lap_record(seconds):
+    """Format a lap time in seconds as M:SS.mmm"""
+    if seconds is None or pd.isna(seconds):
+        return "-"
+    return f"{int(seconds // 60)}:{seconds % 60:06.3f}"
+
+def circuit_options(data):
+    """circuitIds of every circuit that held a race, ordered by name, with display labels
+
+    Returns:
+        tuple: (circuitIds, labels, index of the circuit that held the most races)
+    """
+    summaries = circuit_index(data)['summary']
+    circuits = data['circuits'].set_index('circuitId')
+    circuits = circuits[circuits.index.isin(list(summaries))].sort_values('name')
+    labels = (circuits['name'] + ' (' + circuits['country'] + ')').to_dict()
+    circuit_ids = list(circuits.index)
+    busiest = max(circuit_ids, key=lambda circuit_id: summaries[circuit_id]['races'])
+    return circuit_ids, labels, circuit_ids.index(busiest)
+
+def display_wins_chart(wins, names, key, title):
+    """Bar chart of the most wins at the circuit"""
+    if wins is None or wins.empty:
+        st.info("No winners recorded at this circuit")
+        return
+    top = wins.head(TOP_WINNERS).assign(name=lambda df: df[key].map(names).fillna('Unknown'))
+    fig_wins = px.bar(
+        top,
+        x='name',
+        y='wins',
+        hover_data={'last_win': True},
+        title=title,
+        labels={'name': '', 'wins': 'Wins', 'last_win': 'Last Win'}
+    )
+    fig_wins.update_layout(height=400, xaxis_title="", yaxis_title="Wins", font=dict(size=14))
+    st.plotly_chart(fig_wins, use_container_width=True)
+
+def display_circuit_page(data):
+    """Display the race history, lap record and most successful drivers and teams of a circuit"""
+    st.markdown("# 🗺️ Circuit History")
+
+    try:
+        circuit_ids, labels, default_index = circuit_options(data)
+        circuit_id = st.selectbox("Select Circuit", circuit_ids, index=default_index, format_func=labels.get,
+                                  key="circuit_select")
+
+        history = circuit_history(circuit_id, data)
+        if history is None:
+            st.info("No races held at this circuit")
+            return
+        circuit = data['circuits'].set_index('circuitId').loc[circuit_id]
+        summary = history['summary']
+
+        drivers = data['drivers'].set_index('driverId')
+        driver_names = drivers['forename'] + ' ' + drivers['surname']
+        constructor_names = data['constructors'].set_index('constructorId')['name']
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Races Held", summary['races'])
+        col2.metric("First Race", summary['first_season'])
+        col3.metric("Latest Race", summary['last_season'])
+        col4.metric("Lap Record", format_lap_record(summary['lap_record']))
+        if not pd.isna(summary['lap_record_driver_id']):
+            st.caption(f"Lap record (fastest race lap in the results): "
+                       f"{driver_names.get(summary['lap_record_driver_id'], 'Unknown')}, {summary['lap_record_year']}")
+
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            display_circuit_image(circuit)
+        with col2:
+            display_circuit_details(circuit)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            display_wins_chart(history['driver_wins'], driver_names, 'driverId', "Most Wins (Drivers)")
+        with col2:
+            display_wins_chart(history['constructor_wins'], constructor_names, 'constructorId', "Most Wins (Constructors)")
+
+        st.markdown("**Races Held:**")
+        races = history['races']
+        st.dataframe(
+            pd.DataFrame({
+                'Season': races['year'],
+                'Race': races['name'],
+                'Winner': races['winner_id'].map(driver_names),
+                'Team': races['winner_constructor_id'].map(constructor_names),
+                'Pole': races['pole_id'].map(driver_names),
+                'Fastest Lap': races['fastest_lap_time'].map(format_lap_record),
+            }).fillna('-'),
+            use_container_width=True,
+            hide_index=True
+        )
+    except Exception as e:
+        st.error(f"Error loading circuit history: {e}")
+        st.info("Circuit history not available")
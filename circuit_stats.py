@@ -0,0 +1,118 @@
+"""Circuit history index for the F1 Dashboard
+
+Maps every circuitId to the races held there (races with results) and precomputes, per circuit,
+the winner and pole sitter of each race, the lap record and the most
+successful drivers and constructors. The index is rebuilt with the snapshot
+whenever one of its source tables changes, so circuit pages are plain
+lookups. Like race_artifacts, this module must not import streamlit.
+"""
+
+import numpy as np
+import pandas as pd
+
+from career_stats import pole_sitters
+
+# Tables the circuit index is derived from
+CIRCUIT_SOURCES = ['races', 'results', 'qualifying']
+
+HISTORY_COLUMNS = ['raceId', 'year', 'round', 'name', 'date', 'winner_id', 'winner_constructor_id',
+                   'pole_id', 'fastest_lap_time', 'fastest_lap_driver_id']
+
+def lap_time_seconds(times):
+    """Vectorized 'm:ss.sss' to seconds; NaN for missing or malformed times"""
+    parts = times.astype(str).str.split(':', n=1, expand=True)
+    if parts.shape[1] < 2:
+        return pd.Series(float('nan'), index=times.index)
+    return pd.to_numeric(parts[0], errors='coerce') * 60 + pd.to_numeric(parts[1], errors='coerce')
+
+def _split(table):
+    """circuitId -> rows of a table sorted by circuitId, as slices rather than groupby copies"""
+    ids = table['circuitId'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    ends = np.r_[starts[1:], len(ids)]
+    return {int(ids[start]): table.iloc[start:end] for start, end in zip(starts, ends)}
+
+def _wins_table(winners, key):
+    """Wins per circuit and driver or constructor, most wins first"""
+    wins = winners.groupby(['circuitId', key]).agg(wins=('raceId', 'size'), last_win=('year', 'max'))
+    return wins.reset_index().sort_values(['circuitId', 'wins', 'last_win'], ascending=[True, False, False])
+
+def build_circuit_index(data):
+    """Race history, lap records and win tables of every circuit
+
+    Returns:
+        dict: 'races' and 'driver_wins'/'constructor_wins' map circuitId to
+        DataFrames; 'summary' maps circuitId to a dict of races held, first and
+        last season and the lap record
+    """
+    results = data['results']
+    # Only races that were held: scheduled rounds without results are left out
+    races = data['races'].loc[data['races']['raceId'].isin(results['raceId']),
+                              ['raceId', 'year', 'round', 'circuitId', 'name', 'date']]
+    qualifying = data.get('qualifying', pd.DataFrame(columns=['raceId', 'driverId', 'constructorId', 'position']))
+
+    winners = results.loc[results['positionOrder'] == 1, ['raceId', 'driverId', 'constructorId']]
+    winners = winners.drop_duplicates('raceId').rename(columns={'driverId': 'winner_id',
+                                                                'constructorId': 'winner_constructor_id'})
+    poles = pole_sitters(results, qualifying)[['raceId', 'driverId']].rename(columns={'driverId': 'pole_id'})
+
+    fastest = results.loc[results['fastestLapTime'] != '\\N', ['raceId', 'driverId', 'fastestLapTime']]
+    fastest = fastest.assign(fastest_lap_time=lap_time_seconds(fastest['fastestLapTime'])).dropna(subset=['fastest_lap_time'])
+    fastest = fastest.loc[fastest.groupby('raceId')['fastest_lap_time'].idxmin(), ['raceId', 'driverId', 'fastest_lap_time']]
+    fastest = fastest.rename(columns={'driverId': 'fastest_lap_driver_id'})
+
+    history = (races.merge(winners, on='raceId', how='left')
+               .merge(poles, on='raceId', how='left')
+               .merge(fastest, on='raceId', how='left')
+               .sort_values(['circuitId', 'date'], ascending=[True, False]))
+    id_columns = ['winner_id', 'winner_constructor_id', 'pole_id', 'fastest_lap_driver_id']
+    history[id_columns] = history[id_columns].astype('Int64')
+
+    summary = history.groupby('circuitId').agg(races=('raceId', 'size'), first_season=('year', 'min'),
+                                               last_season=('year', 'max'))
+    records = history.dropna(subset=['fastest_lap_time'])
+    records = records.loc[records.groupby('circuitId')['fastest_lap_time'].idxmin()].set_index('circuitId')
+    summary['lap_record'] = records['fastest_lap_time']
+    summary['lap_record_driver_id'] = records['fastest_lap_driver_id'].astype('Int64')
+    summary['lap_record_year'] = records['year'].astype('Int64')
+
+    held = history.dropna(subset=['winner_id'])
+    driver_wins = _wins_table(held.rename(columns={'winner_id': 'driverId'}), 'driverId')
+    constructor_wins = _wins_table(held.rename(columns={'winner_constructor_id': 'constructorId'}), 'constructorId')
+
+    return {
+        'summary': summary.to_dict('index'),
+        'races': _split(history[['circuitId'] + HISTORY_COLUMNS]),
+        'driver_wins': _split(driver_wins),
+        'constructor_wins': _split(constructor_wins),
+    }
+
+def index_circuits(data, changed):
+    """Rebuild the circuit index of a snapshot when one of its source tables changed"""
+    if '_circuit_index' not in data or set(changed) & set(CIRCUIT_SOURCES):
+        data['_circuit_index'] = build_circuit_index(data)
+    return data['_circuit_index']
+
+def circuit_index(data):
+    """Circuit index of a snapshot, built on first access for snapshots made elsewhere"""
+    if '_circuit_index' not in data:
+        data['_circuit_index'] = build_circuit_index(data)
+    return data['_circuit_index']
+
+def circuit_history(circuit_id, data):
+    """Summary row, race history and win tables of one circuit
+
+    Returns:
+        dict: 'summary' dict, 'races' DataFrame and 'driver_wins' and
+        'constructor_wins' DataFrames (None without a winner), or None for a
+        circuit with no races
+    """
+    index = circuit_index(data)
+    if circuit_id not in index['summary']:
+        return None
+    return {
+        'summary': index['summary'][circuit_id],
+        'races': index['races'][circuit_id],
+        'driver_wins': index['driver_wins'].get(circuit_id),
+        'constructor_wins': index['constructor_wins'].get(circuit_id),
+    }
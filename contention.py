@@ -0,0 +1,141 @@
+"""Championship contention and title clinches for the F1 Dashboard
+
+After every round, each driver's and constructor's maximum achievable
+points are their standings points plus everything still available in the
+remaining rounds and sprint weekends of the season: the most the points
+system of the time allows in a race or sprint (a win and the fastest lap
+for a driver, a one-two for a constructor), or the most anyone actually
+scored in that event where that was more (double points, shared drives). Anyone whose maximum
+falls below the leader's points is mathematically eliminated; the title is
+clinched at the first round only one contender is left. Every season is
+computed in one batch pass when the snapshot is built and kept in the data
+dictionary under '_contention', so standings pages only look rows up. Like
+race_artifacts, this module must not import streamlit.
+
+Dropped-score rules of early seasons are not modelled: contention is decided
+on gross points.
+"""
+
+import numpy as np
+import pandas as pd
+
+from career_stats import EXCLUDED_POSITIONS
+from points_systems import season_points_system, maximum_points
+
+# Tables the contention index is derived from
+CONTENTION_SOURCES = ['races', 'results', 'sprint_results', 'driver_standings', 'constructor_standings']
+
+CHAMPIONSHIPS = {'drivers': ('driver_standings', 'driverId'), 'constructors': ('constructor_standings', 'constructorId')}
+
+def _event_haul(table, key):
+    """Most points one driver or constructor scored in each event, indexed by raceId"""
+    if table is None or table.empty:
+        return pd.Series(dtype=float)
+    points = pd.to_numeric(table['points'], errors='coerce').fillna(0.0)
+    return points.groupby([table['raceId'], table[key]]).sum().groupby(level='raceId').max()
+
+def points_remaining(data):
+    """Points still available to a driver and to a constructor after every round, indexed by raceId"""
+    races = data['races'][['raceId', 'year', 'round', 'sprint_date']].sort_values(['year', 'round'])
+    sprints = data.get('sprint_results')
+    sprint_ids = sprints['raceId'].unique() if sprints is not None else []
+    sprint_dates = races['sprint_date']
+    has_sprint = ((sprint_dates.notna() & (sprint_dates != '\\N')) | races['raceId'].isin(sprint_ids)).to_numpy()
+
+    remaining = pd.DataFrame({'raceId': races['raceId'].to_numpy(), 'year': races['year'].to_numpy(),
+                              'round': races['round'].to_numpy()})
+    years = np.unique(remaining['year'])
+    for kind, (_, key) in CHAMPIONSHIPS.items():
+        rules = pd.DataFrame([maximum_points(season_points_system(year), kind) for year in years],
+                             index=years, columns=['race', 'sprint']).reindex(remaining['year'])
+        race_best = np.maximum(rules['race'].to_numpy(),
+                               races['raceId'].map(_event_haul(data['results'], key)).fillna(0.0).to_numpy())
+        sprint_best = np.maximum(rules['sprint'].to_numpy(),
+                                 races['raceId'].map(_event_haul(sprints, key)).fillna(0.0).to_numpy())
+        available = race_best + np.where(has_sprint, sprint_best, 0.0)
+        # Reverse cumulative sum within each season, excluding the round itself
+        after = pd.Series(available[::-1]).groupby(remaining['year'].to_numpy()[::-1]).cumsum().to_numpy()[::-1]
+        remaining[kind] = after - available
+    return remaining.set_index('raceId')
+
+def _contention_table(standings, key, remaining, kind):
+    """Standings rows with maximum achievable points, contention flag and gap to the leader
+
+    Excluded and disqualified entries are left out; the leader is the row
+    classified first, not the most points.
+    """
+    standings = standings[~standings['positionText'].astype(str).isin(EXCLUDED_POSITIONS)]
+    table = pd.DataFrame({
+        'raceId': standings['raceId'].to_numpy(),
+        key: standings[key].to_numpy(),
+        'points': pd.to_numeric(standings['points'], errors='coerce').fillna(0.0).to_numpy(),
+        'position': pd.to_numeric(standings['position'], errors='coerce').to_numpy(),
+    })
+    table = table[table['raceId'].isin(remaining.index)]
+    info = remaining.reindex(table['raceId'])
+    table['year'], table['round'] = info['year'].to_numpy(), info['round'].to_numpy()
+    table['max_points'] = table['points'] + info[kind].to_numpy()
+    leaders = table[table['position'] == 1].drop_duplicates('raceId').set_index('raceId')['points']
+    leader_points = table['raceId'].map(leaders).fillna(table.groupby('raceId')['points'].transform('max'))
+    table['gap'] = leader_points - table['points']
+    # A tie on points is still a title chance (decided on countback)
+    table['in_contention'] = table['max_points'] >= leader_points
+    return table.sort_values(['year', 'round', 'position']).reset_index(drop=True)
+
+def _clinches(table, key, remaining):
+    """Round and raceId each season's title was clinched, per year
+
+    Seasons that are still open are left out; a title only decided on
+    countback is clinched at the final round.
+    """
+    contenders = table[table['in_contention']]
+    counts = contenders.groupby(['year', 'round']).size()
+    decided = counts[counts == 1].reset_index().drop_duplicates('year')
+    clinched = decided.merge(contenders, on=['year', 'round'])
+
+    final_round = remaining.groupby('year')['round'].max()
+    last = table[table['round'] == table['year'].map(final_round)]
+    last = last[(last['position'] == 1) & ~last['year'].isin(clinched['year'])]
+    clinched = pd.concat([clinched, last]).sort_values('year')
+    return {int(row['year']): {key: int(row[key]), 'raceId': int(row['raceId']), 'round': int(row['round'])}
+            for row in clinched.to_dict('records')}
+
+def _race_slices(table):
+    """raceId -> rows of a table sorted by year and round, as slices"""
+    ids = table['raceId'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    ends = np.r_[starts[1:], len(ids)]
+    return {int(ids[start]): table.iloc[start:end] for start, end in zip(starts, ends)}
+
+def build_contention(data):
+    """Contention after every round and title clinches of every season, for both championships"""
+    remaining = points_remaining(data)
+    index = {}
+    for kind, (table_key, key) in CHAMPIONSHIPS.items():
+        standings = data.get(table_key)
+        if standings is None or standings.empty:
+            index[kind] = {'rounds': {}, 'clinches': {}}
+            continue
+        table = _contention_table(standings, key, remaining, kind)
+        index[kind] = {'rounds': _race_slices(table), 'clinches': _clinches(table, key, remaining)}
+    return index
+
+def index_contention(data, changed):
+    """Rebuild the contention index of a snapshot when one of its source tables changed"""
+    if '_contention' not in data or set(changed) & set(CONTENTION_SOURCES):
+        data['_contention'] = build_contention(data)
+    return data['_contention']
+
+def contention_index(data):
+    """Contention index of a snapshot, built on first access for snapshots made elsewhere"""
+    if '_contention' not in data:
+        data['_contention'] = build_contention(data)
+    return data['_contention']
+
+def contention_after(race_id, data, kind='drivers'):
+    """Standings after a race with max_points, gap and in_contention, or None without standings"""
+    return contention_index(data)[kind]['rounds'].get(race_id)
+
+def title_clinch(year, data, kind='drivers'):
+    """driverId/constructorId, raceId and round a season's title was clinched, or None while still open"""
+    return contention_index(data)[kind]['clinches'].get(year)
@@ -2,70 +2,104 @@
 
 import streamlit as st
 import pandas as pd
-import os
+import logging
+import threading
 from datetime import datetime
 
-@st.cache_data
-def load_data():
-    """Load all F1 data files with local images"""
-    data = {}
-    try:
-        # Check if local images CSV exists, otherwise use original
-        local_images_file = 'f1_data/circuits_with_local_images.csv'
-        original_file = 'f1_data/circuits_updated.csv'
-        
-        if os.path.exists(local_images_file):
-            circuits_file = local_images_file
-        else:
-            circuits_file = original_file
-        
-        # Get file modification time for cache invalidation
-        file_mod_time = os.path.getmtime(circuits_file) if os.path.exists(circuits_file) else 0
-        
-        data['races'] = pd.read_csv('f1_data/races.csv')
-        data['circuits'] = pd.read_csv(circuits_file)
-        data['results'] = pd.read_csv('f1_data/results.csv')
-        data['drivers'] = pd.read_csv('f1_data/drivers.csv')
-        data['constructors'] = pd.read_csv('f1_data/constructors.csv')
-        
-        # Handle driver standings with special care for invalid values
-        try:
-            # Read driver standings with appropriate NA values
-            driver_standings = pd.read_csv('f1_data/driver_standings.csv', na_values=['\\N', 'N'])
-            
-            # Convert problematic columns to appropriate types
-            for col in ['position', 'points', 'wins']:
-                if col in driver_standings.columns:
-                    driver_standings[col] = pd.to_numeric(driver_standings[col], errors='coerce')
-            
-            data['driver_standings'] = driver_standings
-        except Exception as e:
-            st.warning(f"Driver standings data may have issues: {e}")
-        
-        # Handle constructor standings with special care for invalid values
+from dataset import STANDINGS_TABLES, build_dataset, refresh_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of f1_data for changed files
+WATCH_INTERVAL = 2.0
+
+# Current data snapshot, replaced as a whole (never mutated) when files change
+_snapshot = None
+_snapshot_lock = threading.Lock()
+_watcher = None
+_watcher_stop = None
+_watcher_lock = threading.Lock()
+
+def load_snapshot():
+    """Read every data file into a new snapshot"""
+    data, failed = build_dataset()
+    for key, error in failed.items():
+        if key not in STANDINGS_TABLES:
+            raise error
+        # Standings are shown with a warning rather than failing the whole app
+        st.warning(f"{key.replace('_', ' ').capitalize()} data may have issues: {error}")
+    return data
+
+def load_data(watch=True):
+    """Load all F1 data files with local images
+
+    The snapshot is shared by every session. When watch is set, a background
+    thread swaps in a new snapshot whenever files in f1_data change; a run
+    keeps using the snapshot it started with.
+    """
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                try:
+                    _snapshot = load_snapshot()
+                except Exception as e:
+                    st.error(f"Error loading data: {e}")
+                    return None
+    if watch:
+        start_data_watcher()
+    return _snapshot
+
+def refresh_data():
+    """Re-read only the data files that changed and atomically swap in the new snapshot
+
+    Returns:
+        list: keys of the tables that were reloaded
+    """
+    global _snapshot
+    current = _snapshot
+    if current is None:
+        return []
+
+    data, changed = refresh_snapshot(current)
+    _snapshot = data
+    return changed
+
+def _watch_data(interval, stop):
+    """Watcher thread: poll f1_data for changed files and reload them until stop is set"""
+    while not stop.wait(interval):
         try:
-            # Read constructor standings with appropriate NA values
-            constructor_standings = pd.read_csv('f1_data/constructor_standings.csv', na_values=['\\N', 'N'])
-            
-            # Convert problematic columns to appropriate types
-            for col in ['position', 'points', 'wins']:
-                if col in constructor_standings.columns:
-                    constructor_standings[col] = pd.to_numeric(constructor_standings[col], errors='coerce')
-            
-            data['constructor_standings'] = constructor_standings
-        except Exception as e:
-            st.warning(f"Constructor standings data may have issues: {e}")
-        
-        data['_cache_time'] = file_mod_time  # Store for cache invalidation
-        
-        return data
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-        return None
+            refresh_data()
+        except Exception:
+            # Keep serving the current snapshot and retry on the next check
+            logger.exception("Refreshing the F1 data failed")
+
+def start_data_watcher(interval=WATCH_INTERVAL):
+    """Start the data watcher thread unless it is already running"""
+    global _watcher, _watcher_stop
+    if _watcher is not None and _watcher.is_alive():
+        return
+    with _watcher_lock:
+        if _watcher is None or not _watcher.is_alive():
+            _watcher_stop = threading.Event()
+            _watcher = threading.Thread(target=_watch_data, args=(interval, _watcher_stop),
+                                        name='f1-data-watcher', daemon=True)
+            _watcher.start()
+
+def stop_data_watcher(timeout=None):
+    """Stop the data watcher thread, if running, and wait for it to exit"""
+    global _watcher
+    with _watcher_lock:
+        watcher, stop = _watcher, _watcher_stop
+        _watcher = None
+    if watcher is not None:
+        stop.set()
+        watcher.join(timeout)
 
 def clear_data_cache():
-    """Clear the cached data"""
-    load_data.clear()
+    """Drop the current snapshot so the next load_data re-reads every file"""
+    global _snapshot
+    _snapshot = None
 
 def get_season_races(data, selected_season):
     """Get races for a specific season with circuit information"""
@@ -80,4 +114,4 @@ def get_race_options(season_races):
     sorted_races = season_races.sort_values('round')
     for _, race in sorted_races.iterrows():
         race_options.append(f"Round {race['round']}: {race['name_x']}")
-    return race_options
\ No newline at end of file
+    return race_options
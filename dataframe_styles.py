@@ -124,6 +124,19 @@ def create_driver_card(position, driver_name, team_name, driver_number="", team_
     </div>
     """
 
+def format_grid_conversion(driver):
+    """Card line with the win/podium/points rates from a grid slot in the seasons before the race, empty without history"""
+    conversion = driver.get('conversion')
+    if not conversion:
+        return ''
+    circuit = ''
+    if conversion['circuit_starts']:
+        circuit = f" · {conversion['circuit_win_rate']:.0%} win here ({conversion['circuit_starts']} earlier starts)"
+    return (f"<br><span style=\"color: #888; font-size: 0.85em;\" title=\"{conversion['starts']} starts from this slot "
+            f"in {conversion['seasons']}\">From P{driver.get('GRID POS.', '')} in {conversion['seasons']}: "
+            f"{conversion['win_rate']:.0%} win · {conversion['podium_rate']:.0%} podium · "
+            f"{conversion['points_rate']:.0%} points{circuit}</span>")
+
 def create_starting_grid_layout(grid_data, team_colors):
     """Create a simple starting grid layout using basic Streamlit components"""
     
@@ -170,7 +183,7 @@ def create_starting_grid_layout(grid_data, team_colors):
                 <div style="border-left: 5px solid {team_color}; background: #f8f9fa; padding: 15px; margin: 10px 0; border-radius: 5px;">
                     <div style="color: black;">
                         <strong>P{driver.get('GRID POS.', '')} - #{driver_number} {driver_name}</strong><br>
-                        <span style="color: #666;">{driver.get('TEAM', '')}</span>
+                        <span style="color: #666;">{driver.get('TEAM', '')}</span>{format_grid_conversion(driver)}
                     </div>
                 </div>
                 """, unsafe_allow_html=True)
@@ -200,7 +213,7 @@ def create_starting_grid_layout(grid_data, team_colors):
                 <div style="border-left: 5px solid {team_color}; background: #f8f9fa; padding: 15px; margin: 10px 0; border-radius: 5px;">
                     <div style="color: black;">
                         <strong>P{driver.get('GRID POS.', '')} - #{driver_number} {driver_name}</strong><br>
-                        <span style="color: #666;">{driver.get('TEAM', '')}</span>
+                        <span style="color: #666;">{driver.get('TEAM', '')}</span>{format_grid_conversion(driver)}
                     </div>
                 </div>
                 """, unsafe_allow_html=True)
\ No newline at end of file
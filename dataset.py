@@ -0,0 +1,187 @@
+"""Headless loading of the F1 dataset
+
+Reads the CSV files in f1_data into the data dictionary shared by the
+dashboard, f1_query and the command line tools, with per-race indexes.
+This module must not import streamlit.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from race_artifacts import index_race_tables, drop_derived
+from career_stats import update_career_stats
+from circuit_stats import index_circuits
+from contention import index_contention
+from records import update_records
+from ratings import update_ratings
+from reliability import classify_tables
+from season_summary import update_season_summary
+
+# Tables loaded into the data dictionary: key -> (CSV file, read_csv options)
+DATA_FILES = {
+    'races': ('f1_data/races.csv', {}),
+    'results': ('f1_data/results.csv', {}),
+    'drivers': ('f1_data/drivers.csv', {}),
+    'constructors': ('f1_data/constructors.csv', {}),
+    'driver_standings': ('f1_data/driver_standings.csv', {'na_values': ['\\N', 'N']}),
+    'constructor_standings': ('f1_data/constructor_standings.csv', {'na_values': ['\\N', 'N']}),
+    'qualifying': ('f1_data/qualifying.csv', {}),
+    'pit_stops': ('f1_data/pit_stops.csv', {}),
+    'sprint_results': ('f1_data/sprint_results.csv', {}),
+    'status': ('f1_data/status.csv', {}),
+    'seasons': ('f1_data/seasons.csv', {}),
+    'lap_times': ('f1_data/lap_times.csv', {}),
+}
+
+# Tables the dashboard can run without (their analysis views show "not available")
+OPTIONAL_TABLES = ['lap_times']
+
+# Standings files can carry \N placeholders in their numeric columns
+STANDINGS_TABLES = ['driver_standings', 'constructor_standings']
+
+_dataset = None
+_dataset_lock = threading.Lock()
+
+def get_circuits_file():
+    """Use the circuits file with local images if it exists, otherwise the original"""
+    local_images_file = 'f1_data/circuits_with_local_images.csv'
+    original_file = 'f1_data/circuits_updated.csv'
+    return local_images_file if os.path.exists(local_images_file) else original_file
+
+def get_data_files():
+    """All data files to load, including the circuits file"""
+    files = dict(DATA_FILES)
+    files['circuits'] = (get_circuits_file(), {})
+    return {key: spec for key, spec in files.items()
+            if key not in OPTIONAL_TABLES or os.path.exists(spec[0])}
+
+def read_tables(files, parallel=True, max_workers=None):
+    """Parse CSV files into DataFrames, concurrently in a thread pool by default
+
+    pandas' C parser releases the GIL while tokenizing, so independent files
+    parse in parallel on multi-core machines.
+
+    Returns:
+        dict: key -> DataFrame, or key -> Exception for files that failed to parse
+    """
+    def read(spec):
+        path, options = spec
+        try:
+            return pd.read_csv(path, **options)
+        except Exception as e:
+            return e
+
+    if not parallel:
+        return {key: read(spec) for key, spec in files.items()}
+
+    with ThreadPoolExecutor(max_workers=max_workers or min(len(files), (os.cpu_count() or 1) + 4)) as pool:
+        futures = {key: pool.submit(read, spec) for key, spec in files.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+def clean_standings(standings):
+    """Convert problematic standings columns to appropriate types"""
+    for col in ['position', 'points', 'wins']:
+        if col in standings.columns:
+            standings[col] = pd.to_numeric(standings[col], errors='coerce')
+    return standings
+
+def file_signature(path):
+    """Size and modification time of a data file, or None if it is missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+def file_signatures(files):
+    """Signature of every data file; the path is included so a switched circuits file counts as a change"""
+    return {key: (path, file_signature(path)) for key, (path, _) in files.items()}
+
+def add_tables(data, tables):
+    """Store parsed tables in a snapshot and return the ones that failed to parse"""
+    failed = {}
+    for key, table in tables.items():
+        if isinstance(table, Exception):
+            failed[key] = table
+        else:
+            data[key] = clean_standings(table) if key in STANDINGS_TABLES else table
+    return failed
+
+def finish_snapshot(data, signatures, changed):
+    """Rebuild the indexes and lookups of the changed tables and stamp the snapshot"""
+    # A new status table re-derives the status category column of the results
+    changed = set(changed) | classify_tables(data, changed)
+    index_race_tables(data, changed)
+    drop_derived(data, changed)
+    previous_career = data.get('_career')
+    update_career_stats(data, changed)
+    update_records(data, changed, previous_career)
+    update_ratings(data, changed, previous_career)
+    update_season_summary(data, changed, previous_career)
+    index_circuits(data, changed)
+    index_contention(data, changed)
+    data['_signatures'] = signatures
+    data['_cache_time'] = time.time()  # Snapshot version, used to invalidate caches built from it
+    return data
+
+def build_dataset():
+    """Read every data file into a new indexed data dictionary
+
+    Returns:
+        tuple: (data, failed) where failed maps table keys to their parse errors
+    """
+    files = get_data_files()
+    signatures = file_signatures(files)
+    data = {}
+    failed = add_tables(data, read_tables(files))
+    return finish_snapshot(data, signatures, set(files)), failed
+
+def refresh_snapshot(current):
+    """Re-read only the data files that changed since a snapshot was built
+
+    Unchanged tables are shared with the current snapshot, which is never
+    modified in place, so readers holding it are unaffected.
+
+    Returns:
+        tuple: (data, changed) with the new snapshot (current itself when
+        nothing changed) and the sorted keys of the reloaded tables
+    """
+    files = get_data_files()
+    signatures = file_signatures(files)
+    previous = current['_signatures']
+    changed = {key for key in signatures.keys() | previous.keys()
+               if signatures.get(key) != previous.get(key)}
+    if not changed:
+        return current, []
+
+    data = dict(current)
+    for key in changed:
+        data.pop(key, None)
+    failed = add_tables(data, read_tables({key: files[key] for key in changed if key in files}))
+    for key in failed:
+        # Most likely caught mid-write: keep the old table and retry on the next check
+        if key in current:
+            data[key] = current[key]
+        if key in previous:
+            signatures[key] = previous[key]
+        else:
+            signatures.pop(key, None)
+
+    return finish_snapshot(data, signatures, changed), sorted(changed)
+
+def get_dataset():
+    """Shared dataset for headless use, loaded on first access"""
+    global _dataset
+    if _dataset is None:
+        with _dataset_lock:
+            if _dataset is None:
+                data, failed = build_dataset()
+                for key, error in failed.items():
+                    if key not in OPTIONAL_TABLES + STANDINGS_TABLES:
+                        raise error
+                _dataset = data
+    return _dataset
@@ -0,0 +1,209 @@
+"""
+Export race summaries for downstream reporting
+
+Streams every race (or a range of seasons) through the same artifact
+builders as the dashboard and writes one table per view: summary, grid,
+results, sprint, driver_standings and constructor_standings. Each table is
+written as Parquet partitioned by year and as newline-delimited JSON.
+
+Usage:
+    python export_races.py [--from-season 2020] [--to-season 2024] [--workers N] [--out exports]
+"""
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from artifact_store import get_race_artifacts, json_default
+from dataset import get_dataset
+
+EXPORT_DIR = 'exports'
+# Written into every export; an existing --out directory is only replaced when it has one
+EXPORT_MANIFEST = 'export.json'
+
+# Artifact views exported row by row next to the one-row-per-race summary
+EXPORT_VIEWS = ['grid', 'results', 'sprint', 'driver_standings', 'constructor_standings']
+
+# Statistic cards flattened into the summary table
+SUMMARY_CARDS = ['winner', 'pole', 'fastest_lap', 'fastest_pit']
+
+# Grid card conversion fields, flattened into conversion_* columns
+CONVERSION_FIELDS = ['seasons', 'starts', 'win_rate', 'podium_rate', 'points_rate', 'circuit_starts', 'circuit_win_rate']
+
+# Numeric columns, typed the same in every chunk so the Parquet parts share one schema
+INTEGER_COLUMNS = ['pos', 'grid_pos', 'wins', 'podiums', 'laps', 'conversion_starts', 'conversion_circuit_starts']
+FLOAT_COLUMNS = ['points', 'conversion_win_rate', 'conversion_podium_rate', 'conversion_points_rate',
+                 'conversion_circuit_win_rate']
+
+# Races handed to a worker per task
+CHUNK_SIZE = 25
+
+_worker_data = None
+
+def _init_worker():
+    """Load the dataset once per worker process"""
+    global _worker_data
+    _worker_data = get_dataset()
+
+def column_name(label):
+    """Turn a display label such as 'GRID POS.' or 'TIME/RETIRED' into a column name"""
+    if label.isupper():
+        return re.sub(r'[^0-9a-z]+', '_', label.lower()).strip('_')
+    return label  # Already a field name such as driverId or team_color
+
+def export_record(record):
+    """Export columns of one artifact record, with the grid conversion dict flattened into scalars"""
+    row = {}
+    for label, value in record.items():
+        if label == 'conversion':
+            row.update({f'conversion_{field}': (value or {}).get(field) for field in CONVERSION_FIELDS})
+        else:
+            row[column_name(label)] = value
+    return row
+
+def race_export_rows(race, artifacts):
+    """Flatten one race's artifacts into rows per export table"""
+    race_fields = {
+        'raceId': int(race['raceId']),
+        'year': int(race['year']),
+        'round': int(race['round']),
+        'race_name': race['name'],
+    }
+    summary = dict(race_fields, date=race['date'], has_sprint=artifacts['has_sprint'])
+    for key in SUMMARY_CARDS:
+        card = artifacts['cards'].get(key) or {}
+        summary[f'{key}_driver_id'] = card.get('driverId')
+        summary[f'{key}_number'] = card.get('number')
+        summary[f'{key}_name'] = card.get('name')
+        summary[f'{key}_value'] = card.get('value')
+    rows = {'summary': [summary]}
+    for view in EXPORT_VIEWS:
+        rows[view] = [dict(race_fields, **export_record(record)) for record in artifacts[view] or []]
+    return rows
+
+def _export_chunk(race_ids):
+    """Build the export rows of a chunk of races"""
+    races = _worker_data['races'].set_index('raceId')
+    tables = {table: [] for table in ['summary'] + EXPORT_VIEWS}
+    for race_id in race_ids:
+        race = races.loc[race_id].copy()
+        race['raceId'] = race_id
+        for table, rows in race_export_rows(race, get_race_artifacts(race_id, _worker_data)).items():
+            tables[table].extend(rows)
+    return tables
+
+def to_frame(rows):
+    """DataFrame of export rows with Parquet-friendly column types"""
+    frame = pd.DataFrame(rows)
+    for col in frame.columns:
+        if col in INTEGER_COLUMNS or col.endswith('_driver_id'):
+            frame[col] = pd.to_numeric(frame[col].replace('', None), errors='coerce').astype('Int64')
+        elif col in FLOAT_COLUMNS:
+            frame[col] = pd.to_numeric(frame[col], errors='coerce').astype('float64')
+        elif frame[col].dtype == object:
+            frame[col] = frame[col].astype('string')
+    return frame
+
+def select_races(from_season=None, to_season=None):
+    """raceIds of the selected seasons in calendar order"""
+    races = pd.read_csv('f1_data/races.csv', usecols=['raceId', 'year', 'round'])
+    if from_season is not None:
+        races = races[races['year'] >= from_season]
+    if to_season is not None:
+        races = races[races['year'] <= to_season]
+    return [int(race_id) for race_id in races.sort_values(['year', 'round'])['raceId']]
+
+def check_out_dir(out_dir):
+    """Refuse to replace a path that is not an empty directory or an earlier export"""
+    if not os.path.exists(out_dir):
+        return
+    if not os.path.isdir(out_dir):
+        raise ValueError(f"{out_dir} exists and is not a directory")
+    if os.listdir(out_dir) and not os.path.isfile(os.path.join(out_dir, EXPORT_MANIFEST)):
+        raise ValueError(f"{out_dir} is not empty and was not written by export_races.py; choose another --out")
+
+def export_races(race_ids, out_dir=EXPORT_DIR, workers=None):
+    """Export races in parallel, streaming each finished chunk to Parquet and NDJSON
+
+    The export is written into a staging directory and swapped into place
+    when complete, so a failed run leaves the previous export untouched.
+    Raises ValueError when out_dir holds anything but an earlier export.
+    """
+    workers = workers or os.cpu_count() or 1
+    out_dir = os.path.normpath(out_dir)
+    check_out_dir(out_dir)
+    chunks = [race_ids[i:i + CHUNK_SIZE] for i in range(0, len(race_ids), CHUNK_SIZE)]
+    staging_dir = f"{out_dir}.building"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(os.path.join(staging_dir, 'ndjson'))
+
+    start = time.perf_counter()
+    exported = 0
+    ndjson_files = {}
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            for part, (chunk, tables) in enumerate(zip(chunks, pool.map(_export_chunk, chunks))):
+                for table, rows in tables.items():
+                    if not rows:
+                        continue
+                    if table not in ndjson_files:
+                        ndjson_files[table] = open(os.path.join(staging_dir, 'ndjson', f'{table}.ndjson'), 'w')
+                    for row in rows:
+                        ndjson_files[table].write(json.dumps(row, default=json_default) + '\n')
+                    pq.write_to_dataset(pa.Table.from_pandas(to_frame(rows), preserve_index=False),
+                                        root_path=os.path.join(staging_dir, 'parquet', table),
+                                        partition_cols=['year'],
+                                        basename_template=f'part-{part:05d}-{{i}}.parquet')
+                exported += len(chunk)
+    finally:
+        for f in ndjson_files.values():
+            f.close()
+    elapsed = time.perf_counter() - start
+
+    with open(os.path.join(staging_dir, EXPORT_MANIFEST), 'w') as f:
+        json.dump({'races': exported, 'tables': sorted(ndjson_files)}, f)
+    old_dir = f"{out_dir}.old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(out_dir):
+        os.rename(out_dir, old_dir)
+    os.rename(staging_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return exported, elapsed, workers
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Export race summaries to Parquet and NDJSON")
+    parser.add_argument('--from-season', type=int, default=None, help="first season to export")
+    parser.add_argument('--to-season', type=int, default=None, help="last season to export")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--out', default=EXPORT_DIR, help="output directory")
+    args = parser.parse_args(argv)
+
+    race_ids = select_races(args.from_season, args.to_season)
+    if not race_ids:
+        print("No races found for the selected seasons")
+        return 1
+
+    out_dir = os.path.normpath(args.out)
+    try:
+        check_out_dir(out_dir)
+    except ValueError as e:
+        print(f"Not exporting: {e}")
+        return 1
+
+    print(f"Exporting {len(race_ids)} races...")
+    exported, elapsed, workers = export_races(race_ids, out_dir, args.workers)
+    print(f"Exported {exported} races to {out_dir}/ in {elapsed:.1f}s with {workers} workers "
+          f"({exported / elapsed:.1f} races/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""Headless query API for the F1 dataset
+
+Race queries take a raceId, season_stints, season_qualifying_pace and
+what_if_standings a year, the career queries a
+driverId or constructorId, head_to_head two driverIds, circuit_races a
+circuitId and records a record name; every query returns a DataFrame. The data dictionary is
+optional and defaults to the shared indexed dataset from dataset.py. Nothing
+here imports streamlit, so the same queries serve the dashboard, batch jobs
+and benchmarks.
+
+Example:
+    >>> from f1_query import race_summary, pit_comparison
+    >>> race_summary(1144)
+    >>> pit_comparison(1144, 830, 1)
+"""
+
+import numpy as np
+import pandas as pd
+
+from dataset import get_dataset
+from career_stats import career_stats, career_summary
+from circuit_stats import HISTORY_COLUMNS, circuit_history
+from records import RECORDS, record_tables
+from contention import contention_after
+from ratings import ratings_after
+from qualifying_pace import race_qualifying_gaps, season_qualifying_gaps
+from reliability import season_reliability, reliability_by_season
+from grid_odds import conversion_rates
+from season_summary import season_summaries, compare_seasons
+from positions_gained import CLIMBER_COLUMNS, transition_matrix, scope_rows, climbers
+from points_systems import POINTS_SYSTEMS, what_if_standings as season_what_if_standings
+from head_to_head import head_to_head as driver_head_to_head, teammates_of
+from lap_analysis import DISTRIBUTION_COLUMNS, STRATEGY_COLUMNS, lap_distribution as race_lap_distribution, overtake_index, pair_overtakes, race_trace as lap_race_trace, replay_frames
+from race_artifacts import (race_rows, build_winner_card, build_pole_card, build_fastest_lap_card,
+                            build_fastest_pitstop_card, build_starting_grid, build_race_results,
+                            build_sprint_results, build_driver_standings, build_constructor_standings,
+                            build_qualifying_table, season_stint_table)
+
+SUMMARY_COLUMNS = ['statistic', 'driverId', 'number', 'name', 'value', 'team_color']
+REPLAY_COLUMNS = ['lap', 'position', 'driverId', 'gap_to_leader']
+PIT_COMPARISON_COLUMNS = ['stop', 'lap_1', 'duration_1', 'lap_2', 'duration_2', 'lap_diff', 'duration_diff']
+
+def _dataset(data):
+    """Use the given data dictionary or the shared dataset"""
+    return get_dataset() if data is None else data
+
+def _frame(records, columns=None):
+    """DataFrame from builder records, keeping the columns when there are no rows"""
+    return pd.DataFrame(records) if records else pd.DataFrame(columns=columns)
+
+def race_summary(race_id, data=None):
+    """Winner, pole position, fastest lap and fastest pit stop, one row per statistic"""
+    data = _dataset(data)
+    race_id = int(race_id)
+    race_results = race_rows(data, 'results', race_id)
+    cards = {
+        'winner': build_winner_card(race_results, data),
+        'pole': build_pole_card(race_id, race_results, data),
+        'fastest_lap': build_fastest_lap_card(race_results, data),
+        'fastest_pit': build_fastest_pitstop_card(race_id, race_results, data),
+    }
+    records = [{'statistic': statistic, **card} for statistic, card in cards.items() if card]
+    return _frame(records, SUMMARY_COLUMNS)
+
+def starting_grid(race_id, data=None):
+    """Starting grid ordered by grid slot"""
+    data = _dataset(data)
+    race_id = int(race_id)
+    return _frame(build_starting_grid(race_rows(data, 'results', race_id), data))
+
+def race_results(race_id, data=None):
+    """Race classification ordered by finishing position"""
+    data = _dataset(data)
+    race_id = int(race_id)
+    return _frame(build_race_results(race_rows(data, 'results', race_id), data))
+
+def sprint_results(race_id, data=None):
+    """Sprint classification ordered by finishing position (empty without a sprint)"""
+    data = _dataset(data)
+    return _frame(build_sprint_results(int(race_id), data))
+
+def standings_after(race_id, data=None, championship='drivers'):
+    """Driver or constructor championship standings after a race, sprint points included"""
+    data = _dataset(data)
+    race_id = int(race_id)
+    if championship == 'constructors':
+        return _frame(build_constructor_standings(race_id, data))
+    if championship != 'drivers':
+        raise ValueError(f"Unknown championship: {championship}")
+    return _frame(build_driver_standings(race_id, race_rows(data, 'results', race_id), data))
+
+def title_contention(race_id, data=None, championship='drivers'):
+    """Standings after a race with maximum achievable points, gap to the leader and contention flag"""
+    if championship not in ('drivers', 'constructors'):
+        raise ValueError(f"Unknown championship: {championship}")
+    rows = contention_after(int(race_id), _dataset(data), championship)
+    key = 'driverId' if championship == 'drivers' else 'constructorId'
+    if rows is None:
+        return pd.DataFrame(columns=['raceId', key, 'points', 'position', 'year', 'round', 'max_points', 'gap', 'in_contention'])
+    return rows.reset_index(drop=True)
+
+def driver_ratings(race_id, data=None):
+    """Elo-style rating of every rated driver after a race, highest first, with the race's rating changes"""
+    return ratings_after(int(race_id), _dataset(data))
+
+def qualifying_table(race_id, data=None):
+    """Qualifying classification with Q1/Q2/Q3 times ordered by position"""
+    data = _dataset(data)
+    return _frame(build_qualifying_table(int(race_id), data))
+
+def qualifying_pace(race_id, data=None, session=None):
+    """Gap to pole and to the teammate, in ms and percent, of every driver in Q1/Q2/Q3 and their best lap"""
+    return race_qualifying_gaps(int(race_id), _dataset(data), session).reset_index(drop=True)
+
+def season_qualifying_pace(year, data=None, session=None):
+    """Qualifying gaps of every driver in every race of a season"""
+    return season_qualifying_gaps(int(year), _dataset(data), session).reset_index(drop=True)
+
+def positions_gained_matrix(data=None, race_id=None, year=None, circuit_id=None):
+    """Grid x finish counts of a race, season or circuit (slot 0: pit lane start / not classified)"""
+    matrix = transition_matrix(_dataset(data), race_id=race_id, year=year, circuit_id=circuit_id)
+    return pd.DataFrame() if matrix is None else matrix
+
+def grid_conversion(data=None, circuit_id=None, year=None):
+    """Starts and win, podium and points rates from every grid slot, at a circuit and/or in a season's decade"""
+    return conversion_rates(_dataset(data), circuit_id=circuit_id, year=year)
+
+def biggest_climbers(data=None, race_id=None, year=None, circuit_id=None, top=10):
+    """Drivers with the most places gained from grid to finish in a race, season or circuit"""
+    rows = scope_rows(_dataset(data), race_id=race_id, year=year, circuit_id=circuit_id)
+    return climbers(rows, top) if not rows.empty else pd.DataFrame(columns=CLIMBER_COLUMNS)
+
+def constructor_reliability(year, data=None):
+    """Entries, starts, outcome counts by status category and finish/mechanical/accident rates of every constructor in a season"""
+    return season_reliability(int(year), _dataset(data))
+
+def reliability_history(data=None, constructor_id=None):
+    """Outcome counts and rates per season over the whole grid, or of one constructor"""
+    return reliability_by_season(_dataset(data), constructor_id)
+
+def pit_comparison(race_id, driver1_id, driver2_id, data=None):
+    """Stop-by-stop pit comparison of two drivers
+
+    One row per stop number made by either driver. lap_diff is positive when
+    driver 1 pitted later and duration_diff when driver 1 was slower; both are
+    NaN when only one of the drivers made that stop.
+    """
+    data = _dataset(data)
+    pit_stops = race_rows(data, 'pit_stops', int(race_id))
+    if pit_stops.empty:
+        return pd.DataFrame(columns=PIT_COMPARISON_COLUMNS)
+
+    def driver_stops(driver_id):
+        stops = pit_stops.loc[pit_stops['driverId'] == driver_id, ['stop', 'lap', 'duration']]
+        return stops.assign(duration=pd.to_numeric(stops['duration'], errors='coerce'))
+
+    comparison = driver_stops(driver1_id).merge(driver_stops(driver2_id), on='stop', how='outer',
+                                                suffixes=('_1', '_2'))
+    comparison['lap_diff'] = comparison['lap_1'] - comparison['lap_2']
+    comparison['duration_diff'] = comparison['duration_1'] - comparison['duration_2']
+    return comparison.sort_values('stop').reset_index(drop=True)[PIT_COMPARISON_COLUMNS]
+
+def overtakes(race_id, data=None, driver1_id=None, driver2_id=None):
+    """Every overtake of a race, or only those between two drivers when both are given"""
+    data = _dataset(data)
+    index = overtake_index(race_rows(data, 'lap_times', int(race_id)))
+    if driver1_id is not None and driver2_id is not None:
+        index = pair_overtakes(index, driver1_id, driver2_id).reset_index(drop=True)
+    return index
+
+def race_trace(race_id, data=None):
+    """Cumulative race time, gap to leader, gap to car ahead and interval per driver per lap, in seconds"""
+    data = _dataset(data)
+    return lap_race_trace(race_rows(data, 'lap_times', int(race_id)))
+
+def lap_distribution(race_id, data=None):
+    """Lap time quantiles and Tukey fences (seconds) of every driver in a race, pit in/out laps excluded"""
+    data = _dataset(data)
+    distribution = race_lap_distribution(race_rows(data, 'lap_times', int(race_id)),
+                                         race_rows(data, 'pit_stops', int(race_id)))
+    return pd.DataFrame(columns=DISTRIBUTION_COLUMNS) if distribution is None else distribution['summary']
+
+def race_replay(race_id, data=None, step=1):
+    """Running order and gap to the leader (s) on every step-th lap of a race, one row per running car"""
+    data = _dataset(data)
+    frames = replay_frames(race_rows(data, 'lap_times', int(race_id)))
+    if frames is None:
+        return pd.DataFrame(columns=REPLAY_COLUMNS)
+    order, gaps = frames['order'][::step], frames['gaps'][::step]
+    laps, positions = np.nonzero(order >= 0)
+    return pd.DataFrame({
+        'lap': frames['laps'][::step][laps].astype(int),
+        'position': positions + 1,
+        'driverId': frames['driver_ids'][order[laps, positions]],
+        'gap_to_leader': gaps[laps, positions].astype(float).round(3),
+    }, columns=REPLAY_COLUMNS)
+
+def race_strategy(race_id, data=None):
+    """Tyre stints of every driver in a race with lap range, pace and degradation"""
+    data = _dataset(data)
+    race_id = int(race_id)
+    race = data['races'][data['races']['raceId'] == race_id]
+    if race.empty:
+        return pd.DataFrame(columns=STRATEGY_COLUMNS)
+    stints = season_stint_table(int(race['year'].iloc[0]), data)
+    return stints[stints['raceId'] == race_id].reset_index(drop=True)
+
+def season_stints(year, data=None):
+    """Tyre stints of every driver in every race of a season"""
+    return season_stint_table(int(year), _dataset(data))
+
+def what_if_standings(year, data=None, system='current', championship='drivers'):
+    """Standings after every round of a season re-scored under a points system
+
+    system is a key of points_systems.POINTS_SYSTEMS or a dict from
+    points_systems.points_system.
+    """
+    if championship not in ('drivers', 'constructors'):
+        raise ValueError(f"Unknown championship: {championship}")
+    if not isinstance(system, dict):
+        if system not in POINTS_SYSTEMS:
+            raise ValueError(f"Unknown points system: {system}")
+        system = POINTS_SYSTEMS[system]
+    return season_what_if_standings(int(year), _dataset(data), system)[championship]
+
+def season_summary(data=None, years=None):
+    """Races, different winners, title margins, average winning margin, DNF rates and lead changes per season
+
+    All seasons of seasons.csv, or the given ones in the order given. champion_id is
+    null until every race of a season has results; leader_id is the standings leader.
+    """
+    data = _dataset(data)
+    table = season_summaries(data) if years is None else compare_seasons([int(year) for year in years], data)
+    return table.reset_index()
+
+def careers(data=None, kind='drivers'):
+    """Career totals of every driver or constructor, indexed by driverId or constructorId"""
+    if kind not in ('drivers', 'constructors'):
+        raise ValueError(f"Unknown career kind: {kind}")
+    return career_stats(_dataset(data))['careers'][kind]
+
+def career_seasons(entity_id, data=None, kind='drivers'):
+    """Season-by-season totals of one driver or constructor, indexed by year"""
+    if kind not in ('drivers', 'constructors'):
+        raise ValueError(f"Unknown career kind: {kind}")
+    return career_summary(int(entity_id), _dataset(data), kind)[1]
+
+def head_to_head(driver1_id, driver2_id, data=None, from_season=None, to_season=None):
+    """Race-by-race comparison of two drivers over the races they both entered, optionally within a span of seasons"""
+    data = _dataset(data)
+    race_ids = None
+    if from_season is not None or to_season is not None:
+        years = data['races']['year']
+        span = years.between(years.min() if from_season is None else from_season,
+                             years.max() if to_season is None else to_season)
+        race_ids = data['races'].loc[span, 'raceId'].to_numpy()
+    return driver_head_to_head(int(driver1_id), int(driver2_id), data, race_ids)[1]
+
+def teammates(driver_id, data=None):
+    """Every teammate of a driver with races together and finishing and qualifying head-to-head counts"""
+    return teammates_of(int(driver_id), _dataset(data))
+
+def circuit_races(circuit_id, data=None):
+    """Every race held at a circuit, latest first, with winner, pole sitter and fastest lap"""
+    history = circuit_history(int(circuit_id), _dataset(data))
+    if history is None:
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    return history['races'][HISTORY_COLUMNS].reset_index(drop=True)
+
+def records(name, data=None):
+    """Ranked leaderboard of one all-time record (see records.RECORDS for the names)"""
+    if name not in RECORDS:
+        raise ValueError(f"Unknown record: {name}")
+    return record_tables(_dataset(data))[name]
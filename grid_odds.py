@@ -0,0 +1,151 @@
+"""Historical win, podium and points conversion by grid slot for the F1 Dashboard
+
+Every start in the results is counted once per grid slot and season, both
+over all circuits and per circuit, with np.bincount on flattened (circuit,
+season, slot) keys. The counts are accumulated over the seasons and kept in
+the data dictionary under '_grid_odds' as small dense arrays, so the starts,
+wins, podiums and points finishes of any range of seasons are the difference
+of two array rows. Grid cards only count the seasons before the race, so a
+race's own result never feeds the rate it is annotated with. Entries that
+never started (DNQ, withdrawn) are left out; slot 0 is a pit lane start.
+Like race_artifacts, this module must not import streamlit.
+"""
+
+import numpy as np
+import pandas as pd
+
+from reliability import classify_statuses
+
+FIRST_SEASON = 1950
+# Seasons per era; eras are decades
+ERA_YEARS = 10
+# Seasons before a race counted on its grid cards
+PRIOR_SEASONS = 10
+
+# Outcome count -> rate column
+OUTCOMES = {'wins': 'win_rate', 'podiums': 'podium_rate', 'points': 'points_rate'}
+ODDS_COLUMNS = ['grid', 'starts', 'win_rate', 'podium_rate', 'points_rate']
+
+def era_index(years):
+    """Era (decade) index of one or more seasons"""
+    return (np.asarray(years) - FIRST_SEASON) // ERA_YEARS
+
+def era_label(era):
+    """Display label of an era index, e.g. '2010s'"""
+    return f"{FIRST_SEASON + era * ERA_YEARS}s"
+
+def era_seasons(year):
+    """First and last season of a season's era"""
+    first = FIRST_SEASON + int(era_index(year)) * ERA_YEARS
+    return first, first + ERA_YEARS - 1
+
+def _starts(data):
+    """Grid slot, circuit, season and outcome flags of every start"""
+    results = data['results']
+    if 'status_category' in results:
+        categories = results['status_category']
+    else:
+        status = classify_statuses(data['status']).set_index('statusId')['category']
+        categories = results['statusId'].map(status)
+    race_info = data['races'].set_index('raceId')[['year', 'circuitId']].reindex(results['raceId'])
+    started = (categories != 'Did Not Start').to_numpy()
+    started &= race_info['year'].notna().to_numpy()
+
+    finish = pd.to_numeric(results['position'], errors='coerce').to_numpy()
+    return pd.DataFrame({
+        'grid': pd.to_numeric(results['grid'], errors='coerce').fillna(0).to_numpy().astype(int),
+        'circuitId': race_info['circuitId'].to_numpy(),
+        'year': race_info['year'].to_numpy(),
+        'wins': finish == 1,
+        'podiums': finish <= 3,
+        'points': pd.to_numeric(results['points'], errors='coerce').fillna(0).to_numpy() > 0,
+    })[started].astype({'circuitId': int, 'year': int})
+
+def _accumulate(keys, shape, weights=None):
+    """Bincount of flattened (circuit, season, slot) keys, summed over the seasons with a leading zero row"""
+    counts = np.bincount(keys, weights=weights, minlength=int(np.prod(shape))).astype(np.int32).reshape(shape)
+    cumulative = np.zeros((shape[0], shape[1] + 1, shape[2]), dtype=np.int32)
+    np.cumsum(counts, axis=1, out=cumulative[:, 1:])
+    return cumulative
+
+def build_grid_odds(data):
+    """Starts and outcome counts per circuit (0: all) and grid slot, accumulated over the seasons
+
+    Returns:
+        dict: circuit_ids (circuit index i + 1 in the arrays), first_season,
+        seasons, slots, and 'starts', 'wins', 'podiums', 'points' int32 arrays
+        of shape (circuits + 1, seasons + 1, slots) where row s holds the
+        counts of the first s seasons
+    """
+    starts = _starts(data)
+    grid = starts['grid'].to_numpy()
+    circuit_ids, circuits = np.unique(starts['circuitId'].to_numpy(), return_inverse=True)
+    years = starts['year'].to_numpy()
+    first_season = int(years.min(initial=FIRST_SEASON))
+    seasons = years - first_season
+    n_circuits, n_seasons = len(circuit_ids) + 1, int(seasons.max(initial=0)) + 1
+    slots = int(grid.max(initial=0)) + 1
+
+    # Each start lands in two cells: (all, season) and (circuit, season)
+    circuit_keys = np.concatenate([np.zeros_like(circuits), circuits + 1])
+    keys = (circuit_keys * n_seasons + np.tile(seasons, 2)) * slots + np.tile(grid, 2)
+    shape = (n_circuits, n_seasons, slots)
+
+    odds = {'circuit_ids': circuit_ids, 'first_season': first_season, 'seasons': n_seasons, 'slots': slots}
+    odds['starts'] = _accumulate(keys, shape)
+    for outcome in OUTCOMES:
+        odds[outcome] = _accumulate(keys, shape, np.tile(starts[outcome].to_numpy(), 2))
+    return odds
+
+def grid_odds(data):
+    """Grid conversion counts of a snapshot, built on first access"""
+    if '_grid_odds' not in data:
+        data['_grid_odds'] = build_grid_odds(data)
+    return data['_grid_odds']
+
+def _cell(odds, circuit_id=None, first=None, last=None):
+    """Circuit index (0 for all) and season row range of a lookup, or None when unknown or empty"""
+    circuit = 0
+    if circuit_id is not None:
+        position = np.searchsorted(odds['circuit_ids'], circuit_id)
+        if position >= len(odds['circuit_ids']) or odds['circuit_ids'][position] != circuit_id:
+            return None
+        circuit = position + 1
+    low = 0 if first is None else min(max(first - odds['first_season'], 0), odds['seasons'])
+    high = odds['seasons'] if last is None else min(max(last - odds['first_season'] + 1, 0), odds['seasons'])
+    if low >= high:
+        return None
+    return circuit, low, high
+
+def _counts(odds, key, cell):
+    """Counts of every grid slot over a cell's seasons"""
+    circuit, low, high = cell
+    return odds[key][circuit, high] - odds[key][circuit, low]
+
+def conversion_rates(data, circuit_id=None, year=None):
+    """Starts and win, podium and points rates from every grid slot, at a circuit and/or in a season's era
+
+    Returns:
+        DataFrame: one row per grid slot with at least one start (slot 0: pit lane)
+    """
+    odds = grid_odds(data)
+    first, last = era_seasons(year) if year is not None else (None, None)
+    cell = _cell(odds, circuit_id, first, last)
+    if cell is None:
+        return pd.DataFrame(columns=ODDS_COLUMNS)
+    starts = _counts(odds, 'starts', cell)
+    used = starts > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rates = {rate: _counts(odds, outcome, cell) / starts for outcome, rate in OUTCOMES.items()}
+    table = pd.DataFrame({'grid': np.arange(odds['slots']), 'starts': starts, **rates}, columns=ODDS_COLUMNS)
+    return table[used].reset_index(drop=True)
+
+def slot_rates(odds, grid, circuit_id=None, first=None, last=None):
+    """Starts and win, podium and points rates of one grid slot over a range of seasons, or None without history"""
+    cell = _cell(odds, circuit_id, first, last)
+    if cell is None or not 0 <= grid < odds['slots']:
+        return None
+    starts = int(_counts(odds, 'starts', cell)[grid])
+    if not starts:
+        return None
+    return {'starts': starts, **{rate: _counts(odds, outcome, cell)[grid] / starts for outcome, rate in OUTCOMES.items()}}
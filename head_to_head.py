@@ -0,0 +1,197 @@
+"""Head-to-head comparison of any two drivers
+
+Results and qualifying rows are split once per snapshot into per-driver
+NumPy arrays sorted by raceId. A comparison intersects two drivers' raceIds
+with np.intersect1d and compares the aligned arrays: finishing ahead,
+qualifying ahead, points and the average qualifying gap, over any span of
+races. Teammate pairings, with their head-to-head counts, are precomputed
+for the whole history. Like race_artifacts, this module must not import
+streamlit.
+"""
+
+import numpy as np
+import pandas as pd
+
+from circuit_stats import lap_time_seconds
+
+RESULT_ARRAYS = ['positionOrder', 'points', 'position', 'constructorId']
+QUALIFYING_SESSIONS = ['q1', 'q2', 'q3']
+
+H2H_COLUMNS = ['raceId', 'year', 'round', 'race', 'finish_1', 'finish_2', 'points_1', 'points_2',
+               'quali_1', 'quali_2', 'quali_gap']
+
+def _driver_arrays(table, columns):
+    """driverId -> {'raceId': sorted raceIds, column: aligned values} for a race-level table"""
+    table = table.sort_values(['driverId', 'raceId'])
+    drivers = table['driverId'].to_numpy()
+    values = {col: table[col].to_numpy() for col in ['raceId'] + columns}
+    starts = np.flatnonzero(np.r_[True, drivers[1:] != drivers[:-1]])
+    ends = np.r_[starts[1:], len(drivers)]
+    return {int(drivers[start]): {col: array[start:end] for col, array in values.items()}
+            for start, end in zip(starts, ends)}
+
+def build_driver_index(data):
+    """Per-driver results and qualifying arrays of a snapshot"""
+    results = data['results']
+    results = pd.DataFrame({
+        'driverId': results['driverId'],
+        'raceId': results['raceId'],
+        'positionOrder': results['positionOrder'],
+        'points': pd.to_numeric(results['points'], errors='coerce').fillna(0.0),
+        'position': pd.to_numeric(results['position'], errors='coerce'),
+        'constructorId': results['constructorId'],
+        'grid': results['grid'],
+    }).drop_duplicates(['driverId', 'raceId'])
+    qualifying = data.get('qualifying', pd.DataFrame(columns=['driverId', 'raceId', 'position'] + QUALIFYING_SESSIONS))
+    qualifying = pd.DataFrame({
+        'driverId': qualifying['driverId'],
+        'raceId': qualifying['raceId'],
+        'position': pd.to_numeric(qualifying['position'], errors='coerce'),
+        **{session: lap_time_seconds(qualifying[session]) for session in QUALIFYING_SESSIONS},
+    }).drop_duplicates(['driverId', 'raceId'])
+    return {
+        'results': _driver_arrays(results, RESULT_ARRAYS + ['grid']),
+        'qualifying': _driver_arrays(qualifying, ['position'] + QUALIFYING_SESSIONS),
+    }
+
+def driver_index(data):
+    """Per-driver arrays of a snapshot, built on first access"""
+    if '_driver_index' not in data:
+        data['_driver_index'] = build_driver_index(data)
+    return data['_driver_index']
+
+def _empty_arrays(columns):
+    """Arrays of a driver with no rows"""
+    return {col: np.array([]) for col in ['raceId'] + columns}
+
+def _shared(arrays_1, arrays_2, race_ids=None):
+    """Indices of the races both drivers took part in, optionally limited to some raceIds"""
+    shared, index_1, index_2 = np.intersect1d(arrays_1['raceId'], arrays_2['raceId'],
+                                              assume_unique=True, return_indices=True)
+    if race_ids is not None:
+        keep = np.isin(shared, race_ids)
+        shared, index_1, index_2 = shared[keep], index_1[keep], index_2[keep]
+    return shared, index_1, index_2
+
+def qualifying_gaps(quali_1, quali_2, index_1, index_2):
+    """Gap in seconds (driver 1 minus driver 2) in the last session both drivers set a time in"""
+    gaps = np.full(len(index_1), np.nan)
+    for session in QUALIFYING_SESSIONS:
+        gap = quali_1[session][index_1] - quali_2[session][index_2]
+        gaps = np.where(np.isnan(gap), gaps, gap)
+    return gaps
+
+def head_to_head(driver1_id, driver2_id, data, race_ids=None):
+    """Compare two drivers over the races they both entered
+
+    Args:
+        race_ids: limit the comparison to these raceIds (e.g. a span of seasons)
+
+    Returns:
+        tuple: (summary dict, per-race DataFrame with H2H_COLUMNS)
+    """
+    index = driver_index(data)
+    results_1 = index['results'].get(driver1_id, _empty_arrays(RESULT_ARRAYS + ['grid']))
+    results_2 = index['results'].get(driver2_id, _empty_arrays(RESULT_ARRAYS + ['grid']))
+    races, r1, r2 = _shared(results_1, results_2, race_ids)
+
+    finish_1, finish_2 = results_1['positionOrder'][r1], results_2['positionOrder'][r2]
+    points_1, points_2 = results_1['points'][r1], results_2['points'][r2]
+    classified = ~np.isnan(results_1['position'][r1]) & ~np.isnan(results_2['position'][r2])
+
+    quali_1 = index['qualifying'].get(driver1_id, _empty_arrays(['position'] + QUALIFYING_SESSIONS))
+    quali_2 = index['qualifying'].get(driver2_id, _empty_arrays(['position'] + QUALIFYING_SESSIONS))
+    quali_races, q1, q2 = _shared(quali_1, quali_2, races)
+    gaps = qualifying_gaps(quali_1, quali_2, q1, q2)
+    # Grid slot stands in for the qualifying position before qualifying data exists
+    position_1 = pd.Series(results_1['grid'][r1], index=races, dtype=float)
+    position_2 = pd.Series(results_2['grid'][r2], index=races, dtype=float)
+    position_1[quali_races] = quali_1['position'][q1]
+    position_2[quali_races] = quali_2['position'][q2]
+    qualified = (position_1 > 0) & (position_2 > 0)
+
+    summary = {
+        'races': len(races),
+        'finished_ahead_1': int((finish_1 < finish_2).sum()),
+        'finished_ahead_2': int((finish_2 < finish_1).sum()),
+        'both_classified': int(classified.sum()),
+        'qualified_ahead_1': int((qualified & (position_1 < position_2)).sum()),
+        'qualified_ahead_2': int((qualified & (position_2 < position_1)).sum()),
+        'points_1': float(points_1.sum()),
+        'points_2': float(points_2.sum()),
+        'wins_1': int((results_1['position'][r1] == 1).sum()),
+        'wins_2': int((results_2['position'][r2] == 1).sum()),
+        'avg_quali_gap': float(np.nanmean(gaps)) if np.isfinite(gaps).any() else None,
+        'median_quali_gap': float(np.nanmedian(gaps)) if np.isfinite(gaps).any() else None,
+    }
+
+    race_info = data['races'].set_index('raceId').reindex(races)
+    per_race = pd.DataFrame({
+        'raceId': races,
+        'year': race_info['year'].to_numpy(),
+        'round': race_info['round'].to_numpy(),
+        'race': race_info['name'].to_numpy(),
+        'finish_1': finish_1,
+        'finish_2': finish_2,
+        'points_1': points_1,
+        'points_2': points_2,
+        'quali_1': position_1.to_numpy(),
+        'quali_2': position_2.to_numpy(),
+        'quali_gap': pd.Series(gaps, index=quali_races).reindex(races).to_numpy(),
+    })
+    return summary, per_race.sort_values(['year', 'round']).reset_index(drop=True)
+
+def build_teammate_pairs(data):
+    """Every pair of teammates with their races together and head-to-head counts
+
+    Returns:
+        DataFrame: driver_1, driver_2 (driver_1 < driver_2), constructorIds,
+        first_season, last_season, races, finished_ahead_1/2, qualified_ahead_1/2
+    """
+    results = data['results'][['raceId', 'driverId', 'constructorId', 'positionOrder', 'grid']]
+    results = results.merge(data['races'][['raceId', 'year']], on='raceId')
+    pairs = results.merge(results, on=['raceId', 'constructorId', 'year'], suffixes=('_1', '_2'))
+    pairs = pairs[pairs['driverId_1'] < pairs['driverId_2']]
+
+    qualifying = data.get('qualifying')
+    if qualifying is not None and not qualifying.empty:
+        quali_position = qualifying.set_index(['raceId', 'driverId'])['position']
+        quali_position = pd.to_numeric(quali_position[~quali_position.index.duplicated()], errors='coerce')
+        for side in ['1', '2']:
+            keys = pd.MultiIndex.from_arrays([pairs['raceId'], pairs[f'driverId_{side}']])
+            position = quali_position.reindex(keys).to_numpy()
+            pairs[f'quali_{side}'] = np.where(np.isnan(position), pairs[f'grid_{side}'], position)
+    else:
+        pairs['quali_1'], pairs['quali_2'] = pairs['grid_1'], pairs['grid_2']
+    qualified = (pairs['quali_1'] > 0) & (pairs['quali_2'] > 0)
+
+    pairs = pairs.assign(
+        finished_ahead_1=pairs['positionOrder_1'] < pairs['positionOrder_2'],
+        finished_ahead_2=pairs['positionOrder_2'] < pairs['positionOrder_1'],
+        qualified_ahead_1=qualified & (pairs['quali_1'] < pairs['quali_2']),
+        qualified_ahead_2=qualified & (pairs['quali_2'] < pairs['quali_1']),
+    )
+    teammates = pairs.groupby(['driverId_1', 'driverId_2']).agg(
+        constructorIds=('constructorId', 'unique'), first_season=('year', 'min'), last_season=('year', 'max'),
+        races=('raceId', 'nunique'), finished_ahead_1=('finished_ahead_1', 'sum'),
+        finished_ahead_2=('finished_ahead_2', 'sum'), qualified_ahead_1=('qualified_ahead_1', 'sum'),
+        qualified_ahead_2=('qualified_ahead_2', 'sum'))
+    teammates = teammates.reset_index().rename(columns={'driverId_1': 'driver_1', 'driverId_2': 'driver_2'})
+    return teammates.sort_values(['last_season', 'races'], ascending=False).reset_index(drop=True)
+
+def teammate_pairs(data):
+    """Teammate pairings of a snapshot, built on first access"""
+    if '_teammates' not in data:
+        data['_teammates'] = build_teammate_pairs(data)
+    return data['_teammates']
+
+def teammates_of(driver_id, data):
+    """Every teammate of a driver, seen from that driver's side (columns *_1 are the driver's)"""
+    pairs = teammate_pairs(data)
+    as_first = pairs[pairs['driver_1'] == driver_id].rename(columns={'driver_2': 'teammate'})
+    as_second = pairs[pairs['driver_2'] == driver_id].rename(columns={
+        'driver_1': 'teammate', 'finished_ahead_1': 'finished_ahead_2', 'finished_ahead_2': 'finished_ahead_1',
+        'qualified_ahead_1': 'qualified_ahead_2', 'qualified_ahead_2': 'qualified_ahead_1'})
+    columns = ['teammate', 'constructorIds', 'first_season', 'last_season', 'races',
+               'finished_ahead_1', 'finished_ahead_2', 'qualified_ahead_1', 'qualified_ahead_2']
+    return pd.concat([as_first[columns], as_second[columns]]).sort_values('first_season').reset_index(drop=True)
@@ -0,0 +1,90 @@
+"""Head-to-head page display functions"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from career_display import career_options
+from head_to_head import head_to_head, teammates_of
+
+def display_head_to_head_page(data):
+    """Display a head-to-head comparison of two drivers over a span of seasons"""
+    st.markdown("# ⚔️ Head to Head")
+
+    try:
+        driver_ids, labels = career_options(data, 'drivers')
+        col1, col2 = st.columns(2)
+        with col1:
+            driver1_id = st.selectbox("Driver 1", driver_ids, format_func=labels.get, key="h2h_driver1")
+
+        # Default to driver 1's latest teammate
+        teammates = teammates_of(driver1_id, data)
+        default_teammate = teammates.sort_values('last_season')['teammate'].iloc[-1] if not teammates.empty else None
+        default_index = driver_ids.index(default_teammate) if default_teammate in driver_ids else 1
+        with col2:
+            driver2_id = st.selectbox("Driver 2", driver_ids, index=default_index, format_func=labels.get,
+                                      key=f"h2h_driver2_{driver1_id}")
+
+        races = data['races']
+        first_season, last_season = int(races['year'].min()), int(races['year'].max())
+        seasons = st.slider("Seasons", first_season, last_season, (first_season, last_season), key="h2h_seasons")
+        race_ids = races.loc[races['year'].between(*seasons), 'raceId'].to_numpy()
+
+        summary, per_race = head_to_head(driver1_id, driver2_id, data, race_ids)
+        name_1, name_2 = labels[driver1_id].rsplit(' (', 1)[0], labels[driver2_id].rsplit(' (', 1)[0]
+        if summary['races'] == 0:
+            st.info(f"{name_1} and {name_2} never raced each other in the selected seasons")
+        else:
+            st.markdown(f"### {name_1} vs {name_2} ({summary['races']} races together)")
+            rows = [
+                ("Finished Ahead", str(summary['finished_ahead_1']), str(summary['finished_ahead_2'])),
+                ("Qualified Ahead", str(summary['qualified_ahead_1']), str(summary['qualified_ahead_2'])),
+                ("Wins", str(summary['wins_1']), str(summary['wins_2'])),
+                ("Points", f"{summary['points_1']:g}", f"{summary['points_2']:g}"),
+            ]
+            st.dataframe(pd.DataFrame(rows, columns=['', name_1, name_2]), use_container_width=True, hide_index=True)
+            if summary['avg_quali_gap'] is not None:
+                st.caption(f"Average qualifying gap ({name_1} minus {name_2}, last session both set a time in): "
+                           f"{summary['avg_quali_gap']:+.3f}s, median {summary['median_quali_gap']:+.3f}s")
+
+                gaps = per_race.dropna(subset=['quali_gap'])
+                gaps = gaps.assign(race_label=gaps['year'].astype(str) + ' ' + gaps['race'])
+                fig_gaps = px.bar(
+                    gaps,
+                    x='race_label',
+                    y='quali_gap',
+                    title=f"Qualifying Gap per Race (negative: {name_1} faster)",
+                    labels={'race_label': 'Race', 'quali_gap': 'Gap (s)'}
+                )
+                fig_gaps.update_layout(height=400, xaxis_title="", yaxis_title="Gap (s)", font=dict(size=14))
+                st.plotly_chart(fig_gaps, use_container_width=True)
+
+            st.markdown("**Race by Race:**")
+            st.dataframe(
+                per_race.rename(columns={
+                    'year': 'Season', 'race': 'Race', 'finish_1': f'{name_1} Finish', 'finish_2': f'{name_2} Finish',
+                    'quali_1': f'{name_1} Qualifying', 'quali_2': f'{name_2} Qualifying', 'quali_gap': 'Qualifying Gap (s)'
+                }).drop(columns=['raceId', 'round', 'points_1', 'points_2']).round(3),
+                use_container_width=True,
+                hide_index=True
+            )
+
+        st.markdown(f"**Teammates of {name_1}:**")
+        if teammates.empty:
+            st.info("No teammates recorded")
+        else:
+            constructor_names = data['constructors'].set_index('constructorId')['name']
+            st.dataframe(
+                pd.DataFrame({
+                    'Teammate': teammates['teammate'].map(lambda driver_id: labels.get(driver_id, driver_id)),
+                    'Team': teammates['constructorIds'].map(lambda ids: ', '.join(constructor_names.reindex(ids).fillna('Unknown'))),
+                    'Races': teammates['races'],
+                    'Finished Ahead': teammates['finished_ahead_1'].astype(str) + ' - ' + teammates['finished_ahead_2'].astype(str),
+                    'Qualified Ahead': teammates['qualified_ahead_1'].astype(str) + ' - ' + teammates['qualified_ahead_2'].astype(str),
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+    except Exception as e:
+        st.error(f"Error loading head-to-head comparison: {e}")
+        st.info("Head-to-head comparison not available")
@@ -0,0 +1,310 @@
+"""Lap-by-lap race analysis engines for the F1 Dashboard
+
+Builds laps x drivers NumPy matrices from a race's lap_times rows and derives
+whole-grid analyses from them in a few array operations. Like race_artifacts,
+this module must not import streamlit.
+"""
+
+import numpy as np
+import pandas as pd
+
+OVERTAKE_COLUMNS = ['lap', 'overtaker', 'overtaken', 'overtaker_position', 'overtaken_position']
+STINT_COLUMNS = ['raceId', 'driverId', 'from_lap', 'to_lap', 'laps']
+STRATEGY_COLUMNS = ['raceId', 'driverId', 'stint', 'from_lap', 'to_lap', 'laps', 'pace_laps',
+                    'avg_lap', 'median_lap', 'degradation']
+TRACE_COLUMNS = ['lap', 'driverId', 'elapsed', 'gap_to_leader', 'gap_to_ahead', 'interval', 'trace']
+DISTRIBUTION_COLUMNS = ['driverId', 'laps', 'fastest', 'lower_fence', 'q1', 'median', 'q3', 'upper_fence',
+                        'mean', 'slowest']
+
+def lap_matrix(race_laps, column):
+    """Laps x drivers matrix of one lap_times column (NaN where a driver has no lap)
+
+    Returns:
+        tuple: (laps, driver_ids, matrix) with the laps and driverIds labelling
+        the rows and columns
+    """
+    laps = np.sort(race_laps['lap'].unique())
+    driver_ids = np.sort(race_laps['driverId'].unique())
+    matrix = np.full((len(laps), len(driver_ids)), np.nan)
+    rows = np.searchsorted(laps, race_laps['lap'].to_numpy())
+    cols = np.searchsorted(driver_ids, race_laps['driverId'].to_numpy())
+    matrix[rows, cols] = pd.to_numeric(race_laps[column], errors='coerce').to_numpy(dtype=float)
+    return laps, driver_ids, matrix
+
+def overtake_index(race_laps):
+    """Every position swap between two drivers from one lap to the next
+
+    A swap is counted on lap n when driver a ran behind driver b on lap n-1
+    and ahead of b on lap n. Drivers missing either lap are skipped.
+
+    Returns:
+        DataFrame: lap, overtaker, overtaken (driverIds) and their positions
+        on that lap, ordered by lap and position
+    """
+    if race_laps.empty:
+        return pd.DataFrame(columns=OVERTAKE_COLUMNS)
+    laps, driver_ids, positions = lap_matrix(race_laps, 'position')
+    previous, current = positions[:-1], positions[1:]
+    # (lap, a, b): a was behind b and is now ahead of b; NaN compares False
+    swaps = (previous[:, :, None] > previous[:, None, :]) & (current[:, :, None] < current[:, None, :])
+    lap_idx, overtaker, overtaken = np.nonzero(swaps)
+    overtakes = pd.DataFrame({
+        'lap': laps[lap_idx + 1],
+        'overtaker': driver_ids[overtaker],
+        'overtaken': driver_ids[overtaken],
+        'overtaker_position': current[lap_idx, overtaker].astype(int),
+        'overtaken_position': current[lap_idx, overtaken].astype(int),
+    })
+    return overtakes.sort_values(['lap', 'overtaker_position', 'overtaken_position']).reset_index(drop=True)
+
+def pair_overtakes(overtakes, driver1_id, driver2_id):
+    """Overtakes between two drivers, in either direction"""
+    pair = {driver1_id, driver2_id}
+    return overtakes[overtakes['overtaker'].isin(pair) & overtakes['overtaken'].isin(pair)]
+
+def race_trace_matrices(race_laps):
+    """Cumulative race time and gap matrices (laps x drivers, in seconds)
+
+    Lap times are summed with NaN handling: a missing lap time inside a run is
+    treated as 0 so one bad timing row does not end a driver's race, while
+    every lap after a driver's last completed lap stays NaN (retirement).
+
+    Returns:
+        dict: laps, driver_ids and the matrices
+            elapsed        cumulative race time at the end of each lap
+            gap_to_leader  time behind the car that completed the lap first
+            gap_to_ahead   time behind the car directly ahead on the road
+            interval       change of gap_to_ahead since the previous lap
+                           (negative while closing in)
+            trace          time ahead of the winner's average pace (race trace)
+    """
+    laps, driver_ids, lap_ms = lap_matrix(race_laps, 'milliseconds')
+    completed = ~np.isnan(lap_ms)
+    last_lap = np.where(completed.any(axis=0), len(laps) - 1 - np.argmax(completed[::-1], axis=0), -1)
+    retired = np.arange(len(laps))[:, None] > last_lap[None, :]
+    elapsed = np.where(retired, np.nan, np.nancumsum(lap_ms, axis=0)) / 1000.0
+
+    gap_to_leader = elapsed - np.nanmin(np.where(retired, np.inf, elapsed), axis=1, keepdims=True)
+
+    # Gap to the car ahead: sort each lap by elapsed time (NaN last) and diff
+    order = np.argsort(elapsed, axis=1)
+    ordered = np.take_along_axis(elapsed, order, axis=1)
+    ahead = np.full_like(ordered, np.nan)
+    ahead[:, 1:] = ordered[:, 1:] - ordered[:, :-1]
+    ahead[:, 0] = 0.0
+    ahead[np.isnan(ordered)] = np.nan
+    gap_to_ahead = np.empty_like(ahead)
+    np.put_along_axis(gap_to_ahead, order, ahead, axis=1)
+
+    interval = np.full_like(gap_to_ahead, np.nan)
+    interval[1:] = gap_to_ahead[1:] - gap_to_ahead[:-1]
+
+    # Reference pace: the average lap of the driver furthest into the race in the least time
+    finished = last_lap == last_lap.max()
+    winner = np.flatnonzero(finished)[np.nanargmin(elapsed[-1, finished])] if finished.any() else 0
+    reference = elapsed[last_lap[winner], winner] / (last_lap[winner] + 1)
+    trace = (np.arange(1, len(laps) + 1) * reference)[:, None] - elapsed
+
+    return {
+        'laps': laps,
+        'driver_ids': driver_ids,
+        'elapsed': elapsed,
+        'gap_to_leader': gap_to_leader,
+        'gap_to_ahead': gap_to_ahead,
+        'interval': interval,
+        'trace': trace,
+    }
+
+def race_trace(race_laps):
+    """Race trace of every driver in long form: one row per driver per completed lap"""
+    if race_laps.empty:
+        return pd.DataFrame(columns=TRACE_COLUMNS)
+    matrices = race_trace_matrices(race_laps)
+    laps, driver_ids = matrices['laps'], matrices['driver_ids']
+    trace = pd.DataFrame({
+        'lap': np.repeat(laps, len(driver_ids)),
+        'driverId': np.tile(driver_ids, len(laps)),
+        **{name: matrices[name].ravel() for name in TRACE_COLUMNS[2:]},
+    })
+    return trace[trace['elapsed'].notna()].reset_index(drop=True)
+
+def replay_frames(race_laps):
+    """Running order and gap to the leader on every lap, as compact arrays for a replay
+
+    The running order follows the lap_times positions (cumulative time where
+    a position is missing); retired cars drop out of the order.
+
+    Returns:
+        dict: laps (int16), driver_ids, order (int16 laps x slots: column of
+        driver_ids in each running position, -1 in unused slots) and gaps
+        (float32 laps x slots: seconds behind the leader, NaN in unused
+        slots); None without lap times
+    """
+    if race_laps.empty:
+        return None
+    matrices = race_trace_matrices(race_laps)
+    _, _, positions = lap_matrix(race_laps, 'position')
+    gap = matrices['gap_to_leader']
+    running = ~np.isnan(gap)
+    position_key = np.where(running & ~np.isnan(positions), positions, np.inf)
+    order = np.lexsort((np.where(running, gap, np.inf), position_key, ~running), axis=1)
+    used = np.take_along_axis(running, order, axis=1)
+    return {
+        'laps': matrices['laps'].astype(np.int16),
+        'driver_ids': matrices['driver_ids'],
+        'order': np.where(used, order, -1).astype(np.int16),
+        'gaps': np.where(used, np.take_along_axis(gap, order, axis=1), np.nan).astype(np.float32),
+    }
+
+def decimate_frames(frame_count, step):
+    """Indices of every step-th frame, always keeping the first and last"""
+    if frame_count <= 0:
+        return np.array([], dtype=int)
+    return np.unique(np.r_[np.arange(0, frame_count, max(int(step), 1)), frame_count - 1])
+
+# Laps slower than this multiple of the driver's stint median (safety car, incidents)
+# are left out of the pace and degradation figures
+SLOW_LAP_FACTOR = 1.07
+
+def _stint_keys(race_ids, driver_ids, laps):
+    """One sortable int64 per (race, driver, lap) so stops can be searched in a single array"""
+    return (race_ids.astype(np.int64) * 100_000 + driver_ids.astype(np.int64)) * 1_000 + laps.astype(np.int64)
+
+def race_stints(lap_times, pit_stops):
+    """Tyre stints of every driver in the given races, from lap_times and pit_stops
+
+    A driver's stint n covers the laps after their (n-1)th stop up to and
+    including the in-lap of their nth stop. Pace figures (seconds) skip in-laps,
+    out-laps, the opening lap and laps slower than SLOW_LAP_FACTOR x the stint
+    median; degradation is the least-squares lap time slope in seconds per lap.
+
+    Returns:
+        DataFrame: raceId, driverId, stint, from_lap, to_lap, laps, pace_laps,
+        avg_lap, median_lap and degradation, ordered by race, driver and stint
+    """
+    if lap_times.empty:
+        return pd.DataFrame(columns=STRATEGY_COLUMNS)
+    laps = lap_times[['raceId', 'driverId', 'lap']].copy()
+    laps['seconds'] = pd.to_numeric(lap_times['milliseconds'], errors='coerce').to_numpy() / 1000.0
+    race_ids, driver_ids, lap = (laps[col].to_numpy() for col in ['raceId', 'driverId', 'lap'])
+
+    # Stops made before each lap: count pit laps between the driver's lap 0 and this lap
+    stops = np.sort(_stint_keys(pit_stops['raceId'].to_numpy(), pit_stops['driverId'].to_numpy(),
+                                pit_stops['lap'].to_numpy()))
+    lap_keys = _stint_keys(race_ids, driver_ids, lap)
+    driver_start = _stint_keys(race_ids, driver_ids, np.zeros_like(lap))
+    laps['stint'] = np.searchsorted(stops, lap_keys, side='left') - np.searchsorted(stops, driver_start, side='left') + 1
+
+    in_lap = np.isin(lap_keys, stops)
+    out_lap = np.isin(lap_keys - 1, stops)
+    clean = ~in_lap & ~out_lap & (lap > 1) & ~np.isnan(laps['seconds'].to_numpy())
+    keys = ['raceId', 'driverId', 'stint']
+    stint_median = laps['seconds'].where(clean).groupby([laps[k] for k in keys]).transform('median')
+    clean &= (laps['seconds'] <= stint_median * SLOW_LAP_FACTOR).to_numpy()
+
+    # Least-squares slope from per-stint sums: (n*Sxy - Sx*Sy) / (n*Sxx - Sx^2)
+    pace = laps[clean].assign(x=lambda df: df['lap'].astype(float))
+    pace = pace.assign(xy=pace['x'] * pace['seconds'], xx=pace['x'] ** 2)
+    sums = pace.groupby(keys).agg(
+        pace_laps=('seconds', 'size'), avg_lap=('seconds', 'mean'), median_lap=('seconds', 'median'),
+        sx=('x', 'sum'), sy=('seconds', 'sum'), sxy=('xy', 'sum'), sxx=('xx', 'sum'))
+    n = sums['pace_laps']
+    denominator = n * sums['sxx'] - sums['sx'] ** 2
+    sums['degradation'] = ((n * sums['sxy'] - sums['sx'] * sums['sy']) / denominator.where(denominator > 0))
+
+    stints = laps.groupby(keys).agg(from_lap=('lap', 'min'), to_lap=('lap', 'max'), laps=('lap', 'size'))
+    stints = stints.join(sums[['pace_laps', 'avg_lap', 'median_lap', 'degradation']])
+    stints['pace_laps'] = stints['pace_laps'].fillna(0).astype(int)
+    return stints.reset_index()[STRATEGY_COLUMNS]
+
+# Histogram bins shared by every driver of a race
+DISTRIBUTION_BINS = 30
+
+def lap_distribution(race_laps, race_pit_stops, bins=DISTRIBUTION_BINS):
+    """Lap time quantiles and histogram of every driver in one race, without pit in-laps and out-laps
+
+    Fences are the Tukey whiskers (the furthest laps within 1.5 IQR of the
+    quartiles). The histogram bins span the fastest lap to the slowest upper
+    fence; slower laps (safety car, incidents) are counted in the last bin.
+
+    Returns:
+        dict: 'summary' DataFrame with DISTRIBUTION_COLUMNS in seconds, fastest
+        median first, 'edges' the bin edges in seconds and 'counts' a drivers x
+        bins array in summary order; None without lap times
+    """
+    if race_laps.empty:
+        return None
+    laps, driver_ids, times = lap_matrix(race_laps, 'milliseconds')
+    times = times / 1000.0
+    if not race_pit_stops.empty:
+        stop_drivers = race_pit_stops['driverId'].to_numpy()
+        cols = np.minimum(np.searchsorted(driver_ids, stop_drivers), len(driver_ids) - 1)
+        known = driver_ids[cols] == stop_drivers
+        for offset in (0, 1):
+            stop_laps = race_pit_stops['lap'].to_numpy() + offset
+            rows = np.minimum(np.searchsorted(laps, stop_laps), len(laps) - 1)
+            hit = known & (laps[rows] == stop_laps)
+            times[rows[hit], cols[hit]] = np.nan
+
+    counted = (~np.isnan(times)).sum(axis=0)
+    times, driver_ids, counted = times[:, counted > 0], driver_ids[counted > 0], counted[counted > 0]
+    if not len(driver_ids):
+        return None
+    fastest, q1, median, q3, slowest = np.nanquantile(times, [0.0, 0.25, 0.5, 0.75, 1.0], axis=0)
+    iqr = q3 - q1
+    lower_fence = np.nanmin(np.where(times >= q1 - 1.5 * iqr, times, np.nan), axis=0)
+    upper_fence = np.nanmax(np.where(times <= q3 + 1.5 * iqr, times, np.nan), axis=0)
+    summary = pd.DataFrame({
+        'driverId': driver_ids, 'laps': counted, 'fastest': fastest, 'lower_fence': lower_fence, 'q1': q1,
+        'median': median, 'q3': q3, 'upper_fence': upper_fence, 'mean': np.nanmean(times, axis=0), 'slowest': slowest,
+    }, columns=DISTRIBUTION_COLUMNS)
+
+    low, high = np.nanmin(fastest), np.nanmax(upper_fence)
+    edges = np.linspace(low, high if high > low else low + 1.0, bins + 1)
+    rows, cols = np.nonzero(~np.isnan(times))
+    slots = np.clip(np.searchsorted(edges, times[rows, cols], side='right') - 1, 0, bins - 1)
+    counts = np.zeros((len(driver_ids), bins), dtype=int)
+    np.add.at(counts, (cols, slots), 1)
+
+    order = np.argsort(median, kind='stable')
+    return {'summary': summary.iloc[order].reset_index(drop=True), 'edges': edges, 'counts': counts[order]}
+
+def leadership_stints(lap_times):
+    """Run-length encode the race leader of every race in one pass
+
+    A stint is an unbroken run of consecutive laps led by the same driver; a
+    new stint starts whenever the race, the leader or the lap sequence changes.
+
+    Returns:
+        DataFrame: raceId, driverId, from_lap, to_lap and laps of every stint
+    """
+    leaders = lap_times.loc[lap_times['position'] == 1, ['raceId', 'lap', 'driverId']]
+    if leaders.empty:
+        return pd.DataFrame(columns=STINT_COLUMNS)
+    leaders = leaders.sort_values(['raceId', 'lap'])
+    race = leaders['raceId'].to_numpy()
+    driver = leaders['driverId'].to_numpy()
+    lap = leaders['lap'].to_numpy()
+
+    new_stint = np.ones(len(leaders), dtype=bool)
+    new_stint[1:] = (race[1:] != race[:-1]) | (driver[1:] != driver[:-1]) | (lap[1:] != lap[:-1] + 1)
+    starts = np.flatnonzero(new_stint)
+    ends = np.append(starts[1:], len(leaders)) - 1
+    return pd.DataFrame({
+        'raceId': race[starts],
+        'driverId': driver[starts],
+        'from_lap': lap[starts],
+        'to_lap': lap[ends],
+        'laps': ends - starts + 1,
+    })
+
+def laps_led_leaderboard(stints):
+    """Laps led, leadership stints and races led per driver, most laps first"""
+    if stints.empty:
+        return pd.DataFrame(columns=['driverId', 'laps_led', 'stints', 'races_led'])
+    leaderboard = stints.groupby('driverId').agg(
+        laps_led=('laps', 'sum'),
+        stints=('laps', 'size'),
+        races_led=('raceId', 'nunique'),
+    ).reset_index()
+    return leaderboard.sort_values(['laps_led', 'races_led'], ascending=False).reset_index(drop=True)
@@ -0,0 +1,231 @@
+"""Points-system "what-if" engine for the F1 Dashboard
+
+Re-scores every race (and sprint) from results.positionOrder with a pluggable
+points table and rebuilds the cumulative driver and constructor standings of
+a season round by round with NumPy scatter-adds, cumsum and a single lexsort
+for the countback. Finishing rows for the whole history are extracted once
+per snapshot and kept in the data dictionary under '_finishes', so scoring a
+season under another system is pure array work. Like race_artifacts, this
+module must not import streamlit.
+
+Historical rules beyond the points table (dropped scores, shared drives,
+only the best car scoring for a constructor) are not modelled.
+"""
+
+import numpy as np
+import pandas as pd
+
+from career_stats import EXCLUDED_POSITIONS
+from season_summary import completed_seasons
+
+# Points tables by finishing position; fastest_lap_top limits the bonus to drivers finishing in that range
+POINTS_SYSTEMS = {
+    'current': {'label': "2025 onwards (25-18-15, sprint 8-1)", 'race': [25, 18, 15, 12, 10, 8, 6, 4, 2, 1],
+                'sprint': [8, 7, 6, 5, 4, 3, 2, 1], 'fastest_lap': 0, 'fastest_lap_top': None},
+    '2022': {'label': "2022-2024 (25-18-15, sprint 8-1, fastest lap)", 'race': [25, 18, 15, 12, 10, 8, 6, 4, 2, 1],
+             'sprint': [8, 7, 6, 5, 4, 3, 2, 1], 'fastest_lap': 1, 'fastest_lap_top': 10},
+    '2010': {'label': "2010-2018 (25-18-15)", 'race': [25, 18, 15, 12, 10, 8, 6, 4, 2, 1],
+             'sprint': [], 'fastest_lap': 0, 'fastest_lap_top': None},
+    '2003': {'label': "2003-2009 (10-8-6)", 'race': [10, 8, 6, 5, 4, 3, 2, 1],
+             'sprint': [], 'fastest_lap': 0, 'fastest_lap_top': None},
+    '1991': {'label': "1991-2002 (10-6-4)", 'race': [10, 6, 4, 3, 2, 1],
+             'sprint': [], 'fastest_lap': 0, 'fastest_lap_top': None},
+    '1961': {'label': "1961-1990 (9-6-4)", 'race': [9, 6, 4, 3, 2, 1],
+             'sprint': [], 'fastest_lap': 0, 'fastest_lap_top': None},
+    '1950': {'label': "1950-1959 (8-6-4, fastest lap)", 'race': [8, 6, 4, 3, 2],
+             'sprint': [], 'fastest_lap': 1, 'fastest_lap_top': None},
+}
+
+# Preset in force from each season on. 1960 (8-6-4-3-2-1) and 2019-2021
+# (fastest lap, 3-2-1 sprints) use the next preset whose maximum haul is
+# at least as high, which is what maximum_points needs.
+SEASON_SYSTEMS = [(1950, '1950'), (1961, '1961'), (1991, '1991'), (2003, '2003'), (2010, '2010'),
+                  (2019, '2022'), (2025, 'current')]
+
+FINISH_COLUMNS = ['raceId', 'year', 'round', 'driverId', 'constructorId', 'finish', 'fastest']
+
+def points_system(race, sprint=(), fastest_lap=0, fastest_lap_top=None, label="Custom"):
+    """A points system from a race points table, an optional sprint table and fastest-lap bonus"""
+    return {'label': label, 'race': list(race), 'sprint': list(sprint),
+            'fastest_lap': fastest_lap, 'fastest_lap_top': fastest_lap_top}
+
+def season_points_system(year):
+    """Points system of the rules in force in a season (see SEASON_SYSTEMS)"""
+    key = SEASON_SYSTEMS[0][1]
+    for first_season, preset in SEASON_SYSTEMS:
+        if year >= first_season:
+            key = preset
+    return POINTS_SYSTEMS[key]
+
+def maximum_points(system, championship='drivers'):
+    """Most points a driver (win and fastest lap) or a constructor (one-two) can score in a race and in a sprint"""
+    cars = 1 if championship == 'drivers' else 2
+    return sum(system['race'][:cars]) + system['fastest_lap'], sum(system['sprint'][:cars])
+
+def _finish_rows(table, races, fastest_lap=True):
+    """Finishing rows of a results table: classified positionOrder (0 otherwise), sorted by year and round"""
+    race_info = races.set_index('raceId')[['year', 'round']].reindex(table['raceId'])
+    classified = pd.to_numeric(table['position'], errors='coerce').notna().to_numpy()
+    if fastest_lap and 'rank' in table:
+        fastest = (pd.to_numeric(table['rank'], errors='coerce') == 1).to_numpy()
+    else:
+        fastest = np.zeros(len(table), dtype=bool)
+    rows = pd.DataFrame({
+        'raceId': table['raceId'].to_numpy(),
+        'year': race_info['year'].to_numpy(),
+        'round': race_info['round'].to_numpy(),
+        'driverId': table['driverId'].to_numpy(),
+        'constructorId': table['constructorId'].to_numpy(),
+        'finish': np.where(classified, table['positionOrder'].to_numpy(), 0),
+        'fastest': fastest,
+    }, columns=FINISH_COLUMNS).dropna(subset=['year'])
+    rows[['year', 'round']] = rows[['year', 'round']].astype(int)
+    return rows.sort_values(['year', 'round'], kind='stable').reset_index(drop=True)
+
+def finish_table(data):
+    """Race and sprint finishing rows of every season, built on first access"""
+    if '_finishes' not in data:
+        sprints = data.get('sprint_results', pd.DataFrame(columns=['raceId', 'driverId', 'constructorId',
+                                                                    'position', 'positionOrder']))
+        data['_finishes'] = {
+            'race': _finish_rows(data['results'], data['races']),
+            # Fastest-lap points were never awarded in sprints
+            'sprint': _finish_rows(sprints, data['races'], fastest_lap=False),
+        }
+    return data['_finishes']
+
+def score(finish, table, fastest=None, fastest_lap=0, fastest_lap_top=None):
+    """Points of each finishing position (0 = not classified) under a points table, plus the fastest-lap bonus"""
+    lookup = np.zeros(max(len(table), int(finish.max(initial=0))) + 1)
+    lookup[1:len(table) + 1] = table
+    points = lookup[finish]
+    if fastest is not None and fastest_lap:
+        eligible = fastest & (finish > 0)
+        if fastest_lap_top is not None:
+            eligible &= finish <= fastest_lap_top
+        points = points + np.where(eligible, fastest_lap, 0)
+    return points
+
+def _season_rows(rows, year):
+    """Rows of one season from a finishing table sorted by year"""
+    years = rows['year'].to_numpy()
+    return rows.iloc[np.searchsorted(years, year, 'left'):np.searchsorted(years, year, 'right')]
+
+def _cumulative_standings(rounds, entities, points, race_rounds, race_entities, finish, n_rounds, n_entities):
+    """Cumulative points, wins, championship position and entry mask after every round
+
+    Ties on points are broken by countback (most wins, then most second
+    places, ...), with one lexsort over every round at once.
+    """
+    totals = np.zeros((n_rounds, n_entities))
+    np.add.at(totals, (rounds, entities), points)
+    totals = totals.cumsum(axis=0)
+    entered = np.zeros((n_rounds, n_entities), dtype=bool)
+    entered[rounds, entities] = True
+    entered = np.logical_or.accumulate(entered, axis=0)
+
+    counts = np.zeros((n_rounds, n_entities, int(finish.max(initial=0)) + 1))
+    np.add.at(counts, (race_rounds, race_entities, finish), 1)
+    counts = counts.cumsum(axis=0)
+
+    keys = [-counts[:, :, place].ravel() for place in range(counts.shape[2] - 1, 0, -1)]
+    keys += [-totals.ravel(), ~entered.ravel(), np.repeat(np.arange(n_rounds), n_entities)]
+    order = np.lexsort(keys)
+    position = np.empty(n_rounds * n_entities, dtype=int)
+    position[order] = np.tile(np.arange(1, n_entities + 1), n_rounds)
+    wins = counts[:, :, 1] if counts.shape[2] > 1 else np.zeros((n_rounds, n_entities))
+    return totals, wins, position.reshape(n_rounds, n_entities), entered
+
+def what_if_standings(year, data, system):
+    """Driver and constructor standings after every round of a season under a points system
+
+    Returns:
+        dict: 'drivers' and 'constructors' DataFrames with raceId, round,
+        driverId/constructorId, points, wins and position, one row per entrant
+        and round from their first race on
+    """
+    finishes = finish_table(data)
+    race = _season_rows(finishes['race'], year)
+    sprint = _season_rows(finishes['sprint'], year)
+    rounds, round_starts = np.unique(race['round'].to_numpy(), return_index=True)
+    race_ids = race['raceId'].to_numpy()[round_starts]
+    # Sprints of rounds without race results yet are left out with their round
+    sprint = sprint[np.isin(sprint['round'].to_numpy(), rounds)]
+
+    race_points = score(race['finish'].to_numpy(), system['race'], race['fastest'].to_numpy(),
+                        system['fastest_lap'], system['fastest_lap_top'])
+    sprint_points = score(sprint['finish'].to_numpy(), system['sprint'])
+    points = np.concatenate([race_points, sprint_points])
+    round_index = np.searchsorted(rounds, np.concatenate([race['round'].to_numpy(), sprint['round'].to_numpy()]))
+    race_round_index = round_index[:len(race)]
+
+    standings = {}
+    for kind, key in [('drivers', 'driverId'), ('constructors', 'constructorId')]:
+        ids, entities = np.unique(np.concatenate([race[key].to_numpy(), sprint[key].to_numpy()]), return_inverse=True)
+        totals, wins, position, entered = _cumulative_standings(
+            round_index, entities, points, race_round_index, entities[:len(race)],
+            race['finish'].to_numpy(), len(rounds), len(ids))
+        cells = np.nonzero(entered)
+        standings[kind] = pd.DataFrame({
+            'raceId': race_ids[cells[0]],
+            'round': rounds[cells[0]],
+            key: ids[cells[1]],
+            'points': totals[cells],
+            'wins': wins[cells].astype(int),
+            'position': position[cells],
+        }).sort_values(['round', 'position']).reset_index(drop=True)
+    return standings
+
+def _championship_rows(rows, complete, excluded_keys):
+    """Finishing rows of completed seasons, without drivers excluded from that season's championship"""
+    keys = rows['year'].to_numpy() * 100000 + rows['driverId'].to_numpy()
+    in_complete = rows['year'].map(complete).fillna(False).to_numpy(dtype=bool)
+    return rows[in_complete & ~np.isin(keys, excluded_keys)]
+
+def what_if_champions(data, system):
+    """Drivers' champion of every completed season under a points system next to the actual champion
+
+    Final totals are scored over all history at once; ties are broken by
+    countback. Drivers excluded from a season's championship (positionText D
+    or E in its standings) are left out of it, and seasons still in progress
+    are skipped. The actual champion is the leader of the final driver
+    standings of each season.
+    """
+    finishes = finish_table(data)
+    complete = completed_seasons(data['races'], data['results'])
+    standings = data['driver_standings'].merge(data['races'][['raceId', 'year', 'round']], on='raceId')
+    excluded = standings.loc[standings['positionText'].astype(str).isin(EXCLUDED_POSITIONS), ['year', 'driverId']]
+    excluded_keys = (excluded['year'] * 100000 + excluded['driverId']).to_numpy()
+
+    race = _championship_rows(finishes['race'], complete, excluded_keys)
+    sprint = _championship_rows(finishes['sprint'], complete, excluded_keys)
+    years = np.concatenate([race['year'].to_numpy(), sprint['year'].to_numpy()])
+    drivers = np.concatenate([race['driverId'].to_numpy(), sprint['driverId'].to_numpy()])
+    points = np.concatenate([
+        score(race['finish'].to_numpy(), system['race'], race['fastest'].to_numpy(),
+              system['fastest_lap'], system['fastest_lap_top']),
+        score(sprint['finish'].to_numpy(), system['sprint'])])
+
+    # One entry per season and driver: scatter-add the points and countback places
+    pairs, entries = np.unique(years * 100000 + drivers, return_inverse=True)
+    totals = np.zeros(len(pairs))
+    np.add.at(totals, entries, points)
+    finish = race['finish'].to_numpy()
+    places = np.zeros((len(pairs), int(finish.max(initial=0)) + 1))
+    np.add.at(places, (entries[:len(race)], finish), 1)
+
+    keys = [-places[:, place] for place in range(places.shape[1] - 1, 0, -1)]
+    order = np.lexsort(keys + [-totals, pairs // 100000])
+    champions = pd.DataFrame({'year': pairs[order] // 100000, 'driverId': pairs[order] % 100000,
+                              'points': totals[order]}).drop_duplicates('year').set_index('year')
+
+    final_rounds = standings.groupby('year')['round'].transform('max')
+    actual = standings[(standings['round'] == final_rounds) & (standings['position'] == 1)]
+    actual = actual.drop_duplicates('year').set_index('year')
+
+    return pd.DataFrame({
+        'driverId': champions['driverId'],
+        'points': champions['points'],
+        'actual_driverId': actual['driverId'].reindex(champions.index).astype('Int64'),
+        'actual_points': actual['points'].reindex(champions.index),
+    }).rename_axis('year').reset_index()
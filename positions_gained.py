@@ -0,0 +1,141 @@
+"""Grid-to-finish positions gained for the F1 Dashboard
+
+Every result row is reduced once, in one vectorized pass over the results
+table, to its grid slot, finishing slot and the places gained between them.
+From these rows the grid x finish transition counts of every season and
+every circuit are scatter-added into small dense matrices (slot 0 is a pit
+lane start on the grid axis and an unclassified finish on the finish axis).
+The rows and matrices are kept in the data dictionary under
+'_positions_gained', so race, season and circuit views only slice them. Like
+race_artifacts, this module must not import streamlit.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Grid slot of a pit lane start and finish slot of a driver who was not classified
+PIT_LANE = 0
+NOT_CLASSIFIED = 0
+
+GAINED_COLUMNS = ['raceId', 'year', 'round', 'circuitId', 'driverId', 'constructorId', 'grid', 'finish', 'gained']
+CLIMBER_COLUMNS = ['driverId', 'races', 'gained', 'avg_gained', 'best_climb']
+
+def _gained_rows(data):
+    """Grid slot, finishing slot and places gained of every result, sorted by season and round
+
+    Places gained are counted for classified finishers only; a pit lane
+    start counts as starting behind the whole field.
+    """
+    results = data['results']
+    race_info = data['races'].set_index('raceId')[['year', 'round', 'circuitId']].reindex(results['raceId'])
+    grid = pd.to_numeric(results['grid'], errors='coerce').fillna(PIT_LANE).to_numpy().astype(int)
+    classified = pd.to_numeric(results['position'], errors='coerce').notna().to_numpy()
+    finish = np.where(classified, results['positionOrder'].to_numpy(), NOT_CLASSIFIED).astype(int)
+    starters = results.groupby('raceId')['driverId'].transform('size').to_numpy()
+    start = np.where(grid == PIT_LANE, starters, grid)
+
+    rows = pd.DataFrame({
+        'raceId': results['raceId'].to_numpy(),
+        'year': race_info['year'].to_numpy(),
+        'round': race_info['round'].to_numpy(),
+        'circuitId': race_info['circuitId'].to_numpy(),
+        'driverId': results['driverId'].to_numpy(),
+        'constructorId': results['constructorId'].to_numpy(),
+        'grid': grid,
+        'finish': finish,
+        'gained': np.where(classified, start - finish, np.nan),
+    }, columns=GAINED_COLUMNS).dropna(subset=['year'])
+    rows[['year', 'round', 'circuitId']] = rows[['year', 'round', 'circuitId']].astype(int)
+    rows['gained'] = rows['gained'].astype('Int64')
+    return rows.sort_values(['year', 'round', 'finish'], kind='stable').reset_index(drop=True)
+
+def _transition_counts(keys, grid, finish, slots):
+    """Dense grid x finish count matrix of every distinct key, in one scatter-add
+
+    Returns:
+        tuple: (sorted keys, int32 array keys x slots x slots)
+    """
+    ids, groups = np.unique(keys, return_inverse=True)
+    counts = np.zeros((len(ids), slots, slots), dtype=np.int32)
+    np.add.at(counts, (groups, grid, finish), 1)
+    return ids, counts
+
+def build_positions_gained(data):
+    """Positions-gained rows and the grid x finish matrices of every season and circuit"""
+    rows = _gained_rows(data)
+    grid, finish = rows['grid'].to_numpy(), rows['finish'].to_numpy()
+    slots = int(max(grid.max(initial=0), finish.max(initial=0))) + 1
+    years, season_counts = _transition_counts(rows['year'].to_numpy(), grid, finish, slots)
+    circuits, circuit_counts = _transition_counts(rows['circuitId'].to_numpy(), grid, finish, slots)
+    return {
+        'rows': rows,
+        'slots': slots,
+        'seasons': {'ids': years, 'counts': season_counts},
+        'circuits': {'ids': circuits, 'counts': circuit_counts},
+    }
+
+def positions_gained(data):
+    """Positions-gained state of a snapshot, built on first access"""
+    if '_positions_gained' not in data:
+        data['_positions_gained'] = build_positions_gained(data)
+    return data['_positions_gained']
+
+def _lookup(index, key):
+    """Count matrix of one season or circuit, or None"""
+    position = np.searchsorted(index['ids'], key)
+    if position < len(index['ids']) and index['ids'][position] == key:
+        return index['counts'][position]
+    return None
+
+def scope_rows(data, race_id=None, year=None, circuit_id=None):
+    """Positions-gained rows of one race, season or circuit"""
+    rows = positions_gained(data)['rows']
+    if race_id is not None:
+        return rows[rows['raceId'].to_numpy() == race_id]
+    if year is not None:
+        years = rows['year'].to_numpy()
+        return rows.iloc[np.searchsorted(years, year, 'left'):np.searchsorted(years, year, 'right')]
+    if circuit_id is not None:
+        return rows[rows['circuitId'].to_numpy() == circuit_id]
+    return rows
+
+def transition_matrix(data, race_id=None, year=None, circuit_id=None):
+    """Grid x finish counts of one race, season or circuit, trimmed to the slots used
+
+    Returns:
+        DataFrame: rows are grid slots and columns finishing slots, slot 0 being
+        a pit lane start and an unclassified finish; None when nothing matches
+    """
+    state = positions_gained(data)
+    if race_id is not None:
+        rows = scope_rows(data, race_id=race_id)
+        if rows.empty:
+            return None
+        _, counts = _transition_counts(np.zeros(len(rows), dtype=int), rows['grid'].to_numpy(),
+                                       rows['finish'].to_numpy(), state['slots'])
+        counts = counts[0]
+    elif year is not None:
+        counts = _lookup(state['seasons'], year)
+    else:
+        counts = _lookup(state['circuits'], circuit_id)
+    if counts is None:
+        return None
+    used = np.flatnonzero(counts.any(axis=0) | counts.any(axis=1))
+    size = int(used.max()) + 1 if len(used) else 1
+    return pd.DataFrame(counts[:size, :size], index=pd.RangeIndex(size, name='grid'),
+                        columns=pd.RangeIndex(size, name='finish'))
+
+def climbers(rows, top=None):
+    """Places gained per driver over a set of rows, most gained first
+
+    Returns:
+        DataFrame: driverId, classified races, total and average places gained
+        and the best single climb
+    """
+    classified = rows[rows['gained'].notna()]
+    if classified.empty:
+        return pd.DataFrame(columns=CLIMBER_COLUMNS)
+    gained = classified['gained'].astype(int)
+    table = gained.groupby(classified['driverId']).agg(races='size', gained='sum', avg_gained='mean', best_climb='max')
+    table = table.reset_index().sort_values(['gained', 'avg_gained'], ascending=False)
+    return (table if top is None else table.head(top)).reset_index(drop=True)[CLIMBER_COLUMNS]
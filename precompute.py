@@ -0,0 +1,108 @@
+"""
+Precompute per-race artifacts for the F1 Dashboard
+
+Fans out over every raceId with a process pool and writes the winner, pole,
+fastest lap and fastest pit stop cards, grid, results, sprint, standings,
+leadership and pit summary of each race into the local artifact store.
+
+Usage:
+    python precompute.py [--workers N] [--out artifacts]
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from artifact_store import ARTIFACT_DIR, MANIFEST_FILE, data_snapshot_hash, write_race_artifacts, write_manifest
+from race_artifacts import build_race_artifacts
+from dataset import get_dataset
+
+# Races handed to a worker per task; keeps inter-process traffic low
+CHUNK_SIZE = 25
+
+_worker_data = None
+
+def load_precompute_data():
+    """Load every table, indexed by raceId"""
+    return get_dataset()
+
+def _init_worker():
+    """Load the data once per worker process"""
+    global _worker_data
+    _worker_data = load_precompute_data()
+
+def _build_chunk(race_ids, out_dir):
+    """Build and write the artifacts of a chunk of races"""
+    for race_id in race_ids:
+        write_race_artifacts(build_race_artifacts(race_id, _worker_data), out_dir)
+    return len(race_ids)
+
+def check_out_dir(out_dir):
+    """Refuse to replace a path that is not an empty directory or an earlier artifact store"""
+    if not os.path.exists(out_dir):
+        return
+    if not os.path.isdir(out_dir):
+        raise ValueError(f"{out_dir} exists and is not a directory")
+    if os.listdir(out_dir) and not os.path.isfile(os.path.join(out_dir, MANIFEST_FILE)):
+        raise ValueError(f"{out_dir} is not empty and is not an artifact store; choose another --out")
+
+def precompute_all(workers=None, out_dir=ARTIFACT_DIR):
+    """Build artifacts for every race and atomically replace the artifact store
+
+    Raises ValueError when out_dir holds anything but an earlier artifact store.
+    """
+    workers = workers or os.cpu_count() or 1
+    out_dir = os.path.normpath(out_dir)
+    check_out_dir(out_dir)
+    snapshot = data_snapshot_hash()
+    races = pd.read_csv('f1_data/races.csv', usecols=['raceId'])
+    race_ids = sorted(int(race_id) for race_id in races['raceId'].unique())
+    chunks = [race_ids[i:i + CHUNK_SIZE] for i in range(0, len(race_ids), CHUNK_SIZE)]
+
+    # Build into a staging directory so readers never see a half-written store
+    staging_dir = f"{out_dir}.building"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(os.path.join(staging_dir, 'races'))
+
+    start = time.perf_counter()
+    built = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for count in pool.map(_build_chunk, chunks, [staging_dir] * len(chunks)):
+            built += count
+    elapsed = time.perf_counter() - start
+
+    write_manifest(snapshot, built, staging_dir)
+    old_dir = f"{out_dir}.old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(out_dir):
+        os.rename(out_dir, old_dir)
+    os.rename(staging_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return built, elapsed, workers
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Precompute per-race artifacts for the F1 Dashboard")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--out', default=ARTIFACT_DIR, help="artifact store directory")
+    args = parser.parse_args(argv)
+
+    out_dir = os.path.normpath(args.out)
+    try:
+        check_out_dir(out_dir)
+    except ValueError as e:
+        print(f"Not precomputing: {e}")
+        return 1
+
+    print("Precomputing race artifacts...")
+    built, elapsed, workers = precompute_all(args.workers, out_dir)
+    print(f"Built artifacts for {built} races in {elapsed:.1f}s with {workers} workers "
+          f"({built / elapsed:.1f} races/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Background prefetch of adjacent rounds for the F1 Dashboard
+
+Users mostly step forward and back through a season. After a race page is
+rendered, the page bundles of round-1 and round+1 are built on a background
+thread: artifacts, stat card HTML and pre-sized circuit and flag images. The
+next navigation is then served from memory.
+"""
+
+import io
+import os
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import streamlit as st
+from PIL import Image, UnidentifiedImageError
+
+from artifact_store import get_race_artifacts
+from race_stats import render_stat_cards
+
+logger = logging.getLogger(__name__)
+
+# Display widths used by race_display for the circuit layout and country flag
+CIRCUIT_IMAGE_WIDTH = 600
+FLAG_IMAGE_WIDTH = 220
+
+# Rounds prefetched relative to the one being viewed
+PREFETCH_OFFSETS = (1, -1)
+
+# Race page bundles kept in memory (least recently used are dropped first)
+MAX_BUNDLES = 16
+
+_bundles = OrderedDict()
+_pending = {}
+_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prefetch')
+
+def presize_image(path, width):
+    """Downscale a local image to its display width, returned as PNG bytes (None if not local)"""
+    if not isinstance(path, str) or not path or not os.path.exists(path):
+        return None
+    try:
+        with Image.open(path) as image:
+            if image.width > width:
+                image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, format='PNG', optimize=True)
+            return buffer.getvalue()
+    except (OSError, UnidentifiedImageError) as e:
+        logger.warning("Could not presize image %s: %s", path, e)
+        return None
+
+def build_race_bundle(race, data):
+    """Build everything a race page needs that does not depend on widget state"""
+    race_results = data['results'][data['results']['raceId'] == race['raceId']]
+    artifacts = None
+    cards_html = None
+    if not race_results.empty:
+        artifacts = get_race_artifacts(race['raceId'], data)
+        cards_html = render_stat_cards(artifacts)
+    return {
+        'artifacts': artifacts,
+        'cards_html': cards_html,
+        'circuit_image': presize_image(race.get('circuit_image_local'), CIRCUIT_IMAGE_WIDTH),
+        'flag_image': presize_image(race.get('country_flag_local'), FLAG_IMAGE_WIDTH),
+    }
+
+def _bundle_key(race, data):
+    """Bundles are tied to the loaded data so a reload never serves stale pages"""
+    return int(race['raceId']), data.get('_cache_time')
+
+def _store_bundle(key, bundle):
+    """Add a bundle to the in-memory cache, evicting the least recently used"""
+    with _lock:
+        _bundles[key] = bundle
+        _bundles.move_to_end(key)
+        while len(_bundles) > MAX_BUNDLES:
+            _bundles.popitem(last=False)
+
+def _prefetch(key, race, data):
+    """Build one bundle in the background (best effort: failures are rebuilt on demand)"""
+    try:
+        _store_bundle(key, build_race_bundle(race, data))
+    except Exception:
+        # The page is built again on demand when the user navigates to it
+        logger.exception("Prefetching race %s failed", key[0])
+    finally:
+        with _lock:
+            _pending.pop(key, None)
+
+def get_race_bundle(race, data):
+    """Get a race page bundle, served from the prefetch cache when warm"""
+    key = _bundle_key(race, data)
+    with _lock:
+        bundle = _bundles.get(key)
+        future = _pending.get(key)
+        if bundle is not None:
+            _bundles.move_to_end(key)
+
+    if bundle is None and future is not None:
+        # Prefetch already in flight: wait for it rather than building twice
+        future.result()
+        with _lock:
+            bundle = _bundles.get(key)
+
+    record_navigation(key[0], bundle is not None)
+    if bundle is None:
+        bundle = build_race_bundle(race, data)
+        _store_bundle(key, bundle)
+    return bundle
+
+def prefetch_adjacent_rounds(race, season_races, data):
+    """Queue background builds for the rounds either side of the viewed race"""
+    for offset in PREFETCH_OFFSETS:
+        neighbours = season_races[season_races['round'] == race['round'] + offset]
+        if neighbours.empty:
+            continue
+        neighbour = neighbours.iloc[0]
+        key = _bundle_key(neighbour, data)
+        with _lock:
+            if key in _bundles or key in _pending:
+                continue
+            _pending[key] = _executor.submit(_prefetch, key, neighbour, data)
+
+def record_navigation(race_id, hit):
+    """Count a prefetch hit or miss once per navigation (reruns of the same page are ignored)"""
+    if st.session_state.get('prefetch_last_race') == race_id:
+        return
+    st.session_state['prefetch_last_race'] = race_id
+    stats = st.session_state.setdefault('prefetch_stats', {'hits': 0, 'misses': 0})
+    stats['hits' if hit else 'misses'] += 1
+
+def display_prefetch_stats():
+    """Show the prefetch hit rate of this session in the sidebar"""
+    stats = st.session_state.get('prefetch_stats', {'hits': 0, 'misses': 0})
+    total = stats['hits'] + stats['misses']
+    with st.sidebar:
+        st.markdown("### ⚡ Prefetch")
+        st.metric("Hit rate", f"{stats['hits'] / total:.0%}" if total else "-")
+        st.caption(f"{stats['hits']} hits / {stats['misses']} misses over {total} page views")
@@ -4,10 +4,13 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
-from utils import time_to_seconds, format_time_mmssms, get_constructor_name
+from utils import time_to_seconds, format_time_mmssms
 
 from graph_styling import apply_team_colors_to_existing_chart, get_driver_constructor_mapping
 from card_styling import get_driver_team_color_for_race
+from f1_query import qualifying_table
+from race_artifacts import race_rows
+from qualifying_pace import GAP_COLUMNS, SESSIONS, BEST_SESSION, race_qualifying_gaps, season_qualifying_gaps
 
 def clean_display_value(value):
     """Clean display values by replacing \\N with -"""
@@ -33,11 +36,7 @@ def create_qualifying_cards(quali_grid, quali_display, data, race_id):
     # Create a single column layout for qualifying results
     for i, result in enumerate(quali_grid):
         # Get team color for this driver
-        if race_id and i < len(quali_display):
-            driver_id = quali_display.iloc[i]['driverId']
-            team_color = get_driver_team_color_for_race(driver_id, race_id, data)
-        else:
-            team_color = '#808080'
+        team_color = result.get('team_color', '#808080')
         
         # Create individual qualifying card
         with st.container():
@@ -68,49 +67,15 @@ def display_qualifying_data(race_id, data):
     st.markdown("### Qualifying Results")
     
     try:
-        # Try to load qualifying data
-        qualifying_data = pd.read_csv('f1_data/qualifying.csv')
-        quali_results = qualifying_data[qualifying_data['raceId'] == race_id]
+        quali_results = race_rows(data, 'qualifying', race_id)
         
         if not quali_results.empty:
             # Merge with driver and constructor data
             quali_display = quali_results.merge(data['drivers'], on='driverId', how='left')
             quali_display = quali_display.merge(data['constructors'], on='constructorId', how='left')
             
-            # Prepare data for display
-            quali_grid = []
-            for _, row in quali_display.iterrows():
-                constructor_name = get_constructor_name(row, data)
-                
-                # Format driver name with number
-                driver_number = ""
-                if 'number_x' in row.index and pd.notna(row['number_x']):
-                    try:
-                        driver_number = f"#{int(float(row['number_x']))}"
-                    except (ValueError, TypeError):
-                        if row['number_x'] != 'N' and row['number_x'] != '\\N':
-                            driver_number = f"#{row['number_x']}"
-                elif 'number_y' in row.index and pd.notna(row['number_y']):
-                    try:
-                        driver_number = f"#{int(float(row['number_y']))}"
-                    except (ValueError, TypeError):
-                        if row['number_y'] != 'N' and row['number_y'] != '\\N':
-                            driver_number = f"#{row['number_y']}"
-                
-                driver_name = f"{row['forename']} {row['surname']}" if pd.notna(row['forename']) and pd.notna(row['surname']) else 'N/A'
-                formatted_driver = f"{driver_number} {driver_name}".strip()
-                
-                quali_grid.append({
-                    'POS.': int(row['position']) if pd.notna(row['position']) else '',
-                    'DRIVER': formatted_driver,
-                    'TEAM': constructor_name,
-                    'Q1': row['q1'] if pd.notna(row['q1']) else '',
-                    'Q2': row['q2'] if pd.notna(row['q2']) else '',
-                    'Q3': row['q3'] if pd.notna(row['q3']) else ''
-                })
-            
-            # Sort by position
-            quali_grid = sorted(quali_grid, key=lambda x: x['POS.'] if x['POS.'] != '' else 999)
+            # Qualifying classification with team colors
+            quali_grid = qualifying_table(race_id, data).to_dict('records')
             
             # Create qualifying cards
             create_qualifying_cards(quali_grid, quali_display, data, race_id)
@@ -120,7 +85,7 @@ def display_qualifying_data(race_id, data):
             st.markdown("### Qualifying Analysis")
             
             # Create tabs for different analysis views
-            analysis_tabs = st.tabs(["Session Best Times", "Compare Lap Times", "Qualifying Progression"])
+            analysis_tabs = st.tabs(["Session Best Times", "Compare Lap Times", "Qualifying Progression", "Season Qualifying Pace"])
             
             with analysis_tabs[0]:
                 display_session_best_times(quali_display, data, race_id)
@@ -130,6 +95,9 @@ def display_qualifying_data(race_id, data):
             
             with analysis_tabs[2]:
                 display_qualifying_progression_all_drivers(quali_display, data, race_id)
+            
+            with analysis_tabs[3]:
+                display_season_qualifying_pace(race_id, data)
                 
         else:
             st.info("Qualifying data not available for this race")
@@ -147,63 +115,51 @@ def display_session_best_times(quali_display, data, race_id=None):
     # Create three columns for the cards
     cols = st.columns(3)
     
+    # Session bests from the precomputed gap table (the first row of each session is the fastest)
+    gaps = race_qualifying_gaps(race_id, data) if race_id is not None else pd.DataFrame(columns=GAP_COLUMNS)
+    drivers = quali_display.drop_duplicates('driverId').set_index('driverId')
+    
     for i, session in enumerate(sessions):
-        session_col = session.lower()
-        session_data = quali_display[quali_display[session_col].notna()].copy()
+        session_gaps = gaps[(gaps['session'] == session) & gaps['driverId'].isin(drivers.index)]
         
-        if not session_data.empty:
-            # Convert times to seconds for comparison
-            session_data['time_seconds'] = session_data[session_col].apply(time_to_seconds)
-            session_data = session_data[session_data['time_seconds'].notna()]
+        if not session_gaps.empty:
+            # Fastest time
+            fastest = session_gaps.iloc[0]
+            fastest_row = drivers.loc[fastest['driverId']]
             
-            if not session_data.empty:
-                # Find fastest time
-                fastest_row = session_data.loc[session_data['time_seconds'].idxmin()]
-                
-                # Format data
-                driver_surname = fastest_row['surname']
-                driver_number = ""
-                if 'number_x' in fastest_row.index and pd.notna(fastest_row['number_x']):
-                    try:
-                        driver_number = f"#{int(float(fastest_row['number_x']))}"
-                    except (ValueError, TypeError):
-                        if fastest_row['number_x'] != 'N' and fastest_row['number_x'] != '\\N':
-                            driver_number = f"#{fastest_row['number_x']}"
-                elif 'number_y' in fastest_row.index and pd.notna(fastest_row['number_y']):
-                    try:
-                        driver_number = f"#{int(float(fastest_row['number_y']))}"
-                    except (ValueError, TypeError):
-                        if fastest_row['number_y'] != 'N' and fastest_row['number_y'] != '\\N':
-                            driver_number = f"#{fastest_row['number_y']}"
-                
-                time_formatted = format_time_mmssms(fastest_row['time_seconds'])
-                
-                # Get team color for the fastest driver
-                driver_id = fastest_row['driverId']
-                team_color = get_driver_team_color_for_race(driver_id, race_id, data)
-                
-                with cols[i]:
-                    st.markdown(
-                        f"""
-                        <div style="background-color:#f8f9fa; border-left: 5px solid {team_color}; border-radius:10px; padding:12px; text-align:left; width: 80%; margin: 0 auto;">
-                            <h4 style="margin-top:0; margin-bottom:8px; color:#FF0000; font-weight:bold; font-size:16px;">Best {session} Time</h4>
-                            <h3 style="margin:5px 0; color:#000000; font-weight:bold; font-size:18px;">{driver_number} {driver_surname}</h3>
-                            <p style="margin-bottom:0; color:#666; font-size:14px;">{time_formatted}</p>
-                        </div>
-                        """, 
-                        unsafe_allow_html=True
-                    )
-            else:
-                with cols[i]:
-                    st.markdown(
-                        f"""
-                        <div style="background-color:#f0f0f0; border:2px solid {session_colors[i]}; border-radius:10px; padding:15px; text-align:left;">
-                            <h4 style="margin-top:0; margin-bottom:8px; color:{session_colors[i]}; font-weight:bold; font-size:18px;">Best {session} Time</h4>
-                            <p style="margin-bottom:0; color:#888888; font-size:18px;">No data available</p>
-                        </div>
-                        """, 
-                        unsafe_allow_html=True
-                    )
+            # Format data
+            driver_surname = fastest_row['surname']
+            driver_number = ""
+            if 'number_x' in fastest_row.index and pd.notna(fastest_row['number_x']):
+                try:
+                    driver_number = f"#{int(float(fastest_row['number_x']))}"
+                except (ValueError, TypeError):
+                    if fastest_row['number_x'] != 'N' and fastest_row['number_x'] != '\\N':
+                        driver_number = f"#{fastest_row['number_x']}"
+            elif 'number_y' in fastest_row.index and pd.notna(fastest_row['number_y']):
+                try:
+                    driver_number = f"#{int(float(fastest_row['number_y']))}"
+                except (ValueError, TypeError):
+                    if fastest_row['number_y'] != 'N' and fastest_row['number_y'] != '\\N':
+                        driver_number = f"#{fastest_row['number_y']}"
+            
+            time_formatted = format_time_mmssms(fastest['time_ms'] / 1000)
+            
+            # Get team color for the fastest driver
+            driver_id = int(fastest['driverId'])
+            team_color = get_driver_team_color_for_race(driver_id, race_id, data)
+            
+            with cols[i]:
+                st.markdown(
+                    f"""
+                    <div style="background-color:#f8f9fa; border-left: 5px solid {team_color}; border-radius:10px; padding:12px; text-align:left; width: 80%; margin: 0 auto;">
+                        <h4 style="margin-top:0; margin-bottom:8px; color:#FF0000; font-weight:bold; font-size:16px;">Best {session} Time</h4>
+                        <h3 style="margin:5px 0; color:#000000; font-weight:bold; font-size:18px;">{driver_number} {driver_surname}</h3>
+                        <p style="margin-bottom:0; color:#666; font-size:14px;">{time_formatted}</p>
+                    </div>
+                    """, 
+                    unsafe_allow_html=True
+                )
         else:
             with cols[i]:
                 st.markdown(
@@ -431,4 +387,59 @@ def display_qualifying_progression_all_drivers(quali_display, data, race_id=None
         else:
             st.info("No qualifying progression data available")
     else:
-        st.info("No drivers with Q3 times available for progression chart")
\ No newline at end of file
+        st.info("No drivers with Q3 times available for progression chart")
+
+def display_season_qualifying_pace(race_id, data):
+    """Display each driver's gap to pole or to their teammate over the season up to this race"""
+    try:
+        race = data['races'].set_index('raceId').loc[race_id]
+        col1, col2 = st.columns(2)
+        with col1:
+            metric = st.radio("Gap", ["To Pole", "To Teammate"], horizontal=True, key="quali_pace_metric")
+        with col2:
+            session = st.selectbox("Session", [BEST_SESSION] + SESSIONS, key="quali_pace_session",
+                                   format_func=lambda s: "Best Lap" if s == BEST_SESSION else s)
+        column = 'gap_to_pole_pct' if metric == "To Pole" else 'gap_to_teammate_pct'
+
+        gaps = season_qualifying_gaps(int(race['year']), data, session)
+        gaps = gaps[(gaps['round'] <= race['round']) & gaps['driverId'].isin(race_qualifying_gaps(race_id, data)['driverId'])]
+        gaps = gaps.dropna(subset=[column])
+        if gaps.empty:
+            st.info("No qualifying times recorded for this season")
+            return
+
+        drivers = data['drivers'].set_index('driverId')
+        driver_names = drivers['forename'] + ' ' + drivers['surname']
+        pace = gaps.assign(Driver=gaps['driverId'].map(driver_names), Gap=gaps[column])
+        fig = px.line(
+            pace,
+            x='round',
+            y='Gap',
+            color='Driver',
+            markers=True,
+            title=f"Season Qualifying Pace: Gap {metric} (%)",
+            labels={'round': 'Race Round', 'Gap': 'Gap (%)'}
+        )
+        try:
+            fig = apply_team_colors_to_existing_chart(fig, pace, 'Driver', data, race_id)
+        except:
+            pass
+        fig.update_layout(height=600, xaxis_title="Race Round", yaxis_title="Gap (%)", font=dict(size=14))
+        st.plotly_chart(fig, use_container_width=True)
+
+        summary = pace.groupby('Driver').agg(races=('raceId', 'size'), median=(column, 'median'), mean=(column, 'mean'))
+        summary = summary.sort_values('median').reset_index()
+        st.dataframe(
+            pd.DataFrame({
+                'Driver': summary['Driver'],
+                'Sessions': summary['races'],
+                'Median Gap (%)': summary['median'].round(3),
+                'Average Gap (%)': summary['mean'].round(3),
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption("Gaps are measured against the fastest time in the session, or the teammate's time in the same "
+                   "session; Best Lap compares each driver's fastest lap across Q1-Q3.")
+    except Exception as e:
+        st.error(f"Error generating season qualifying pace: {e}")
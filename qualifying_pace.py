@@ -0,0 +1,85 @@
+"""Qualifying gap-to-pole and gap-to-teammate table for the F1 Dashboard
+
+Every qualifying lap time (Q1, Q2, Q3 and each driver's best of the three)
+is parsed once, in one vectorized pass over the qualifying table, into
+integer milliseconds with the gap to the session's fastest time and to the
+teammate's time, in milliseconds and percent. The table is kept in the data
+dictionary under '_qualifying_gaps', sorted by season and round, so race and
+season views slice it without touching the raw time strings. Like
+race_artifacts, this module must not import streamlit.
+"""
+
+import numpy as np
+import pandas as pd
+
+from circuit_stats import lap_time_seconds
+
+SESSIONS = ['Q1', 'Q2', 'Q3']
+# Pseudo-session of each driver's fastest lap across Q1-Q3
+BEST_SESSION = 'Best'
+
+GAP_COLUMNS = ['raceId', 'year', 'round', 'session', 'driverId', 'constructorId', 'time_ms',
+               'gap_to_pole_ms', 'gap_to_pole_pct', 'teammate_id', 'gap_to_teammate_ms', 'gap_to_teammate_pct']
+
+def build_qualifying_gaps(data):
+    """Gap to the fastest time and to the teammate of every driver in every session of every race"""
+    quali = data['qualifying']
+    times = np.column_stack([np.round(lap_time_seconds(quali[session.lower()]).to_numpy(dtype=float) * 1000)
+                             for session in SESSIONS])
+    best = np.fmin.reduce(times, axis=1)
+    n = len(quali)
+    race_info = data['races'].set_index('raceId')[['year', 'round']].reindex(quali['raceId'])
+
+    gaps = pd.DataFrame({
+        'raceId': np.tile(quali['raceId'].to_numpy(), 4),
+        'year': np.tile(race_info['year'].to_numpy(), 4),
+        'round': np.tile(race_info['round'].to_numpy(), 4),
+        'session': np.repeat(SESSIONS + [BEST_SESSION], n),
+        'driverId': np.tile(quali['driverId'].to_numpy(), 4),
+        'constructorId': np.tile(quali['constructorId'].to_numpy(), 4),
+        'time_ms': np.concatenate([times.T.ravel(), best]),
+    }).dropna(subset=['time_ms', 'year'])
+    gaps = gaps.sort_values(['year', 'round', 'session', 'time_ms'], kind='stable').reset_index(drop=True)
+
+    pole = gaps.groupby(['raceId', 'session'])['time_ms'].transform('min')
+    gaps['gap_to_pole_ms'] = gaps['time_ms'] - pole
+    gaps['gap_to_pole_pct'] = gaps['gap_to_pole_ms'] / pole * 100
+
+    # Teammate: the team's fastest other driver in the session (rows are sorted by time)
+    team = gaps.groupby(['raceId', 'session', 'constructorId']).ngroup()
+    rank = gaps.groupby(team).cumcount().to_numpy()
+    lookup = gaps[['time_ms', 'driverId']]
+    first = lookup[rank == 0].set_index(team[rank == 0]).reindex(team).to_numpy()
+    second = lookup[rank == 1].set_index(team[rank == 1]).reindex(team).to_numpy()
+    teammate = np.where((rank == 0)[:, None], second, first)
+    teammate_time = teammate[:, 0]
+    gaps['teammate_id'] = pd.array(teammate[:, 1], dtype='Int64')
+    gaps['gap_to_teammate_ms'] = gaps['time_ms'] - teammate_time
+    gaps['gap_to_teammate_pct'] = gaps['gap_to_teammate_ms'] / teammate_time * 100
+
+    gaps[['year', 'round']] = gaps[['year', 'round']].astype(int)
+    gaps['time_ms'] = gaps['time_ms'].astype(int)
+    gaps['gap_to_pole_ms'] = gaps['gap_to_pole_ms'].astype(int)
+    gaps['gap_to_teammate_ms'] = gaps['gap_to_teammate_ms'].astype('Int64')
+    return gaps[GAP_COLUMNS]
+
+def qualifying_gaps(data):
+    """Qualifying gap table of a snapshot, built on first access"""
+    if '_qualifying_gaps' not in data:
+        data['_qualifying_gaps'] = build_qualifying_gaps(data)
+    return data['_qualifying_gaps']
+
+def season_qualifying_gaps(year, data, session=None):
+    """Gap rows of one season, optionally of one session"""
+    gaps = qualifying_gaps(data)
+    years = gaps['year'].to_numpy()
+    season = gaps.iloc[np.searchsorted(years, year, 'left'):np.searchsorted(years, year, 'right')]
+    return season if session is None else season[season['session'] == session]
+
+def race_qualifying_gaps(race_id, data, session=None):
+    """Gap rows of one race, fastest first within each session, optionally of one session"""
+    race = data['races'].set_index('raceId')['year'].get(race_id)
+    if race is None:
+        return pd.DataFrame(columns=GAP_COLUMNS)
+    season = season_qualifying_gaps(int(race), data, session)
+    return season[season['raceId'] == race_id]
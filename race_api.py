@@ -0,0 +1,204 @@
+"""
+Read-only JSON service for F1 race data
+
+Serves the same per-race artifacts the dashboard renders:
+    /race/{raceId}        race details, stat cards, grid, results and standings
+    /season/{year}        the races of a season with their stat cards
+    /standings/{raceId}   driver and constructor standings after a race
+
+Responses carry strong ETags hashed from the encoded body and cached with
+it, so clients can revalidate with If-None-Match, and are sent
+gzip-compressed to clients whose Accept-Encoding allows it. Encoded
+responses are cached until the data files change.
+
+Usage:
+    python race_api.py [--port 8502]
+"""
+import sys
+import json
+import gzip
+import hashlib
+import argparse
+from collections import OrderedDict
+
+import tornado.httputil
+import tornado.ioloop
+import tornado.web
+
+from artifact_store import get_race_artifacts, json_default
+from dataset import get_dataset, refresh_snapshot
+
+DEFAULT_PORT = 8502
+
+# How often the service checks f1_data for changed files
+REFRESH_INTERVAL_MS = 2000
+
+# Encoded responses kept in memory (least recently used are dropped first)
+MAX_RESPONSES = 1024
+
+def race_details(race, data):
+    """Identifying fields of a race"""
+    circuits = data['circuits'].set_index('circuitId')
+    circuit = circuits.loc[race['circuitId']] if race['circuitId'] in circuits.index else None
+    return {
+        'raceId': int(race['raceId']),
+        'year': int(race['year']),
+        'round': int(race['round']),
+        'name': race['name'],
+        'date': race['date'],
+        'circuit': circuit['name'] if circuit is not None else None,
+        'location': circuit['location'] if circuit is not None else None,
+        'country': circuit['country'] if circuit is not None else None,
+    }
+
+def find_race(data, race_id):
+    """Race row for a raceId, or None"""
+    races = data['races']
+    race = races[races['raceId'] == race_id]
+    return None if race.empty else race.iloc[0]
+
+def race_payload(data, race_id):
+    """Everything on a race page"""
+    race = find_race(data, race_id)
+    if race is None:
+        return None
+    artifacts = get_race_artifacts(race_id, data)
+    return {'race': race_details(race, data), **{k: v for k, v in artifacts.items() if k != 'raceId'}}
+
+def season_payload(data, year):
+    """The races of a season with their stat cards"""
+    races = data['races'][data['races']['year'] == year].sort_values('round')
+    if races.empty:
+        return None
+    season = []
+    for _, race in races.iterrows():
+        artifacts = get_race_artifacts(race['raceId'], data)
+        season.append({**race_details(race, data), 'has_sprint': artifacts['has_sprint'],
+                       'cards': artifacts['cards']})
+    return {'year': year, 'races': season}
+
+def standings_payload(data, race_id):
+    """Championship standings after a race"""
+    race = find_race(data, race_id)
+    if race is None:
+        return None
+    artifacts = get_race_artifacts(race_id, data)
+    return {
+        'race': race_details(race, data),
+        'drivers': artifacts['driver_standings'],
+        'constructors': artifacts['constructor_standings'],
+    }
+
+def encode_payload(payload):
+    """Encode a payload as JSON, plain and gzip-compressed, with the ETag of those exact bytes"""
+    body = json.dumps(payload, separators=(',', ':'), default=json_default, allow_nan=False).encode('utf-8')
+    return hashlib.sha1(body).hexdigest()[:20], body, gzip.compress(body, compresslevel=6)
+
+def accepts_gzip(accept_encoding):
+    """Whether an Accept-Encoding header allows gzip (q=0 refuses it, '*' stands for unlisted codings)"""
+    qualities = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip():
+            qualities[coding.strip().lower()] = quality
+    for coding in ('gzip', 'x-gzip', '*'):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+class RaceDataService:
+    """Dataset and encoded responses shared by the handlers"""
+
+    def __init__(self, data=None):
+        self.data = data if data is not None else get_dataset()
+        self.responses = OrderedDict()
+
+    def refresh(self):
+        """Swap in changed data files and drop the responses built from the old ones"""
+        data, changed = refresh_snapshot(self.data)
+        if changed:
+            self.data = data
+            self.responses.clear()
+
+    def response(self, path, build, key):
+        """Encoded (ETag, body, gzip body) for a path, or None when build finds nothing
+
+        The ETag is hashed from the body when it is encoded and cached with
+        it, so a response can never carry the validator of another body.
+        """
+        cached = self.responses.get(path)
+        if cached is None:
+            payload = build(self.data, key)
+            cached = encode_payload(payload) if payload is not None else None
+            self.responses[path] = cached
+            while len(self.responses) > MAX_RESPONSES:
+                self.responses.popitem(last=False)
+        else:
+            self.responses.move_to_end(path)
+        return cached
+
+class JSONHandler(tornado.web.RequestHandler):
+    """Serve one payload builder as cached, revalidatable JSON"""
+
+    def initialize(self, service, build):
+        self.service = service
+        self.build = build
+        self.etag = None
+
+    def get(self, key):
+        encoded = self.service.response(self.request.path, self.build, int(key))
+        if encoded is None:
+            raise tornado.web.HTTPError(404)
+        etag, body, compressed = encoded
+        use_gzip = accepts_gzip(self.request.headers.get('Accept-Encoding', ''))
+
+        # Strong validator of the exact bytes sent, per encoding
+        self.etag = f'"{etag}{"-gz" if use_gzip else ""}"'
+        self.set_header('Content-Type', 'application/json; charset=utf-8')
+        self.set_header('Cache-Control', 'no-cache')
+        self.set_header('Vary', 'Accept-Encoding')
+        if use_gzip:
+            self.set_header('Content-Encoding', 'gzip')
+        self.write(compressed if use_gzip else body)
+
+    def compute_etag(self):
+        """Use the ETag cached with the encoded body instead of hashing it on every request"""
+        return self.etag
+
+    def write_error(self, status_code, **kwargs):
+        """Errors are JSON too"""
+        self.set_header('Content-Type', 'application/json; charset=utf-8')
+        self.finish(json.dumps({'error': tornado.httputil.responses.get(status_code, 'Unknown'), 'status': status_code}))
+
+def make_app(service=None):
+    """Tornado application serving the race, season and standings routes"""
+    service = service or RaceDataService()
+    return tornado.web.Application([
+        (r'/race/(\d+)', JSONHandler, {'service': service, 'build': race_payload}),
+        (r'/season/(\d+)', JSONHandler, {'service': service, 'build': season_payload}),
+        (r'/standings/(\d+)', JSONHandler, {'service': service, 'build': standings_payload}),
+    ]), service
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Serve F1 race data as JSON")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="port to listen on")
+    args = parser.parse_args(argv)
+
+    app, service = make_app()
+    app.listen(args.port)
+    tornado.ioloop.PeriodicCallback(service.refresh, REFRESH_INTERVAL_MS).start()
+    print(f"Serving F1 race data on http://localhost:{args.port}")
+    tornado.ioloop.IOLoop.current().start()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
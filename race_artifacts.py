@@ -0,0 +1,552 @@
+"""Per-race artifact builders for the F1 Dashboard
+
+Everything on a race page is a pure function of raceId. The builders here turn
+the loaded data into small display-ready records (cards, grids, standings) so
+they can be precomputed once by precompute.py and simply looked up at render time.
+This module must not import streamlit: it also runs inside worker processes.
+"""
+
+import base64
+
+import numpy as np
+import pandas as pd
+
+from team_colors import TEAM_COLORS
+from career_stats import pole_sitters
+from grid_odds import grid_odds, slot_rates, PRIOR_SEASONS
+from lap_analysis import overtake_index, leadership_stints, laps_led_leaderboard, race_stints, lap_distribution, replay_frames
+
+# Tables that are sliced by raceId when building artifacts
+RACE_INDEXED_TABLES = ['results', 'qualifying', 'pit_stops', 'sprint_results',
+                       'driver_standings', 'constructor_standings', 'lap_times']
+
+DEFAULT_TEAM_COLOR = '#808080'
+
+# Lookups cached in the data dictionary and the tables each is derived from
+DERIVED_KEYS = {
+    '_team_colors': ('constructors',),
+    '_drivers_by_id': ('drivers',),
+    '_constructors_by_id': ('constructors',),
+    '_leadership_stints': ('lap_times',),
+    '_season_stints': ('races', 'lap_times', 'pit_stops'),
+    '_driver_index': ('results', 'qualifying'),
+    '_teammates': ('races', 'results', 'qualifying'),
+    '_finishes': ('races', 'results', 'sprint_results'),
+    '_qualifying_gaps': ('races', 'qualifying'),
+    '_positions_gained': ('races', 'results'),
+    '_reliability': ('races', 'results', 'status'),
+    '_grid_odds': ('races', 'results', 'status'),
+}
+
+def index_race_tables(data, tables=None):
+    """Pre-split the race-level tables by raceId so artifact builds avoid full-table scans
+
+    Only the given tables are re-indexed; the index entries of the others are kept.
+    """
+    index = dict(data.get('_race_index', {}))
+    for key in RACE_INDEXED_TABLES:
+        if tables is not None and key not in tables:
+            continue
+        if key in data:
+            index[key] = {race_id: rows for race_id, rows in data[key].groupby('raceId')}
+        else:
+            index.pop(key, None)
+    data['_race_index'] = index
+    return index
+
+def drop_derived(data, tables):
+    """Forget the cached lookups derived from the given tables"""
+    for key, sources in DERIVED_KEYS.items():
+        if any(source in tables for source in sources):
+            data.pop(key, None)
+    return data
+
+def race_rows(data, key, race_id):
+    """Get the rows of a table for one race, using the race index when available"""
+    index = data.get('_race_index', {})
+    if key in index:
+        rows = index[key].get(race_id)
+        if rows is None:
+            return data[key].iloc[0:0]
+        return rows
+    if key not in data:
+        return pd.DataFrame()
+    table = data[key]
+    return table[table['raceId'] == race_id]
+
+def team_color_lookup(data):
+    """Map constructorId to its team color"""
+    if '_team_colors' not in data:
+        constructors = data['constructors']
+        colors = constructors['constructorRef'].map(TEAM_COLORS).fillna(TEAM_COLORS['default'])
+        data['_team_colors'] = dict(zip(constructors['constructorId'], colors))
+    return data['_team_colors']
+
+def driver_team_color(driver_id, race_results, data):
+    """Get a driver's team color from the race results"""
+    driver_result = race_results[race_results['driverId'] == driver_id]
+    if driver_result.empty:
+        return DEFAULT_TEAM_COLOR
+    return team_color_lookup(data).get(driver_result.iloc[0]['constructorId'], DEFAULT_TEAM_COLOR)
+
+def format_driver_number(value):
+    """Format a car number as '#44', or '' when missing"""
+    if pd.isna(value) or str(value) in ['N', '\\N', '']:
+        return ""
+    try:
+        return f"#{int(float(value))}"
+    except (ValueError, TypeError):
+        return f"#{value}"
+
+def safe_int(value, default=''):
+    """Convert a possibly missing or \\N value to int"""
+    if pd.isna(value):
+        return default
+    try:
+        return int(float(value))
+    except (ValueError, TypeError):
+        return value
+
+def lap_time_seconds(time_str):
+    """Convert a lap time string to seconds for comparison (inf when invalid)"""
+    if pd.isna(time_str):
+        return float('inf')
+    try:
+        if ':' in str(time_str):
+            parts = str(time_str).split(':')
+            return float(parts[0]) * 60 + float(parts[1])
+        return float(time_str)
+    except (ValueError, TypeError):
+        return float('inf')
+
+def position_sort_key(row):
+    """Sort key placing rows without a numeric position last"""
+    return 999 if row['POS.'] == '' or not isinstance(row['POS.'], int) else row['POS.']
+
+def _driver_lookup(data):
+    """Index the drivers table by driverId"""
+    if '_drivers_by_id' not in data:
+        data['_drivers_by_id'] = data['drivers'].set_index('driverId')
+    return data['_drivers_by_id']
+
+def _stat_card(driver_id, number, value, race_results, data):
+    """Build a race statistic card record"""
+    drivers = _driver_lookup(data)
+    surname = drivers.at[driver_id, 'surname'] if driver_id in drivers.index else 'N/A'
+    return {
+        'driverId': int(driver_id),
+        'number': format_driver_number(number),
+        'name': surname,
+        'value': value,
+        'team_color': driver_team_color(driver_id, race_results, data),
+    }
+
+def build_winner_card(race_results, data):
+    """Race winner card record, or None"""
+    positions = pd.to_numeric(race_results['position'], errors='coerce')
+    winner = race_results[positions == 1]
+    if winner.empty:
+        return None
+    row = winner.iloc[0]
+    race_time = row['time'] if pd.notna(row['time']) else 'N/A'
+    return _stat_card(row['driverId'], row['number'], race_time, race_results, data)
+
+def build_pole_card(race_id, race_results, data):
+    """Pole position card record (the grid slot 1 starter, see career_stats.pole_sitters) with its best qualifying time"""
+    qualifying = race_rows(data, 'qualifying', race_id)
+    pole = pole_sitters(race_results, qualifying)
+    if pole.empty:
+        return None
+    driver_id = pole['driverId'].iloc[0]
+    session = qualifying[qualifying['driverId'] == driver_id]
+    if not session.empty:
+        row = session.iloc[0]
+        valid_times = [t for t in [row['q1'], row['q2'], row['q3']] if pd.notna(t) and t != '\\N']
+        best_time = min(valid_times) if valid_times else 'N/A'
+        return _stat_card(driver_id, row['number'], best_time, race_results, data)
+
+    row = race_results[race_results['driverId'] == driver_id].iloc[0]
+    return _stat_card(driver_id, row['number'], "Grid: 1", race_results, data)
+
+def build_fastest_lap_card(race_results, data):
+    """Fastest lap (among the top 10 finishers) card record, or None"""
+    positions = pd.to_numeric(race_results['position'], errors='coerce')
+    top_10 = race_results[(positions >= 1) & (positions <= 10) & race_results['fastestLapTime'].notna()]
+    if top_10.empty:
+        return None
+    lap_seconds = top_10['fastestLapTime'].map(lap_time_seconds)
+    lap_seconds = lap_seconds[lap_seconds != float('inf')]
+    if lap_seconds.empty:
+        return None
+    row = top_10.loc[lap_seconds.idxmin()]
+    return _stat_card(row['driverId'], row['number'], row['fastestLapTime'], race_results, data)
+
+def build_fastest_pitstop_card(race_id, race_results, data):
+    """Fastest pit stop card record, or None"""
+    pit_stops = race_rows(data, 'pit_stops', race_id)
+    if pit_stops.empty:
+        return None
+    fastest = pit_stops.loc[pit_stops['milliseconds'].idxmin()]
+    if fastest['driverId'] not in _driver_lookup(data).index:
+        return None
+    driver_result = race_results[race_results['driverId'] == fastest['driverId']]
+    number = driver_result.iloc[0]['number'] if not driver_result.empty else None
+    pit_time = f"{fastest['milliseconds'] / 1000:.3f}s"
+    return _stat_card(fastest['driverId'], number, pit_time, race_results, data)
+
+def _constructor_lookup(data):
+    """Index the constructors table by constructorId"""
+    if '_constructors_by_id' not in data:
+        data['_constructors_by_id'] = data['constructors'].set_index('constructorId')
+    return data['_constructors_by_id']
+
+def _merge_driver_team(rows, data):
+    """Attach driver and constructor details to race-level rows"""
+    drivers = _driver_lookup(data)
+    constructors = _constructor_lookup(data)
+    merged = rows.copy()
+    number_col = 'number_driver' if 'number' in rows.columns else 'number'
+    merged[number_col] = rows['driverId'].map(drivers['number'])
+    merged['forename'] = rows['driverId'].map(drivers['forename'])
+    merged['surname'] = rows['driverId'].map(drivers['surname'])
+    if 'constructorId' in rows.columns:
+        merged['constructorRef'] = rows['constructorId'].map(constructors['constructorRef'])
+        merged['team_name'] = rows['constructorId'].map(constructors['name'])
+    return merged
+
+def _driver_label(row):
+    """Format '#44 Lewis Hamilton' style driver labels"""
+    driver_name = f"{row['forename']} {row['surname']}" if pd.notna(row['forename']) and pd.notna(row['surname']) else 'N/A'
+    driver_number = format_driver_number(row['number'])
+    if not driver_number and 'number_driver' in row:
+        # Fall back to the driver's permanent number
+        driver_number = format_driver_number(row['number_driver'])
+    return f"{driver_number} {driver_name}".strip()
+
+def build_starting_grid(race_results, data):
+    """Starting grid records ordered by grid slot"""
+    if race_results.empty:
+        return []
+    grid_display = _merge_driver_team(race_results, data)
+    colors = team_color_lookup(data)
+    race = data['races'].set_index('raceId').loc[int(race_results['raceId'].iloc[0])]
+    odds = grid_odds(data)
+    starting_grid = []
+    for row in grid_display.to_dict('records'):
+        starting_grid.append({
+            'GRID POS.': safe_int(row['grid']),
+            'DRIVER': _driver_label(row),
+            'TEAM': row['team_name'] if pd.notna(row['team_name']) else 'N/A',
+            'team_ref': row['constructorRef'] if pd.notna(row['constructorRef']) else 'default',
+            'driverId': int(row['driverId']),
+            'team_color': colors.get(row['constructorId'], DEFAULT_TEAM_COLOR),
+            'conversion': _grid_conversion(odds, safe_int(row['grid'], default=-1), race),
+        })
+    return sorted(starting_grid, key=lambda x: x['GRID POS.'] if isinstance(x['GRID POS.'], int) else 999)
+
+def _grid_conversion(odds, grid, race):
+    """Win, podium and points rates from a grid slot over the seasons before the race, and wins at its circuit
+
+    Only earlier seasons are counted, so the race's own result is never part of its rates.
+    """
+    if not isinstance(grid, int) or grid <= 0:
+        return None
+    year = int(race['year'])
+    first = max(year - PRIOR_SEASONS, odds['first_season'])
+    prior = slot_rates(odds, grid, first=first, last=year - 1)
+    if prior is None:
+        return None
+    circuit = slot_rates(odds, grid, circuit_id=int(race['circuitId']), last=year - 1) or {'starts': 0, 'win_rate': 0.0}
+    return {
+        'seasons': f"{first}–{year - 1}" if first < year - 1 else str(first),
+        'starts': prior['starts'],
+        'win_rate': round(float(prior['win_rate']), 3),
+        'podium_rate': round(float(prior['podium_rate']), 3),
+        'points_rate': round(float(prior['points_rate']), 3),
+        'circuit_starts': circuit['starts'],
+        'circuit_win_rate': round(float(circuit['win_rate']), 3),
+    }
+
+def _build_result_rows(rows, data, time_label):
+    """Result card records for race or sprint results"""
+    if rows.empty:
+        return []
+    display = _merge_driver_team(rows, data)
+    if 'status' in data:
+        display = display.merge(data['status'], on='statusId', how='left')
+    colors = team_color_lookup(data)
+    result_rows = []
+    for row in display.to_dict('records'):
+        points = safe_int(row['points'], default=0)
+        result_rows.append({
+            'POS.': safe_int(row['position']),
+            'DRIVER': _driver_label(row),
+            'TEAM': row['team_name'] if pd.notna(row['team_name']) else 'N/A',
+            time_label: row['time'] if pd.notna(row['time']) else 'DNF',
+            'POINTS': points if isinstance(points, (int, float)) else 0,
+            'LAPS': safe_int(row['laps'], default=0),
+            'STATUS': row['status'] if pd.notna(row.get('status')) else 'Unknown',
+            'driverId': int(row['driverId']),
+            'team_color': colors.get(row['constructorId'], DEFAULT_TEAM_COLOR),
+        })
+    return sorted(result_rows, key=position_sort_key)
+
+def build_race_results(race_results, data):
+    """Race result records ordered by finishing position"""
+    return _build_result_rows(race_results, data, 'TIME/RETIRED')
+
+def build_sprint_results(race_id, data):
+    """Sprint result records ordered by finishing position"""
+    return _build_result_rows(race_rows(data, 'sprint_results', race_id), data, 'TIME')
+
+def build_qualifying_table(race_id, data):
+    """Qualifying result records ordered by qualifying position"""
+    quali_results = race_rows(data, 'qualifying', race_id)
+    if quali_results.empty:
+        return []
+    quali_display = _merge_driver_team(quali_results, data)
+    colors = team_color_lookup(data)
+    quali_grid = []
+    for row in quali_display.to_dict('records'):
+        quali_grid.append({
+            'POS.': safe_int(row['position']),
+            'DRIVER': _driver_label(row),
+            'TEAM': row['team_name'] if pd.notna(row['team_name']) else 'N/A',
+            'Q1': row['q1'] if pd.notna(row['q1']) else '',
+            'Q2': row['q2'] if pd.notna(row['q2']) else '',
+            'Q3': row['q3'] if pd.notna(row['q3']) else '',
+            'driverId': int(row['driverId']),
+            'team_color': colors.get(row['constructorId'], DEFAULT_TEAM_COLOR),
+        })
+    return sorted(quali_grid, key=position_sort_key)
+
+def season_race_ids_to_date(race_id, data):
+    """raceIds of the season up to and including this race"""
+    races = data['races']
+    current_race = races[races['raceId'] == race_id]
+    if current_race.empty:
+        return []
+    current = current_race.iloc[0]
+    season = races[(races['year'] == current['year']) & (races['round'] <= current['round'])]
+    return season['raceId'].tolist()
+
+def _podium_counts(race_id, data, key):
+    """Count 2nd and 3rd place finishes this season to date, by driverId or constructorId"""
+    season_ids = season_race_ids_to_date(race_id, data)
+    if not season_ids:
+        return {}
+    results = pd.concat([race_rows(data, 'results', season_id) for season_id in season_ids])
+    positions = pd.to_numeric(results['position'], errors='coerce')
+    return results[positions.isin([2, 3])].groupby(key).size().to_dict()
+
+def _with_sprint_points(race_standings, race_id, data, key):
+    """Add this weekend's sprint points to the standings points"""
+    sprint_results = race_rows(data, 'sprint_results', race_id)
+    if sprint_results.empty:
+        return race_standings
+    sprint_points = pd.to_numeric(sprint_results['points'], errors='coerce').groupby(sprint_results[key]).sum()
+    race_standings = race_standings.copy()
+    race_standings['points'] = race_standings['points'] + race_standings[key].map(sprint_points).fillna(0)
+    return race_standings
+
+def build_driver_standings(race_id, race_results, data):
+    """Driver championship records after this race, with sprint points and podium counts"""
+    race_standings = race_rows(data, 'driver_standings', race_id)
+    if race_standings.empty:
+        return []
+    race_standings = _with_sprint_points(race_standings, race_id, data, 'driverId')
+    driver_constructors = race_results.drop_duplicates('driverId').set_index('driverId')['constructorId']
+    standings_display = race_standings.copy()
+    standings_display['constructorId'] = race_standings['driverId'].map(driver_constructors)
+    standings_display = _merge_driver_team(standings_display, data)
+    podium_counts = _podium_counts(race_id, data, 'driverId')
+    colors = team_color_lookup(data)
+
+    standings_grid = []
+    for row in standings_display.to_dict('records'):
+        standings_grid.append({
+            'POS.': safe_int(row['position']),
+            'DRIVER': _driver_label(row),
+            'TEAM': row['team_name'] if pd.notna(row['team_name']) else 'N/A',
+            'POINTS': safe_int(row['points'], default=0),
+            'WINS': safe_int(row['wins'], default=0),
+            'PODIUMS': podium_counts.get(row['driverId'], 0),
+            'driverId': int(row['driverId']),
+            'team_color': colors.get(row['constructorId'], DEFAULT_TEAM_COLOR),
+        })
+    return sorted(standings_grid, key=position_sort_key)
+
+def build_constructor_standings(race_id, data):
+    """Constructor championship records after this race, with sprint points and podium counts"""
+    race_standings = race_rows(data, 'constructor_standings', race_id)
+    if race_standings.empty:
+        return []
+    race_standings = _with_sprint_points(race_standings, race_id, data, 'constructorId')
+    standings_display = race_standings.copy()
+    standings_display['name'] = race_standings['constructorId'].map(_constructor_lookup(data)['name'])
+    podium_counts = _podium_counts(race_id, data, 'constructorId')
+    colors = team_color_lookup(data)
+
+    standings_grid = []
+    for row in standings_display.to_dict('records'):
+        standings_grid.append({
+            'POS.': safe_int(row['position']),
+            'CONSTRUCTOR': row['name'] if pd.notna(row['name']) else 'N/A',
+            'POINTS': safe_int(row['points'], default=0),
+            'WINS': safe_int(row['wins'], default=0),
+            'PODIUMS': podium_counts.get(row['constructorId'], 0),
+            'constructorId': int(row['constructorId']),
+            'team_color': colors.get(row['constructorId'], DEFAULT_TEAM_COLOR),
+        })
+    return sorted(standings_grid, key=position_sort_key)
+
+def leadership_stint_table(data):
+    """Leadership stints of every race, run-length encoded once per dataset"""
+    if '_leadership_stints' not in data:
+        lap_times = data.get('lap_times', pd.DataFrame(columns=['raceId', 'lap', 'driverId', 'position']))
+        data['_leadership_stints'] = leadership_stints(lap_times)
+    return data['_leadership_stints']
+
+def _with_driver_names(rows, data):
+    """Add a driver_name column to rows with a driverId"""
+    drivers = _driver_lookup(data)
+    names = drivers['forename'] + ' ' + drivers['surname']
+    return rows.assign(driver_name=rows['driverId'].map(names).fillna('Unknown'))
+
+def _records(rows):
+    """Rows as JSON-ready records with None for missing values (NaN is not valid JSON)"""
+    return rows.astype(object).where(rows.notna(), None).to_dict('records')
+
+def build_leadership(race_id, data):
+    """Leadership stints and laps led of a race and season to date, or None without lap data"""
+    stints = leadership_stint_table(data)
+    race_stints = stints[stints['raceId'] == race_id]
+    if race_stints.empty:
+        return None
+    season_stints = stints[stints['raceId'].isin(season_race_ids_to_date(race_id, data))]
+    return {
+        'stints': _with_driver_names(race_stints.drop(columns='raceId'), data).to_dict('records'),
+        'laps_led': _with_driver_names(laps_led_leaderboard(race_stints), data).to_dict('records'),
+        'season_laps_led': _with_driver_names(laps_led_leaderboard(season_stints), data).to_dict('records'),
+    }
+
+def build_overtakes(race_id, data):
+    """Every overtake of the race (lap, overtaker, overtaken), empty without lap data"""
+    return overtake_index(race_rows(data, 'lap_times', race_id)).to_dict('records')
+
+def season_stint_table(year, data):
+    """Stints of every driver in every race of a season, reconstructed once per season"""
+    seasons = data.setdefault('_season_stints', {})
+    if year not in seasons:
+        race_ids = data['races'].loc[data['races']['year'] == year, 'raceId']
+        lap_times = pd.concat([race_rows(data, 'lap_times', race_id) for race_id in race_ids] +
+                              [pd.DataFrame(columns=['raceId', 'driverId', 'lap', 'milliseconds'])])
+        pit_stops = pd.concat([race_rows(data, 'pit_stops', race_id) for race_id in race_ids] +
+                              [pd.DataFrame(columns=['raceId', 'driverId', 'lap'])])
+        seasons[year] = race_stints(lap_times, pit_stops)
+    return seasons[year]
+
+def season_strategy_summary(stints):
+    """Stops per race, stint length and degradation per driver over a set of stints"""
+    per_race = stints.groupby(['driverId', 'raceId']).agg(stints=('stint', 'max'))
+    summary = pd.DataFrame({
+        'races': per_race.groupby('driverId').size(),
+        'stops_per_race': per_race['stints'].groupby('driverId').mean() - 1,
+        'avg_stint_laps': stints.groupby('driverId')['laps'].mean(),
+        'avg_degradation': stints.groupby('driverId')['degradation'].mean(),
+    })
+    return summary.reset_index().sort_values(['races', 'stops_per_race'], ascending=[False, True])
+
+def build_strategy(race_id, data):
+    """Stints of every driver in the race and the season to date, or None without lap data"""
+    races = data['races']
+    race = races[races['raceId'] == race_id]
+    if race.empty:
+        return None
+    stints = season_stint_table(int(race['year'].iloc[0]), data)
+    race_stint_rows = stints[stints['raceId'] == race_id]
+    if race_stint_rows.empty:
+        return None
+    season_stints = stints[stints['raceId'].isin(season_race_ids_to_date(race_id, data))]
+    return {
+        'stints': _records(_with_driver_names(race_stint_rows.drop(columns='raceId'), data)),
+        'season': _records(_with_driver_names(season_strategy_summary(season_stints), data)),
+    }
+
+def build_lap_distribution(race_id, data):
+    """Per-driver lap time quantiles and binned histograms of a race, or None without lap data
+
+    Only these summaries are stored, not the individual laps.
+    """
+    distribution = lap_distribution(race_rows(data, 'lap_times', race_id), race_rows(data, 'pit_stops', race_id))
+    if distribution is None:
+        return None
+    return {
+        'summary': _with_driver_names(distribution['summary'], data).round(3).to_dict('records'),
+        'edges': [round(edge, 3) for edge in distribution['edges'].tolist()],
+        'counts': distribution['counts'].tolist(),
+    }
+
+def pack_array(array):
+    """Encode a NumPy array as base64 of its raw bytes with dtype and shape, for the JSON store"""
+    array = np.ascontiguousarray(array)
+    return {'dtype': array.dtype.str, 'shape': list(array.shape), 'data': base64.b64encode(array.tobytes()).decode('ascii')}
+
+def unpack_array(packed):
+    """Decode an array written by pack_array"""
+    return np.frombuffer(base64.b64decode(packed['data']), dtype=packed['dtype']).reshape(packed['shape'])
+
+def build_replay(race_id, data):
+    """Running order and gaps of every lap as packed int16/float32 arrays, or None without lap data"""
+    frames = replay_frames(race_rows(data, 'lap_times', race_id))
+    if frames is None:
+        return None
+    drivers = _with_driver_names(pd.DataFrame({'driverId': frames['driver_ids']}), data)
+    return {
+        'drivers': drivers.to_dict('records'),
+        'laps': pack_array(frames['laps']),
+        'order': pack_array(frames['order']),
+        'gaps': pack_array(frames['gaps']),
+    }
+
+def build_pit_summary(race_id, race_results, data):
+    """Every pit stop of the race with driver names and numeric durations"""
+    pit_stops = race_rows(data, 'pit_stops', race_id)
+    if pit_stops.empty:
+        return []
+    drivers = data['drivers'][['driverId', 'forename', 'surname']]
+    drivers = drivers[drivers['driverId'].isin(race_results['driverId'])]
+    summary = pit_stops.merge(drivers, on='driverId', how='inner')
+    return pd.DataFrame({
+        'driverId': summary['driverId'],
+        'Driver': summary['forename'] + ' ' + summary['surname'],
+        'Stop': summary['stop'].fillna(0).astype(int),
+        'Lap': summary['lap'].fillna(0).astype(int),
+        'Duration (s)': pd.to_numeric(summary['duration'], errors='coerce').fillna(0.0),
+    }).to_dict('records')
+
+def build_race_artifacts(race_id, data):
+    """Build every display artifact of a race page"""
+    race_id = int(race_id)
+    race_results = race_rows(data, 'results', race_id)
+    return {
+        'raceId': race_id,
+        'cards': {
+            'winner': build_winner_card(race_results, data),
+            'pole': build_pole_card(race_id, race_results, data),
+            'fastest_lap': build_fastest_lap_card(race_results, data),
+            'fastest_pit': build_fastest_pitstop_card(race_id, race_results, data),
+        },
+        'has_sprint': not race_rows(data, 'sprint_results', race_id).empty,
+        'grid': build_starting_grid(race_results, data),
+        'results': build_race_results(race_results, data),
+        'sprint': build_sprint_results(race_id, data),
+        'driver_standings': build_driver_standings(race_id, race_results, data),
+        'constructor_standings': build_constructor_standings(race_id, data),
+        'leadership': build_leadership(race_id, data),
+        'overtakes': build_overtakes(race_id, data),
+        'pit_summary': build_pit_summary(race_id, race_results, data),
+        'strategy': build_strategy(race_id, data),
+        'lap_distribution': build_lap_distribution(race_id, data),
+        'replay': build_replay(race_id, data),
+    }
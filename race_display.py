@@ -8,12 +8,23 @@ import plotly.graph_objects as go
 from datetime import datetime
 
 from race_stats import display_race_stats
+from what_if_display import display_what_if_standings
+from reliability_display import display_reliability
 from qualifying import display_qualifying_data
 from utils import race_has_sprint, time_to_seconds, format_time_mmssms, get_constructor_name, format_race_date, calculate_gap_to_leader
 
 from team_colors import get_all_team_colors, get_team_color
 from dataframe_styles import apply_dataframe_styles, create_starting_grid_layout
 from card_styling import get_driver_team_color_for_race
+from artifact_store import get_race_artifacts
+from prefetch import get_race_bundle
+from f1_query import pit_comparison
+from race_artifacts import race_rows, unpack_array
+from contention import contention_after, title_clinch
+from ratings import ratings_after, season_ratings
+from positions_gained import transition_matrix, scope_rows, climbers
+from grid_odds import conversion_rates, era_index, era_label
+from lap_analysis import OVERTAKE_COLUMNS, pair_overtakes, race_trace, decimate_frames
 
 def clean_display_value(value):
     """Clean display values by replacing \\N with -"""
@@ -27,7 +38,9 @@ def create_race_results_cards(grid_data, results_display, data, race_id):
     # Create a single column layout for race results
     for i, result in enumerate(grid_data):
         # Get team color for this driver
-        if race_id and i < len(results_display):
+        if 'team_color' in result:
+            team_color = result['team_color']
+        elif race_id and i < len(results_display):
             driver_id = results_display.iloc[i]['driverId']
             team_color = get_driver_team_color_for_race(driver_id, race_id, data)
         else:
@@ -79,7 +92,9 @@ def create_sprint_results_cards(sprint_grid, sprint_display, data, race_id):
     # Create a single column layout for sprint results
     for i, result in enumerate(sprint_grid):
         # Get team color for this driver
-        if race_id and i < len(sprint_display):
+        if 'team_color' in result:
+            team_color = result['team_color']
+        elif race_id and i < len(sprint_display):
             driver_id = sprint_display.iloc[i]['driverId']
             team_color = get_driver_team_color_for_race(driver_id, race_id, data)
         else:
@@ -130,7 +145,9 @@ def create_driver_standings_cards(standings_grid, standings_display, data, race_
     # Create a single column layout for driver standings
     for i, result in enumerate(standings_grid):
         # Get team color for this driver
-        if race_id and i < len(standings_display):
+        if 'team_color' in result:
+            team_color = result['team_color']
+        elif race_id and i < len(standings_display):
             driver_id = standings_display.iloc[i]['driverId']
             team_color = get_driver_team_color_for_race(driver_id, race_id, data)
         else:
@@ -178,7 +195,9 @@ def create_constructor_standings_cards(standings_grid, standings_display, data,
     # Create a single column layout for constructor standings
     for i, result in enumerate(standings_grid):
         # Get team color for this constructor
-        if race_id and i < len(standings_display):
+        if 'team_color' in result:
+            team_color = result['team_color']
+        elif race_id and i < len(standings_display):
             constructor_ref = standings_display.iloc[i].get('constructorRef', 'default')
             from team_colors import get_team_color
             team_color = get_team_color(constructor_ref)
@@ -234,15 +253,20 @@ def display_race_page(race, data):
     # Apply enhanced dataframe styles
     apply_dataframe_styles()
     
-    display_race_header(race)
+    # Artifacts, stat cards and images, usually already prefetched
+    bundle = get_race_bundle(race, data)
+    
+    display_race_header(race, bundle['flag_image'])
     st.divider()
-    display_circuit_info(race)
+    display_circuit_info(race, bundle['circuit_image'])
     st.divider()
     
     # Display race stats cards (winner, pole position, fastest lap)
     race_results = data['results'][data['results']['raceId'] == race['raceId']]
     if not race_results.empty:
-        display_race_stats(race_results, data)
+        # Everything below renders from the race's precomputed artifacts
+        artifacts = bundle['artifacts']
+        display_race_stats(race_results, data, artifacts, bundle['cards_html'])
         
         # Add a small space before the tabs
         st.write("")
@@ -251,49 +275,132 @@ def display_race_page(race, data):
         st.markdown("### Results View")
         
         # Check if this race has sprint data
-        has_sprint = race_has_sprint(race['raceId'])
+        has_sprint = artifacts['has_sprint']
         
-        # Create tabs with new order: Qualifying, Sprint Results, Starting Grid, Race Results, Driver Standings, Constructor Standings
+        # Create tabs with new order: Qualifying, Sprint Results, Starting Grid, Race Results, Positions Gained, Reliability, Driver Standings, What-If Standings, Constructor Standings
         if has_sprint:
-            tabs = st.tabs(["Qualifying", "Sprint Results", "Starting Grid", "Race Results", "Driver Standings", "Constructor Standings"])
+            tabs = st.tabs(["Qualifying", "Sprint Results", "Starting Grid", "Race Results", "Positions Gained", "Reliability", "Driver Standings", "What-If Standings", "Constructor Standings"])
             
             with tabs[0]:
                 display_qualifying_data(race['raceId'], data)
             with tabs[1]:
-                display_sprint_data(race['raceId'], data)
+                display_sprint_data(race['raceId'], data, artifacts)
             with tabs[2]:
-                display_starting_grid(race['raceId'], data)
+                display_starting_grid(race['raceId'], data, artifacts)
             with tabs[3]:
-                display_race_results_grid(race_results, data)
+                display_race_results_grid(race_results, data, artifacts)
             with tabs[4]:
-                display_driver_standings_after_race(race['raceId'], data)
+                display_positions_gained(race, data)
             with tabs[5]:
-                display_constructor_standings_after_race(race['raceId'], data)
+                display_reliability(race['raceId'], data)
+            with tabs[6]:
+                display_driver_standings_after_race(race['raceId'], data, artifacts)
+            with tabs[7]:
+                display_what_if_standings(race['raceId'], data, artifacts)
+            with tabs[8]:
+                display_constructor_standings_after_race(race['raceId'], data, artifacts)
         else:
-            tabs = st.tabs(["Qualifying", "Starting Grid", "Race Results", "Driver Standings", "Constructor Standings"])
+            tabs = st.tabs(["Qualifying", "Starting Grid", "Race Results", "Positions Gained", "Reliability", "Driver Standings", "What-If Standings", "Constructor Standings"])
             
             with tabs[0]:
                 display_qualifying_data(race['raceId'], data)
             with tabs[1]:
-                display_starting_grid(race['raceId'], data)
+                display_starting_grid(race['raceId'], data, artifacts)
             with tabs[2]:
-                display_race_results_grid(race_results, data)
+                display_race_results_grid(race_results, data, artifacts)
             with tabs[3]:
-                display_driver_standings_after_race(race['raceId'], data)
+                display_positions_gained(race, data)
             with tabs[4]:
-                display_constructor_standings_after_race(race['raceId'], data)
+                display_reliability(race['raceId'], data)
+            with tabs[5]:
+                display_driver_standings_after_race(race['raceId'], data, artifacts)
+            with tabs[6]:
+                display_what_if_standings(race['raceId'], data, artifacts)
+            with tabs[7]:
+                display_constructor_standings_after_race(race['raceId'], data, artifacts)
     else:
         st.info("Race results not available for this race")
 
-def race_has_sprint(race_id):
-    """Check if a race has sprint data"""
+# Grid slots charted in the historical conversion chart
+GRID_CONVERSION_SLOTS = 26
+
+# Drivers listed in the biggest climbers leaderboards
+TOP_CLIMBERS = 10
+
+def display_positions_gained(race, data):
+    """Display the grid-to-finish heatmap and biggest climbers of this race, its season or its circuit"""
+    st.markdown("### Positions Gained")
+    
     try:
-        # Try to load sprint results data
-        sprint_data = pd.read_csv('f1_data/sprint_results.csv')
-        sprint_results = sprint_data[sprint_data['raceId'] == race_id]
-        return not sprint_results.empty
-    except Exception:
-        return False
+        scope = st.radio("Scope", ["This Race", "Season", "Circuit"], horizontal=True, key="positions_gained_scope")
+        filters = {
+            "This Race": {'race_id': int(race['raceId'])},
+            "Season": {'year': int(race['year'])},
+            "Circuit": {'circuit_id': int(race['circuitId'])},
+        }[scope]
+        matrix = transition_matrix(data, **filters)
+        if matrix is None:
+            st.info("No grid and finishing positions available")
+            return
+        
+        drivers = data['drivers'].set_index('driverId')
+        driver_names = drivers['forename'] + ' ' + drivers['surname']
+        
+        fig_matrix = go.Figure(go.Heatmap(
+            z=matrix.where(matrix > 0).to_numpy(),
+            x=['NC'] + [f"P{slot}" for slot in matrix.columns[1:]],
+            y=['Pit'] + [f"P{slot}" for slot in matrix.index[1:]],
+            colorscale='Reds',
+            colorbar=dict(title="Drivers" if scope == "This Race" else "Starts"),
+            hovertemplate='Grid %{y} → Finish %{x}<br>%{z}<extra></extra>'
+        ))
+        fig_matrix.update_layout(
+            title="Grid → Finish",
+            height=max(450, 22 * len(matrix)),
+            xaxis=dict(title="Finishing Position", type='category'),
+            yaxis=dict(title="Grid Position", type='category', autorange='reversed'),
+            font=dict(size=14)
+        )
+        st.plotly_chart(fig_matrix, use_container_width=True)
+        st.caption("Cells below the diagonal gained places. NC: not classified; Pit: started from the pit lane "
+                   "(counted as starting behind the field).")
+        
+        leaders = climbers(scope_rows(data, **filters), TOP_CLIMBERS)
+        if leaders.empty:
+            return
+        leaders = leaders.assign(driver_name=leaders['driverId'].map(driver_names).fillna('Unknown'))
+        st.markdown("**Biggest Climbers:**")
+        fig_climbers = px.bar(
+            leaders,
+            x='driver_name',
+            y='gained',
+            color='driver_name',
+            title="Places Gained, Grid to Finish",
+            labels={'driver_name': '', 'gained': 'Places Gained'}
+        )
+        try:
+            from graph_styling import apply_team_colors_to_existing_chart
+            fig_climbers = apply_team_colors_to_existing_chart(fig_climbers, leaders, 'driver_name', data, int(race['raceId']))
+        except:
+            pass
+        fig_climbers.update_layout(height=400, xaxis_title="", yaxis_title="Places Gained", showlegend=False, font=dict(size=14))
+        st.plotly_chart(fig_climbers, use_container_width=True)
+        
+        if scope != "This Race":
+            st.dataframe(
+                pd.DataFrame({
+                    'Driver': leaders['driver_name'],
+                    'Classified Races': leaders['races'],
+                    'Places Gained': leaders['gained'],
+                    'Average': leaders['avg_gained'].round(2),
+                    'Best Climb': leaders['best_climb'],
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+    except Exception as e:
+        st.error(f"Error loading positions gained: {e}")
+        st.info("Positions gained not available")
 
 def time_to_seconds(time_str):
     """Convert time string to seconds"""
@@ -550,147 +657,78 @@ def format_time_mmssms(seconds):
                 st.warning(f"One or both drivers don't have {session} data available.")
 # Qualifying function moved to qualifying.py module
 
-def display_sprint_data(race_id, data):
+def display_sprint_data(race_id, data, artifacts=None):
     """Display sprint race data"""
     st.markdown("### Sprint Race Results")
     
     try:
-        # Try to load sprint results data
-        sprint_data = pd.read_csv('f1_data/sprint_results.csv')
-        sprint_results = sprint_data[sprint_data['raceId'] == race_id]
+        if artifacts is None:
+            artifacts = get_race_artifacts(race_id, data)
+        sprint_grid = artifacts['sprint']
         
-        # Load status data for status descriptions
-        status_data = pd.read_csv('f1_data/status.csv')
-        
-        if not sprint_results.empty:
-            # Merge with driver and constructor data
-            sprint_display = sprint_results.merge(data['drivers'], on='driverId', how='left')
-            sprint_display = sprint_display.merge(data['constructors'], on='constructorId', how='left')
-            sprint_display = sprint_display.merge(status_data, on='statusId', how='left')
-            
-            # Prepare data for display
-            sprint_grid = []
-            
-            for _, row in sprint_display.iterrows():
-                constructor_name = get_constructor_name(row, data)
-                
-                # Format driver name with number
-                driver_number = ""
-                if 'number' in row.index and pd.notna(row['number']):
-                    try:
-                        driver_number = f"#{int(float(row['number']))}"
-                    except (ValueError, TypeError):
-                        if str(row['number']) != 'N' and str(row['number']) != '\\N':
-                            driver_number = f"#{row['number']}"
-                
-                driver_name = f"{row['forename']} {row['surname']}" if pd.notna(row['forename']) and pd.notna(row['surname']) else 'N/A'
-                formatted_driver = f"{driver_number} {driver_name}".strip()
-                
-                # Get position safely
-                position = ''
-                if pd.notna(row['position']):
-                    try:
-                        position = int(float(row['position']))
-                    except (ValueError, TypeError):
-                        position = row['position']
-                
-                # Get points safely
-                points = 0
-                if pd.notna(row['points']):
-                    try:
-                        points = int(float(row['points']))
-                    except (ValueError, TypeError):
-                        points = float(row['points']) if isinstance(row['points'], (int, float)) else 0
-                
-                # Get laps safely
-                laps = 0
-                if pd.notna(row['laps']):
-                    try:
-                        laps = int(float(row['laps']))
-                    except (ValueError, TypeError):
-                        laps = row['laps']
-                
-                # Get status
-                status = row['status'] if pd.notna(row.get('status')) else 'Unknown'
-                
-                sprint_grid.append({
-                    'POS.': position,
-                    'DRIVER': formatted_driver,
-                    'TEAM': constructor_name,
-                    'TIME': row['time'] if pd.notna(row['time']) else 'DNF',
-                    'POINTS': points,
-                    'LAPS': laps,
-                    'STATUS': status
-                })
-            
-            # Sort by position
-            sprint_grid = sorted(sprint_grid, key=lambda x: (
-                999 if x['POS.'] == '' or not isinstance(x['POS.'], int) else x['POS.']
-            ))
-            
+        if sprint_grid:
             # Create sprint results cards
-            create_sprint_results_cards(sprint_grid, sprint_display, data, race_id)
-            
-
+            create_sprint_results_cards(sprint_grid, None, data, race_id)
         else:
             st.info("Sprint race data not available for this race")
     except Exception as e:
         st.error(f"Error loading sprint data: {e}")
         st.info("Sprint race data not available for this race")
 
-def display_starting_grid(race_id, data):
+def display_starting_grid(race_id, data, artifacts=None):
     """Display starting grid for the race with enhanced card layout"""
     st.markdown("### Starting Grid")
     
     try:
-        # Get results data which contains grid positions
-        race_results = data['results'][data['results']['raceId'] == race_id]
+        if artifacts is None:
+            artifacts = get_race_artifacts(race_id, data)
+        starting_grid = artifacts['grid']
         
-        if not race_results.empty:
-            # Merge with driver and constructor data
-            grid_display = race_results.merge(data['drivers'], on='driverId', how='left')
-            grid_display = grid_display.merge(data['constructors'], on='constructorId', how='left')
-            
-            # Get team colors
-            team_colors = get_all_team_colors()
-            
-            # Prepare data for display
-            starting_grid = []
-            for _, row in grid_display.iterrows():
-                constructor_name = get_constructor_name(row, data)
-                constructor_ref = row.get('constructorRef', 'default')
-                
-                # Format driver name with number (use number_x from results, fallback to number_y from drivers)
-                driver_number = ""
-                if 'number_x' in row.index and pd.notna(row['number_x']):
-                    try:
-                        driver_number = int(float(row['number_x']))
-                    except (ValueError, TypeError):
-                        driver_number = row['number_x'] if str(row['number_x']) not in ['N', '\\N'] else ""
-                elif 'number_y' in row.index and pd.notna(row['number_y']):
-                    try:
-                        driver_number = int(float(row['number_y']))
-                    except (ValueError, TypeError):
-                        driver_number = row['number_y'] if str(row['number_y']) not in ['N', '\\N'] else ""
-                
-                driver_name = f"{row['forename']} {row['surname']}" if pd.notna(row['forename']) and pd.notna(row['surname']) else 'N/A'
-                formatted_driver = f"#{driver_number} {driver_name}".strip() if driver_number else driver_name
-                
-                starting_grid.append({
-                    'GRID POS.': int(row['grid']) if pd.notna(row['grid']) else '',
-                    'DRIVER': formatted_driver,
-                    'TEAM': constructor_name,
-                    'team_ref': constructor_ref
-                })
+        if starting_grid:
+            # Team colors keyed by the team_ref carried on each grid record
+            team_colors = {driver['team_ref']: driver['team_color'] for driver in starting_grid}
             
             # Display as enhanced card layout directly (no tabs)
             create_starting_grid_layout(starting_grid, team_colors)
+            
+            with st.expander("Historical conversion by grid slot"):
+                display_grid_conversion(race_id, data)
         else:
             st.info("Starting grid data not available for this race")
     except Exception as e:
         st.error(f"Error loading starting grid data: {e}")
         st.info("Starting grid data not available for this race")
 
+def display_grid_conversion(race_id, data):
+    """Chart the win, podium and points rates from every grid slot in this race's era or at its circuit"""
+    race = data['races'].set_index('raceId').loc[race_id]
+    scope = st.radio("History", ["This era", "This circuit", "All races"], horizontal=True, key="grid_conversion_scope")
+    filters = {"This era": {'year': int(race['year'])}, "This circuit": {'circuit_id': int(race['circuitId'])},
+               "All races": {}}[scope]
+    rates = conversion_rates(data, **filters)
+    rates = rates[(rates['grid'] > 0) & (rates['grid'] <= GRID_CONVERSION_SLOTS)]
+    if rates.empty:
+        st.info("No starts recorded for this selection")
+        return
+    
+    conversion = rates.melt(id_vars=['grid', 'starts'], value_vars=['win_rate', 'podium_rate', 'points_rate'],
+                            var_name='outcome', value_name='rate')
+    conversion['outcome'] = conversion['outcome'].map({'win_rate': 'Win', 'podium_rate': 'Podium', 'points_rate': 'Points'})
+    fig_conversion = px.line(
+        conversion,
+        x='grid',
+        y='rate',
+        color='outcome',
+        markers=True,
+        hover_data={'starts': True},
+        title=f"Outcome by Grid Slot ({era_label(int(era_index(int(race['year']))))})" if scope == "This era" else "Outcome by Grid Slot",
+        labels={'grid': 'Grid Position', 'rate': 'Share of Starts', 'outcome': 'Outcome', 'starts': 'Starts'}
+    )
+    fig_conversion.update_layout(height=400, yaxis_tickformat='.0%', xaxis=dict(dtick=1), font=dict(size=14))
+    st.plotly_chart(fig_conversion, use_container_width=True)
+    st.caption("Share of every start from each slot that ended in a win, on the podium or in the points, "
+               "under the points rules of the time. Non-starters are excluded.")
+
 def display_race_data(race_id, data):
     """Display race results data"""
     race_results = data['results'][data['results']['raceId'] == race_id]
@@ -723,7 +761,7 @@ def get_constructor_name(row, data):
     except:
         return 'N/A'
 
-def display_race_header(race):
+def display_race_header(race, flag_image=None):
     """Display race header with title, circuit name, date and flag"""
     col1, col2, col3 = st.columns([2.8, 0.2, 1])
     
@@ -739,7 +777,7 @@ def display_race_header(race):
     with col3:
         st.write("")
         st.write("")
-        display_country_flag(race)
+        display_country_flag(race, flag_image)
 
 def format_race_date(date_str):
     """Format date as 'Date of the Race : 3rd August 2024' style"""
@@ -756,7 +794,7 @@ def format_race_date(date_str):
     except:
         return f"Date of the Race : {date_str}"
 
-def display_country_flag(race):
+def display_country_flag(race, flag_image=None):
     """Display country flag using local images or fallback to URL"""
     # Get country name
     country = race['country'] if pd.notna(race['country']) else 'Unknown'
@@ -767,8 +805,10 @@ def display_country_flag(race):
     
     flag_to_use = None
     
-    # Check for local flag first
-    if pd.notna(local_flag) and local_flag != '' and os.path.exists(local_flag):
+    # Check for a pre-sized flag, then the local flag
+    if flag_image is not None:
+        flag_to_use = flag_image
+    elif pd.notna(local_flag) and local_flag != '' and os.path.exists(local_flag):
         flag_to_use = local_flag
     elif pd.notna(original_flag) and original_flag != '':
         flag_to_use = original_flag
@@ -784,17 +824,17 @@ def display_country_flag(race):
         # Fallback for countries without flag images
         st.write(f"🏁 {country}")
 
-def display_circuit_info(race):
+def display_circuit_info(race, circuit_image=None):
     """Display circuit layout and details"""
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        display_circuit_image(race)
+        display_circuit_image(race, circuit_image)
     
     with col2:
         display_circuit_details(race)
 
-def display_circuit_image(race):
+def display_circuit_image(race, circuit_image=None):
     """Display circuit layout image"""
     st.markdown("### Circuit Layout")
     
@@ -804,8 +844,10 @@ def display_circuit_image(race):
     
     image_to_use = None
     
-    # Check for local image first
-    if pd.notna(local_image) and local_image != '' and os.path.exists(local_image):
+    # Check for a pre-sized image, then the local image
+    if circuit_image is not None:
+        image_to_use = circuit_image
+    elif pd.notna(local_image) and local_image != '' and os.path.exists(local_image):
         image_to_use = local_image
     elif pd.notna(original_image) and original_image != '':
         image_to_use = original_image
@@ -862,88 +904,18 @@ def get_circuit_length(race):
         pass
     return "Not available"
 
-def display_race_results_grid(race_results, data):
+def display_race_results_grid(race_results, data, artifacts=None):
     """Display race results with enhanced formatting and team information"""
     st.markdown("### Race Results")
     
-    # Merge with driver and constructor data
-    results_display = race_results.merge(data['drivers'], on='driverId', how='left')
-    results_display = results_display.merge(data['constructors'], on='constructorId', how='left')
+    if artifacts is None:
+        artifacts = get_race_artifacts(race_results['raceId'].iloc[0], data)
     
-    # Load status data for status descriptions
-    try:
-        status_data = pd.read_csv('f1_data/status.csv')
-        results_display = results_display.merge(status_data, on='statusId', how='left')
-    except:
-        pass
+    # Merge with driver data for the analysis driver pickers
+    results_display = race_results.merge(data['drivers'], on='driverId', how='left')
     
-    # Prepare enhanced grid data with team information
-    grid_data = []
-    for _, row in results_display.iterrows():
-        constructor_name = get_constructor_name(row, data)
-        
-        # Format driver name with number
-        driver_number = ""
-        if 'number_x' in row.index and pd.notna(row['number_x']):
-            try:
-                driver_number = f"#{int(float(row['number_x']))}"
-            except (ValueError, TypeError):
-                if str(row['number_x']) not in ['N', '\\N']:
-                    driver_number = f"#{row['number_x']}"
-        elif 'number_y' in row.index and pd.notna(row['number_y']):
-            try:
-                driver_number = f"#{int(float(row['number_y']))}"
-            except (ValueError, TypeError):
-                if str(row['number_y']) not in ['N', '\\N']:
-                    driver_number = f"#{row['number_y']}"
-        
-        driver_name = f"{row['forename']} {row['surname']}" if pd.notna(row['forename']) and pd.notna(row['surname']) else 'N/A'
-        formatted_driver = f"{driver_number} {driver_name}".strip()
-        
-        # Get position safely
-        position = ''
-        if pd.notna(row['position']):
-            try:
-                position = int(float(row['position']))
-            except (ValueError, TypeError):
-                position = row['position']
-        
-        # Get points safely
-        points = 0
-        if pd.notna(row['points']):
-            try:
-                points = int(float(row['points']))
-            except (ValueError, TypeError):
-                points = float(row['points']) if isinstance(row['points'], (int, float)) else 0
-        
-        # Get laps safely
-        laps = 0
-        if pd.notna(row['laps']):
-            try:
-                laps = int(float(row['laps']))
-            except (ValueError, TypeError):
-                laps = row['laps']
-        
-        # Get status
-        status = row.get('status', 'Unknown') if pd.notna(row.get('status')) else 'Unknown'
-        
-        # Get time/gap
-        time_result = row['time'] if pd.notna(row['time']) else 'DNF'
-        
-        grid_data.append({
-            'POS.': position,
-            'DRIVER': formatted_driver,
-            'TEAM': constructor_name,
-            'TIME/RETIRED': time_result,
-            'POINTS': points,
-            'LAPS': laps,
-            'STATUS': status
-        })
-    
-    # Sort by position
-    grid_data = sorted(grid_data, key=lambda x: (
-        999 if x['POS.'] == '' or not isinstance(x['POS.'], int) else x['POS.']
-    ))
+    # Race result records, already ordered by position
+    grid_data = artifacts['results']
     
     # Create individual race result cards
     race_id = race_results['raceId'].iloc[0] if not race_results.empty else None
@@ -972,15 +944,12 @@ def display_race_results_grid(race_results, data):
         # Convert race_id to int to avoid comparison issues
         race_id_int = int(race_results['raceId'].iloc[0])
         
-        lap_times = pd.read_csv('f1_data/lap_times.csv')
-        race_lap_times = lap_times[lap_times['raceId'] == race_id_int]
-        
-        pit_stops = pd.read_csv('f1_data/pit_stops.csv')
-        race_pit_stops = pit_stops[pit_stops['raceId'] == race_id_int]
+        race_lap_times = race_rows(data, 'lap_times', race_id_int)
+        race_pit_stops = race_rows(data, 'pit_stops', race_id_int)
         
         if not race_lap_times.empty:
             # Create tabs for different visualizations
-            analysis_tabs = st.tabs(["Lap Time Comparison", "Position Progression", "Pit Stop Comparison", "Laps Led", "Pit Stop Summary"])
+            analysis_tabs = st.tabs(["Lap Time Comparison", "Lap Time Distribution", "Position Progression", "Pit Stop Comparison", "Laps Led", "Pit Stop Summary", "Strategy", "All Overtakes", "Race Trace", "Race Replay"])
             
             with analysis_tabs[0]:
                 # Lap Time Comparison - Select 2 drivers
@@ -1005,25 +974,15 @@ def display_race_results_grid(race_results, data):
                 
                 if not driver1_laps.empty and not driver2_laps.empty:
                     # Create a dataframe for plotting
-                    lap_data = []
-                    
-                    for _, row in driver1_laps.iterrows():
-                        lap_data.append({
-                            'Driver': selected_driver1,
-                            'Lap': row['lap'],
-                            'Time (s)': row['milliseconds'] / 1000,
-                            'Position': row['position']
-                        })
-                    
-                    for _, row in driver2_laps.iterrows():
-                        lap_data.append({
-                            'Driver': selected_driver2,
-                            'Lap': row['lap'],
-                            'Time (s)': row['milliseconds'] / 1000,
-                            'Position': row['position']
+                    lap_df = pd.concat([
+                        pd.DataFrame({
+                            'Driver': driver_name,
+                            'Lap': driver_laps['lap'].to_numpy(),
+                            'Time (s)': driver_laps['milliseconds'].to_numpy() / 1000,
+                            'Position': driver_laps['position'].to_numpy()
                         })
-                    
-                    lap_df = pd.DataFrame(lap_data)
+                        for driver_name, driver_laps in [(selected_driver1, driver1_laps), (selected_driver2, driver2_laps)]
+                    ], ignore_index=True)
                     
                     # Create lap time comparison chart
                     fig_laptime = px.line(
@@ -1069,6 +1028,9 @@ def display_race_results_grid(race_results, data):
                     st.info("Lap time data not available for selected drivers")
             
             with analysis_tabs[1]:
+                display_lap_distribution(artifacts['lap_distribution'], data, race_id_int)
+            
+            with analysis_tabs[2]:
                 # Position Progression - Select 2 drivers
                 drivers_in_race = results_display[['driverId', 'forename', 'surname']].drop_duplicates()
                 driver_options = [f"{row['forename']} {row['surname']}" for _, row in drivers_in_race.iterrows()]
@@ -1175,33 +1137,11 @@ def display_race_results_grid(race_results, data):
                         else:
                             st.write(f"• **{pos_driver2}**: Started P{driver2_start}, finished P{driver2_end}, no net position change")
                         
-                        # Check for overtakes between the two drivers
-                        overtakes = []
-                        for i in range(len(driver1_data)):
-                            lap = driver1_data.iloc[i]['Lap']
-                            driver1_pos = driver1_data.iloc[i]['Position']
-                            
-                            # Find corresponding lap for driver2
-                            driver2_lap_data = driver2_data[driver2_data['Lap'] == lap]
-                            if not driver2_lap_data.empty:
-                                driver2_pos = driver2_lap_data.iloc[0]['Position']
-                                
-                                # Check if positions crossed from previous lap
-                                if i > 0:
-                                    prev_lap = driver1_data.iloc[i-1]['Lap']
-                                    prev_driver1_pos = driver1_data.iloc[i-1]['Position']
-                                    prev_driver2_lap_data = driver2_data[driver2_data['Lap'] == prev_lap]
-                                    
-                                    if not prev_driver2_lap_data.empty:
-                                        prev_driver2_pos = prev_driver2_lap_data.iloc[0]['Position']
-                                        
-                                        # Check if they swapped positions
-                                        if ((prev_driver1_pos > prev_driver2_pos and driver1_pos < driver2_pos) or 
-                                            (prev_driver1_pos < prev_driver2_pos and driver1_pos > driver2_pos)):
-                                            if driver1_pos < driver2_pos:
-                                                overtakes.append(f"Lap {lap}: {pos_driver1} overtook {pos_driver2}")
-                                            else:
-                                                overtakes.append(f"Lap {lap}: {pos_driver2} overtook {pos_driver1}")
+                        # Overtakes between the two drivers, filtered from the race's overtake index
+                        race_overtakes = pd.DataFrame(artifacts['overtakes'], columns=OVERTAKE_COLUMNS)
+                        driver_names = {pos_driver1_id: pos_driver1, pos_driver2_id: pos_driver2}
+                        overtakes = [f"Lap {row['lap']}: {driver_names[row['overtaker']]} overtook {driver_names[row['overtaken']]}"
+                                     for row in pair_overtakes(race_overtakes, pos_driver1_id, pos_driver2_id).to_dict('records')]
                         
                         if overtakes:
                             st.write("• **Overtakes between drivers:**")
@@ -1212,7 +1152,7 @@ def display_race_results_grid(race_results, data):
                 else:
                     st.info("Position data not available for selected drivers")
             
-            with analysis_tabs[2]:
+            with analysis_tabs[3]:
                 # Pit Stop Comparison between two drivers
                 if not race_pit_stops.empty:
                     # Driver selection for pit stop comparison
@@ -1296,81 +1236,52 @@ def display_race_results_grid(race_results, data):
                     
                     if not driver1_pitstops.empty or not driver2_pitstops.empty:
                         # Compare each stop
-                        max_stops = max(len(driver1_pitstops) if not driver1_pitstops.empty else 0, 
-                                       len(driver2_pitstops) if not driver2_pitstops.empty else 0)
+                        comparison = pit_comparison(race_id_int, pit_driver1_id, pit_driver2_id, data)
                         
-                        for stop_num in range(1, max_stops + 1):
-                            # Get data for this stop number
-                            driver1_stop = driver1_pitstops[driver1_pitstops['stop'] == stop_num]
-                            driver2_stop = driver2_pitstops[driver2_pitstops['stop'] == stop_num]
+                        for stop in comparison.to_dict('records'):
+                            stop_num = int(stop['stop'])
                             
-                            if not driver1_stop.empty and not driver2_stop.empty:
+                            if pd.notna(stop['lap_1']) and pd.notna(stop['lap_2']):
                                 # Both drivers have this stop
-                                lap1 = int(driver1_stop.iloc[0]['lap'])
-                                lap2 = int(driver2_stop.iloc[0]['lap'])
-                                
-                                try:
-                                    duration1 = float(driver1_stop.iloc[0]['duration'])
-                                    duration2 = float(driver2_stop.iloc[0]['duration'])
-                                    
-                                    lap_diff = lap1 - lap2
-                                    duration_diff = duration1 - duration2
-                                    
-                                    if lap_diff == 0:
-                                        # Same lap
-                                        if abs(duration_diff) > 0.1:
-                                            if duration_diff > 0:
-                                                st.write(f"• Stop {stop_num}: Same lap, {pit_driver1} was {duration_diff:.3f}s slower")
-                                            else:
-                                                st.write(f"• Stop {stop_num}: Same lap, {pit_driver2} was {abs(duration_diff):.3f}s slower")
-                                        else:
-                                            st.write(f"• Stop {stop_num}: Same lap, similar duration")
-                                    else:
-                                        # Different laps
-                                        if abs(duration_diff) > 0.1:
-                                            if lap_diff > 0:
-                                                if duration_diff > 0:
-                                                    st.write(f"• Stop {stop_num}: {pit_driver1} pitted {lap_diff} lap(s) later, {pit_driver1} was {duration_diff:.3f}s slower")
-                                                else:
-                                                    st.write(f"• Stop {stop_num}: {pit_driver1} pitted {lap_diff} lap(s) later, {pit_driver2} was {abs(duration_diff):.3f}s slower")
-                                            else:
-                                                if duration_diff > 0:
-                                                    st.write(f"• Stop {stop_num}: {pit_driver2} pitted {abs(lap_diff)} lap(s) later, {pit_driver1} was {duration_diff:.3f}s slower")
-                                                else:
-                                                    st.write(f"• Stop {stop_num}: {pit_driver2} pitted {abs(lap_diff)} lap(s) later, {pit_driver2} was {abs(duration_diff):.3f}s slower")
-                                        else:
-                                            if lap_diff > 0:
-                                                st.write(f"• Stop {stop_num}: {pit_driver1} pitted {lap_diff} lap(s) later")
-                                            else:
-                                                st.write(f"• Stop {stop_num}: {pit_driver2} pitted {abs(lap_diff)} lap(s) later")
+                                lap_diff = int(stop['lap_diff'])
+                                duration_diff = stop['duration_diff']
                                 
-                                except (ValueError, TypeError):
+                                if pd.isna(duration_diff):
                                     # Handle non-numeric durations
                                     if lap_diff == 0:
                                         st.write(f"• Stop {stop_num}: Same lap")
+                                    elif lap_diff > 0:
+                                        st.write(f"• Stop {stop_num}: {pit_driver1} pitted {lap_diff} lap(s) later")
                                     else:
-                                        if lap_diff > 0:
-                                            st.write(f"• Stop {stop_num}: {pit_driver1} pitted {lap_diff} lap(s) later")
+                                        st.write(f"• Stop {stop_num}: {pit_driver2} pitted {abs(lap_diff)} lap(s) later")
+                                elif lap_diff == 0:
+                                    # Same lap
+                                    if abs(duration_diff) > 0.1:
+                                        if duration_diff > 0:
+                                            st.write(f"• Stop {stop_num}: Same lap, {pit_driver1} was {duration_diff:.3f}s slower")
                                         else:
-                                            st.write(f"• Stop {stop_num}: {pit_driver2} pitted {abs(lap_diff)} lap(s) later")
-                            
-                            elif not driver1_stop.empty and driver2_stop.empty:
-                                # Only driver1 has this stop
-                                lap1 = int(driver1_stop.iloc[0]['lap'])
-                                try:
-                                    duration1 = float(driver1_stop.iloc[0]['duration'])
-                                    st.write(f"• {pit_driver1} had an extra stop (Stop {stop_num}) at lap {lap1} for {duration1:.3f}s")
-                                except (ValueError, TypeError):
-                                    st.write(f"• {pit_driver1} had an extra stop (Stop {stop_num}) at lap {lap1}")
+                                            st.write(f"• Stop {stop_num}: Same lap, {pit_driver2} was {abs(duration_diff):.3f}s slower")
+                                    else:
+                                        st.write(f"• Stop {stop_num}: Same lap, similar duration")
+                                else:
+                                    # Different laps
+                                    later_driver = pit_driver1 if lap_diff > 0 else pit_driver2
+                                    if abs(duration_diff) > 0.1:
+                                        slower_driver = pit_driver1 if duration_diff > 0 else pit_driver2
+                                        st.write(f"• Stop {stop_num}: {later_driver} pitted {abs(lap_diff)} lap(s) later, {slower_driver} was {abs(duration_diff):.3f}s slower")
+                                    else:
+                                        st.write(f"• Stop {stop_num}: {later_driver} pitted {abs(lap_diff)} lap(s) later")
                             
-                            elif driver1_stop.empty and not driver2_stop.empty:
-                                # Only driver2 has this stop
-                                lap2 = int(driver2_stop.iloc[0]['lap'])
-                                try:
-                                    duration2 = float(driver2_stop.iloc[0]['duration'])
-                                    st.write(f"• {pit_driver2} had an extra stop (Stop {stop_num}) at lap {lap2} for {duration2:.3f}s")
-                                except (ValueError, TypeError):
-                                    st.write(f"• {pit_driver2} had an extra stop (Stop {stop_num}) at lap {lap2}")
+                            else:
+                                # Only one driver has this stop
+                                suffix = '1' if pd.notna(stop['lap_1']) else '2'
+                                extra_driver = pit_driver1 if suffix == '1' else pit_driver2
+                                lap = int(stop[f'lap_{suffix}'])
+                                duration = stop[f'duration_{suffix}']
+                                if pd.notna(duration):
+                                    st.write(f"• {extra_driver} had an extra stop (Stop {stop_num}) at lap {lap} for {duration:.3f}s")
+                                else:
+                                    st.write(f"• {extra_driver} had an extra stop (Stop {stop_num}) at lap {lap}")
                     
                     else:
                         st.write("• No pit stop data available for selected drivers")
@@ -1378,41 +1289,37 @@ def display_race_results_grid(race_results, data):
                 else:
                     st.info("Pit stop data not available for this race")
             
-            with analysis_tabs[3]:
+            with analysis_tabs[4]:
                 # Laps Led Analysis
                 try:
-                    # Get all lap times to analyze race leaders
-                    all_laps = race_lap_times.copy()
-                    
-                    # Find laps where drivers were in position 1
-                    leaders_data = all_laps[all_laps['position'] == 1].sort_values('lap')
+                    leadership = artifacts['leadership']
                     
-                    if not leaders_data.empty:
-                        # Create race leadership progression (dot plot)
-                        leaders_with_names = leaders_data.merge(data['drivers'], on='driverId', how='left')
-                        leaders_with_names['driver_name'] = leaders_with_names.apply(
-                            lambda x: f"{x['forename']} {x['surname']}", axis=1
-                        )
+                    if leadership and leadership['stints']:
+                        # Run-length encoded leadership stints, precomputed with driver names
+                        stints = pd.DataFrame(leadership['stints'])
                         
-                        # Create dot plot showing race leader changes
-                        fig_leadership = px.scatter(
-                            leaders_with_names,
-                            x='lap',
+                        # Gantt-style chart: one bar per unbroken run of laps in the lead
+                        fig_leadership = px.bar(
+                            stints,
+                            x='laps',
                             y='driver_name',
+                            base=stints['from_lap'] - 1,
                             color='driver_name',
-                            title="Race Leadership Progression",
-                            labels={'lap': 'Lap Number', 'driver_name': 'Race Leader'}
+                            orientation='h',
+                            title="Race Leadership Stints",
+                            labels={'laps': 'Laps Led', 'driver_name': 'Race Leader'},
+                            hover_data={'from_lap': True, 'to_lap': True, 'laps': True}
                         )
                         
                         # Apply team colors to the chart
                         try:
                             from graph_styling import apply_team_colors_to_existing_chart
-                            fig_leadership = apply_team_colors_to_existing_chart(fig_leadership, leaders_with_names, 'driver_name', data, race_id_int)
+                            fig_leadership = apply_team_colors_to_existing_chart(fig_leadership, stints, 'driver_name', data, race_id_int)
                         except:
                             pass
                         
                         fig_leadership.update_layout(
-                            height=400,
+                            height=max(250, 60 * stints['driver_name'].nunique() + 150),
                             xaxis_title="Lap Number",
                             yaxis_title="Race Leader",
                             font=dict(size=16),
@@ -1421,16 +1328,8 @@ def display_race_results_grid(race_results, data):
                         
                         st.plotly_chart(fig_leadership, use_container_width=True)
                         
-                        # Group by driver and count laps led
-                        laps_led = leaders_data.groupby('driverId').size().reset_index(name='laps_led')
-                        
-                        # Get driver names
-                        laps_led = laps_led.merge(data['drivers'], on='driverId', how='left')
-                        
-                        # Format driver names
-                        laps_led['driver_name'] = laps_led.apply(
-                            lambda x: f"{x['forename']} {x['surname']}", axis=1
-                        )
+                        # Laps led per driver
+                        laps_led = pd.DataFrame(leadership['laps_led'])
                         
                         # Create a bar chart of laps led
                         fig_leaders = px.bar(
@@ -1458,6 +1357,18 @@ def display_race_results_grid(race_results, data):
                         )
                         
                         st.plotly_chart(fig_leaders, use_container_width=True)
+                        
+                        # Season laps-led leaderboard, from the same stint table
+                        st.markdown("**Season Laps Led (up to this race):**")
+                        season_laps_led = pd.DataFrame(leadership['season_laps_led'])
+                        st.dataframe(
+                            season_laps_led.rename(columns={
+                                'driver_name': 'Driver', 'laps_led': 'Laps Led',
+                                'races_led': 'Races Led', 'stints': 'Leadership Stints'
+                            })[['Driver', 'Laps Led', 'Races Led', 'Leadership Stints']],
+                            use_container_width=True,
+                            hide_index=True
+                        )
                     else:
                         st.info("Race leader data not available")
                 except Exception as e:
@@ -1466,28 +1377,11 @@ def display_race_results_grid(race_results, data):
             
 
             
-            with analysis_tabs[4]:
+            with analysis_tabs[5]:
                 # Pit Stop Summary (overall race pit stop analysis)
                 if not race_pit_stops.empty:
-                    # Create a visualization of pit stop strategies
-                    pit_stop_data = []
-                    
-                    for _, row in race_pit_stops.iterrows():
-                        driver_info = drivers_in_race[drivers_in_race['driverId'] == row['driverId']]
-                        if not driver_info.empty:
-                            driver_name = f"{driver_info['forename'].iloc[0]} {driver_info['surname'].iloc[0]}"
-                            # Ensure duration is a float
-                            try:
-                                duration = float(row['duration'])
-                            except (ValueError, TypeError):
-                                duration = 0.0
-                                
-                            pit_stop_data.append({
-                                'Driver': driver_name,
-                                'Stop': int(row['stop']) if pd.notna(row['stop']) else 0,
-                                'Lap': int(row['lap']) if pd.notna(row['lap']) else 0,
-                                'Duration (s)': duration
-                            })
+                    # Pit stops of drivers classified in this race, precomputed
+                    pit_stop_data = artifacts['pit_summary']
                     
                     if pit_stop_data:
                         pit_df = pd.DataFrame(pit_stop_data)
@@ -1515,12 +1409,307 @@ def display_race_results_grid(race_results, data):
                         st.info("No pit stop data available for visualization")
                 else:
                     st.info("Pit stop data not available for this race")
+            
+            with analysis_tabs[6]:
+                display_strategy(artifacts['strategy'], data, race_id_int)
+            
+            with analysis_tabs[7]:
+                display_all_overtakes(artifacts['overtakes'], results_display, data, race_id_int)
+            
+            with analysis_tabs[8]:
+                display_race_trace(race_lap_times, results_display, data, race_id_int)
+            
+            with analysis_tabs[9]:
+                display_race_replay(artifacts['replay'], data, race_id_int)
         else:
             st.info("Lap time data not available for this race")
     except Exception as e:
         st.error(f"Error loading race analysis data: {e}")
         st.info("Race analysis not available")
 
+def display_lap_distribution(distribution, data, race_id):
+    """Display every driver's lap time spread as box plots or a binned histogram heatmap"""
+    if not distribution:
+        st.info("Lap time data not available for this race")
+        return
+    summary = pd.DataFrame(distribution['summary'])
+    view = st.radio("View", ["Box Plot", "Histogram"], horizontal=True, key="lap_distribution_view")
+    
+    if view == "Box Plot":
+        # One box per driver drawn from the precomputed quartiles and fences, in team colors
+        try:
+            colors = [get_driver_team_color_for_race(driver_id, race_id, data) for driver_id in summary['driverId']]
+        except:
+            colors = ['#FF0000'] * len(summary)
+        fig_distribution = go.Figure([
+            go.Box(x=[row['driver_name']], q1=[row['q1']], median=[row['median']], q3=[row['q3']],
+                   lowerfence=[row['lower_fence']], upperfence=[row['upper_fence']], mean=[row['mean']],
+                   marker_color=color, name=row['driver_name'], showlegend=False)
+            for row, color in zip(summary.to_dict('records'), colors)
+        ])
+        fig_distribution.update_layout(
+            title="Lap Time Distribution (fastest median first)",
+            height=550,
+            xaxis_title="",
+            yaxis_title="Lap Time (s)",
+            font=dict(size=14)
+        )
+    else:
+        edges = distribution['edges']
+        centers = [(low + high) / 2 for low, high in zip(edges[:-1], edges[1:])]
+        fig_distribution = go.Figure(go.Heatmap(
+            z=distribution['counts'],
+            x=centers,
+            y=summary['driver_name'],
+            colorscale='Reds',
+            colorbar=dict(title="Laps"),
+            hovertemplate='%{y}<br>%{x:.3f}s<br>%{z} laps<extra></extra>'
+        ))
+        fig_distribution.update_layout(
+            title="Lap Time Histogram (last bin includes slower laps)",
+            height=max(400, 28 * len(summary)),
+            xaxis_title="Lap Time (s)",
+            yaxis=dict(autorange='reversed'),
+            font=dict(size=14)
+        )
+    st.plotly_chart(fig_distribution, use_container_width=True)
+    
+    st.dataframe(
+        pd.DataFrame({
+            'Driver': summary['driver_name'],
+            'Laps': summary['laps'],
+            'Fastest': summary['fastest'].map(format_time_mmssms),
+            'Median': summary['median'].map(format_time_mmssms),
+            'IQR (s)': (summary['q3'] - summary['q1']).round(3),
+            'Mean': summary['mean'].map(format_time_mmssms),
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+    st.caption("Pit in-laps and out-laps are excluded.")
+
+def display_all_overtakes(overtake_records, results_display, data, race_id):
+    """Display every overtake of the race and the overtakes made per driver"""
+    if not overtake_records:
+        st.info("No overtakes recorded in the lap data for this race")
+        return
+    
+    overtakes = pd.DataFrame(overtake_records, columns=OVERTAKE_COLUMNS)
+    drivers_in_race = results_display[['driverId', 'forename', 'surname']].drop_duplicates('driverId')
+    driver_names = dict(zip(drivers_in_race['driverId'], drivers_in_race['forename'] + ' ' + drivers_in_race['surname']))
+    overtakes['Overtaker'] = overtakes['overtaker'].map(driver_names)
+    overtakes['Overtaken'] = overtakes['overtaken'].map(driver_names)
+    
+    # Overtakes made and suffered per driver
+    made = overtakes.groupby('Overtaker').size().rename('Overtakes Made')
+    suffered = overtakes.groupby('Overtaken').size().rename('Times Overtaken')
+    per_driver = pd.concat([made, suffered], axis=1).fillna(0).astype(int)
+    per_driver = per_driver.sort_values(['Overtakes Made', 'Times Overtaken'], ascending=[False, True])
+    per_driver = per_driver.rename_axis('Driver').reset_index()
+    
+    fig_overtakes = px.bar(
+        per_driver,
+        x='Driver',
+        y='Overtakes Made',
+        color='Driver',
+        title=f"Overtakes Made ({len(overtakes)} in total)"
+    )
+    try:
+        from graph_styling import apply_team_colors_to_existing_chart
+        fig_overtakes = apply_team_colors_to_existing_chart(fig_overtakes, per_driver, 'Driver', data, race_id)
+    except:
+        pass
+    fig_overtakes.update_layout(height=500, showlegend=False, xaxis_title="Driver", yaxis_title="Overtakes", font=dict(size=14))
+    st.plotly_chart(fig_overtakes, use_container_width=True)
+    
+    st.markdown("**All Overtakes:**")
+    st.dataframe(
+        overtakes.rename(columns={'lap': 'Lap', 'overtaker_position': 'New Position'})[['Lap', 'Overtaker', 'Overtaken', 'New Position']],
+        use_container_width=True,
+        hide_index=True
+    )
+
+def display_strategy(strategy, data, race_id):
+    """Display the stints of every driver and the season strategy summary"""
+    if not strategy:
+        st.info("Strategy data not available for this race")
+        return
+    
+    try:
+        stints = pd.DataFrame(strategy['stints'])
+        stints['Stint'] = 'Stint ' + stints['stint'].astype(str)
+        
+        # Whole-grid strategy chart: one bar segment per stint, drivers in finishing order of laps run
+        driver_order = stints.groupby('driver_name')['to_lap'].max().sort_values().index.tolist()
+        fig_strategy = px.bar(
+            stints,
+            x='laps',
+            y='driver_name',
+            base=stints['from_lap'] - 1,
+            color='Stint',
+            orientation='h',
+            title="Race Strategy",
+            labels={'laps': 'Laps', 'driver_name': 'Driver'},
+            hover_data={'from_lap': True, 'to_lap': True, 'avg_lap': ':.3f', 'degradation': ':.3f'},
+            category_orders={'driver_name': driver_order}
+        )
+        fig_strategy.update_layout(
+            height=max(300, 28 * len(driver_order) + 150),
+            xaxis_title="Lap Number",
+            yaxis_title="Driver",
+            font=dict(size=14)
+        )
+        st.plotly_chart(fig_strategy, use_container_width=True)
+        
+        st.markdown("**Stints:**")
+        st.dataframe(
+            stints.rename(columns={
+                'driver_name': 'Driver', 'stint': 'Stint #', 'from_lap': 'From Lap', 'to_lap': 'To Lap',
+                'laps': 'Laps', 'avg_lap': 'Avg Lap (s)', 'median_lap': 'Median Lap (s)',
+                'degradation': 'Degradation (s/lap)'
+            })[['Driver', 'Stint #', 'From Lap', 'To Lap', 'Laps', 'Avg Lap (s)', 'Median Lap (s)', 'Degradation (s/lap)']].round(3),
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        st.markdown("**Season Strategy (up to this race):**")
+        season = pd.DataFrame(strategy['season'])
+        st.dataframe(
+            season.rename(columns={
+                'driver_name': 'Driver', 'races': 'Races', 'stops_per_race': 'Stops per Race',
+                'avg_stint_laps': 'Avg Stint (laps)', 'avg_degradation': 'Avg Degradation (s/lap)'
+            })[['Driver', 'Races', 'Stops per Race', 'Avg Stint (laps)', 'Avg Degradation (s/lap)']].round(3),
+            use_container_width=True,
+            hide_index=True
+        )
+    except Exception as e:
+        st.error(f"Error building race strategy: {e}")
+        st.info("Strategy analysis not available")
+
+# Race trace views: column of the lap_analysis.race_trace frame and axis title
+RACE_TRACE_VIEWS = {
+    'Race Trace': ('trace', "Time vs. Winner's Average Pace (s)"),
+    'Gap to Leader': ('gap_to_leader', "Gap to Leader (s)"),
+    'Gap to Car Ahead': ('gap_to_ahead', "Gap to Car Ahead (s)"),
+    'Interval Change': ('interval', "Change in Gap to Car Ahead (s)"),
+}
+
+def display_race_trace(race_lap_times, results_display, data, race_id):
+    """Display the race trace and gap series of every driver"""
+    try:
+        trace = race_trace(race_lap_times)
+        if trace.empty:
+            st.info("Lap time data not available for this race")
+            return
+        
+        drivers_in_race = results_display[['driverId', 'forename', 'surname']].drop_duplicates('driverId')
+        driver_names = dict(zip(drivers_in_race['driverId'], drivers_in_race['forename'] + ' ' + drivers_in_race['surname']))
+        trace['Driver'] = trace['driverId'].map(driver_names).fillna(trace['driverId'].astype(str))
+        
+        view = st.radio("Show:", list(RACE_TRACE_VIEWS), horizontal=True, key="race_trace_view")
+        column, axis_title = RACE_TRACE_VIEWS[view]
+        
+        fig_trace = px.line(
+            trace,
+            x='lap',
+            y=column,
+            color='Driver',
+            title=view,
+            labels={'lap': 'Lap Number', column: axis_title}
+        )
+        try:
+            from graph_styling import apply_team_colors_to_existing_chart
+            fig_trace = apply_team_colors_to_existing_chart(fig_trace, trace, 'Driver', data, race_id)
+        except:
+            pass
+        
+        # Gaps grow downwards like on a timing screen; the race trace keeps the leader on top
+        fig_trace.update_layout(height=600, xaxis_title="Lap Number", yaxis_title=axis_title, font=dict(size=14))
+        if column != 'trace':
+            fig_trace.update_yaxes(autorange='reversed')
+        st.plotly_chart(fig_trace, use_container_width=True)
+        
+        if view == 'Race Trace':
+            st.caption("Lines above zero are ahead of the winner's average lap pace; a drop shows a pit stop or a slow lap.")
+    except Exception as e:
+        st.error(f"Error building race trace: {e}")
+        st.info("Race trace not available")
+
+# Frames the race replay aims for before the default step skips laps
+REPLAY_MAX_FRAMES = 40
+REPLAY_STEPS = [1, 2, 3, 5, 10]
+
+def display_race_replay(replay, data, race_id):
+    """Animate the running order and gap to the leader lap by lap from the precomputed frames
+    
+    The whole animation is handed to the browser as Plotly frames, so playing
+    it does not rerun the page.
+    """
+    if not replay:
+        st.info("Lap time data not available for this race")
+        return
+    try:
+        laps = unpack_array(replay['laps'])
+        order = unpack_array(replay['order'])
+        gaps = unpack_array(replay['gaps'])
+        drivers = pd.DataFrame(replay['drivers'])
+        names = drivers['driver_name'].to_numpy()
+        try:
+            colors = pd.Series([get_driver_team_color_for_race(driver_id, race_id, data) for driver_id in drivers['driverId']]).to_numpy()
+        except:
+            colors = pd.Series(['#FF0000'] * len(drivers)).to_numpy()
+        
+        default_step = next((step for step in REPLAY_STEPS if len(laps) / step <= REPLAY_MAX_FRAMES), REPLAY_STEPS[-1])
+        step = st.select_slider("Laps per frame", options=REPLAY_STEPS, value=default_step, key="race_replay_step")
+        frame_index = decimate_frames(len(laps), step)
+        
+        def frame_bar(index):
+            used = order[index] >= 0
+            slots = order[index][used]
+            return go.Bar(
+                x=gaps[index][used],
+                y=list(range(1, len(slots) + 1)),
+                orientation='h',
+                text=names[slots],
+                textposition='outside',
+                marker_color=colors[slots],
+                hovertemplate='P%{y} %{text}<br>+%{x:.3f}s<extra></extra>'
+            )
+        
+        frames = [go.Frame(data=[frame_bar(index)], name=str(int(laps[index]))) for index in frame_index]
+        max_gap = float(pd.Series(gaps.ravel()).quantile(0.95)) if len(gaps) else 0.0
+        fig_replay = go.Figure(data=frames[0].data, frames=frames)
+        fig_replay.update_layout(
+            title="Running Order and Gap to Leader",
+            height=max(450, 30 * order.shape[1]),
+            xaxis=dict(title="Gap to Leader (s)", range=[0, max(max_gap, 1.0) * 1.25]),
+            yaxis=dict(title="Position", autorange='reversed', dtick=1),
+            font=dict(size=14),
+            updatemenus=[dict(
+                type='buttons',
+                direction='left',
+                x=0, y=1.12,
+                buttons=[
+                    dict(label="▶ Play", method='animate',
+                         args=[None, dict(frame=dict(duration=400, redraw=True), transition=dict(duration=200), fromcurrent=True)]),
+                    dict(label="⏸ Pause", method='animate',
+                         args=[[None], dict(frame=dict(duration=0, redraw=False), mode='immediate')]),
+                ]
+            )],
+            sliders=[dict(
+                currentvalue=dict(prefix="Lap "),
+                steps=[dict(label=frame.name, method='animate',
+                            args=[[frame.name], dict(frame=dict(duration=0, redraw=True), mode='immediate')])
+                       for frame in frames]
+            )]
+        )
+        st.plotly_chart(fig_replay, use_container_width=True)
+        st.caption("Bars show each car's gap to the leader at the end of the lap; the axis is capped so "
+                   "lapped cars run off the right edge. Retired cars drop out of the order.")
+    except Exception as e:
+        st.error(f"Error building race replay: {e}")
+        st.info("Race replay not available")
+
 def find_constructor_name_column(results_display):
     """Find the correct constructor name column"""
     for col in results_display.columns:
@@ -1528,16 +1717,13 @@ def find_constructor_name_column(results_display):
             return col
     return 'name' if 'name' in results_display.columns else 'constructorId'
 
-def prepare_grid_data(results_display, constructor_name_col):
+def prepare_grid_data(results_display, constructor_name_col, status_data=None):
     """Prepare data for AG Grid display"""
     grid_data = []
     
-    # Load status data for status descriptions
-    try:
-        status_data = pd.read_csv('f1_data/status.csv')
+    # Merge status descriptions when the status table is available
+    if status_data is not None:
         results_display = results_display.merge(status_data, on='statusId', how='left')
-    except:
-        pass
     
     for _, row in results_display.iterrows():
         try:
@@ -1833,169 +2019,114 @@ def configure_standings_grid(df):
     
     return gb.build()
 
-def display_driver_standings_after_race(race_id, data):
+def display_title_contention(race_id, data, kind='drivers'):
+    """Display who can still win the title after this race, or when it was clinched"""
+    rows = contention_after(race_id, data, kind)
+    if rows is None or rows.empty:
+        return
+    key = 'driverId' if kind == 'drivers' else 'constructorId'
+    if kind == 'drivers':
+        drivers = data['drivers'].set_index('driverId')
+        names = drivers['forename'] + ' ' + drivers['surname']
+    else:
+        names = data['constructors'].set_index('constructorId')['name']
+    year, current_round = int(rows['year'].iloc[0]), int(rows['round'].iloc[0])
+    title = "Drivers' Championship" if kind == 'drivers' else "Constructors' Championship"
+
+    clinch = title_clinch(year, data, kind)
+    if clinch is not None and clinch['round'] <= current_round:
+        race_name = data['races'].set_index('raceId').loc[clinch['raceId'], 'name']
+        when = "at this race" if clinch['round'] == current_round else f"at round {clinch['round']}, {race_name}"
+        st.success(f"🏆 {names.get(clinch[key], 'Unknown')} clinched the {year} {title} {when}")
+        return
+
+    contenders = rows[rows['in_contention']]
+    st.markdown(f"**{title} Contention:** {len(contenders)} still mathematically in contention")
+    st.dataframe(
+        pd.DataFrame({
+            'Pos': contenders['position'].astype(int),
+            'Driver' if kind == 'drivers' else 'Constructor': contenders[key].map(names).fillna('Unknown'),
+            'Points': contenders['points'].map(lambda points: f"{points:g}"),
+            'Gap': contenders['gap'].map(lambda gap: f"-{gap:g}" if gap else "-"),
+            'Max Points': contenders['max_points'].map(lambda points: f"{points:g}"),
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+    if clinch is not None:
+        st.caption(f"Title clinched later, at round {clinch['round']}")
+
+def display_driver_ratings(race_id, data, standings_grid):
+    """Display the Elo-style ratings of this season's drivers after this race and their progression"""
+    try:
+        driver_ids = [row['driverId'] for row in standings_grid]
+        ratings = ratings_after(race_id, data)
+        ratings = ratings[ratings['driverId'].isin(driver_ids)].reset_index(drop=True)
+        if ratings.empty:
+            st.info("Driver ratings not available for this race")
+            return
+
+        drivers = data['drivers'].set_index('driverId')
+        driver_names = drivers['forename'] + ' ' + drivers['surname']
+        st.dataframe(
+            pd.DataFrame({
+                'Rank': ratings.index + 1,
+                'Driver': ratings['driverId'].map(driver_names),
+                'Rating': ratings['rating'].round().astype(int),
+                'This Race': ratings['change'].map(lambda change: '-' if pd.isna(change) else f"{change:+.1f}"),
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+
+        race = data['races'].set_index('raceId').loc[race_id]
+        progression = season_ratings(int(race['year']), data)
+        progression = progression[(progression['round'] <= race['round']) &
+                                  progression['driverId'].isin(ratings['driverId'].head(10))]
+        progression = progression.assign(driver_name=progression['driverId'].map(driver_names))
+        fig_ratings = px.line(
+            progression,
+            x='round',
+            y='rating',
+            color='driver_name',
+            title="Rating Progression (Top 10)",
+            labels={'round': 'Race Round', 'rating': 'Rating', 'driver_name': 'Driver'},
+            markers=True
+        )
+        try:
+            from graph_styling import apply_team_colors_to_existing_chart
+            fig_ratings = apply_team_colors_to_existing_chart(fig_ratings, progression, 'driver_name', data, race_id)
+        except:
+            pass
+        fig_ratings.update_layout(height=500, xaxis_title="Race Round", yaxis_title="Rating", font=dict(size=14))
+        st.plotly_chart(fig_ratings, use_container_width=True)
+        st.caption("Elo-style rating over every race since 1950: each classified finisher is scored against every "
+                   "other, winning against those behind. Retirements are not rated.")
+    except Exception as e:
+        st.error(f"Error generating driver ratings: {e}")
+
+def display_driver_standings_after_race(race_id, data, artifacts=None):
     """Display driver championship standings after this race"""
     st.markdown("### Driver Championship Standings")
     
     try:
-        # Use pre-loaded driver standings if available, otherwise load from file
-        if 'driver_standings' in data:
-            standings_data = data['driver_standings']
-        else:
-            # Fallback to loading from file with special handling for NA values
-            standings_data = pd.read_csv('f1_data/driver_standings.csv', na_values=['\\N', 'N'])
-            # Convert problematic columns to appropriate types
-            for col in ['position', 'points', 'wins']:
-                if col in standings_data.columns:
-                    standings_data[col] = pd.to_numeric(standings_data[col], errors='coerce')
-        
-        race_standings = standings_data[standings_data['raceId'] == race_id]
+        if artifacts is None:
+            artifacts = get_race_artifacts(race_id, data)
         
-        # Check if we need to add sprint points
-        has_sprint = race_has_sprint(race_id)
-        if has_sprint:
-            try:
-                # Load sprint results
-                sprint_data = pd.read_csv('f1_data/sprint_results.csv')
-                sprint_results = sprint_data[sprint_data['raceId'] == race_id]
-                
-                if not sprint_results.empty:
-                    # Create a mapping of driver points from sprint
-                    sprint_points = {}
-                    for _, row in sprint_results.iterrows():
-                        if pd.notna(row['points']) and pd.notna(row['driverId']):
-                            try:
-                                driver_id = int(row['driverId'])
-                                points = float(row['points'])
-                                sprint_points[driver_id] = points
-                            except:
-                                pass
-                    
-                    # Add sprint points to driver standings
-                    for i, row in race_standings.iterrows():
-                        driver_id = int(row['driverId'])
-                        if driver_id in sprint_points:
-                            race_standings.at[i, 'points'] += sprint_points[driver_id]
-            except Exception as e:
-                st.warning(f"Could not add sprint points to driver standings: {e}")
+        # Standings records with sprint points and podium counts, ordered by position
+        standings_grid = artifacts['driver_standings']
         
-        if not race_standings.empty:
-            # Merge with driver and constructor data
-            standings_display = race_standings.merge(data['drivers'], on='driverId', how='left')
-            
-            # Get constructor information for each driver at this race
-            race_results = data['results'][data['results']['raceId'] == race_id]
-            driver_constructors = race_results[['driverId', 'constructorId']].drop_duplicates()
-            standings_display = standings_display.merge(driver_constructors, on='driverId', how='left')
-            standings_display = standings_display.merge(data['constructors'], on='constructorId', how='left')
-            
-            # Calculate podium finishes for each driver
-            try:
-                # Get all race results up to this race to count podiums
-                all_results = data['results'].copy()
-                current_race = data['races'][data['races']['raceId'] == race_id]
-                if not current_race.empty:
-                    current_season = current_race['year'].iloc[0]
-                    current_round = current_race['round'].iloc[0]
-                    
-                    # Get all races in current season up to this race
-                    season_races = data['races'][(data['races']['year'] == current_season) & 
-                                               (data['races']['round'] <= current_round)]
-                    season_race_ids = season_races['raceId'].tolist()
-                    
-                    # Ensure position column is numeric and filter for podiums (2nd and 3rd only)
-                    all_results['position'] = pd.to_numeric(all_results['position'], errors='coerce')
-                    
-                    # Count podiums (positions 2, 3 only - wins are counted separately) for each driver
-                    podium_results = all_results[
-                        (all_results['raceId'].isin(season_race_ids)) & 
-                        (all_results['position'].isin([2, 3])) &
-                        (all_results['position'].notna())
-                    ]
-                    
-                    podium_counts = podium_results.groupby('driverId').size().to_dict()
-                else:
-                    podium_counts = {}
-            except Exception as e:
-                st.error(f"Could not calculate podium finishes: {e}")
-                podium_counts = {}
-            
-            # Prepare data for display
-            standings_grid = []
-            for _, row in standings_display.iterrows():
-                try:
-                    # Format driver name with number (use number from drivers table)
-                    driver_number = ""
-                    if 'number' in row.index and pd.notna(row['number']):
-                        # Convert to int safely
-                        try:
-                            driver_number = f"#{int(float(row['number']))}"
-                        except (ValueError, TypeError):
-                            # If conversion fails, try to use it as is
-                            if str(row['number']) != 'N' and str(row['number']) != '\\N':
-                                driver_number = f"#{row['number']}"
-                    
-                    driver_name = f"{row['forename']} {row['surname']}" if pd.notna(row['forename']) and pd.notna(row['surname']) else 'N/A'
-                    formatted_driver = f"{driver_number} {driver_name}".strip()
-                    
-                    # Get constructor name
-                    constructor_name = get_constructor_name(row, data)
-                    
-                    # Convert position to int safely
-                    position = ''
-                    if pd.notna(row['position']):
-                        try:
-                            position = int(float(row['position']))
-                        except (ValueError, TypeError):
-                            position = row['position']
-                    
-                    # Convert points to int safely
-                    points = 0
-                    if pd.notna(row['points']):
-                        try:
-                            points = int(float(row['points']))
-                        except (ValueError, TypeError):
-                            points = float(row['points']) if isinstance(row['points'], (int, float)) else 0
-                    
-                    # Convert wins to int safely
-                    wins = 0
-                    if pd.notna(row['wins']):
-                        try:
-                            wins = int(float(row['wins']))
-                        except (ValueError, TypeError):
-                            wins = float(row['wins']) if isinstance(row['wins'], (int, float)) else 0
-                    
-                    # Get podium count for this driver
-                    driver_id = int(row['driverId']) if pd.notna(row['driverId']) else 0
-                    podiums = podium_counts.get(driver_id, 0)
-                    
-                    standings_grid.append({
-                        'POS.': position,
-                        'DRIVER': formatted_driver,
-                        'TEAM': constructor_name,
-                        'POINTS': points,
-                        'WINS': wins,
-                        'PODIUMS': podiums
-                    })
-                except Exception as row_error:
-                    # Skip problematic rows but log the error
-                    st.warning(f"Skipped a driver due to data issue: {row_error}")
-                    continue
-            
-            # Sort by position, handling non-numeric positions gracefully
-            standings_grid = sorted(standings_grid, key=lambda x: (
-                999 if x['POS.'] == '' or not isinstance(x['POS.'], int) else x['POS.']
-            ))
-            
+        if standings_grid:
             # Create driver standings cards
-            create_driver_standings_cards(standings_grid, standings_display, data, race_id)
+            create_driver_standings_cards(standings_grid, None, data, race_id)
+            display_title_contention(race_id, data, 'drivers')
             
             # Add driver statistics with segmented controls
             st.write("")
             st.markdown("### Driver Championship Analysis")
             
             # Create tabs for different analysis views
-            driver_analysis_tabs = st.tabs(["Points Progression", "Race Wins", "Podium Finishes", "Points Distribution"])
+            driver_analysis_tabs = st.tabs(["Points Progression", "Race Wins", "Podium Finishes", "Points Distribution", "Driver Ratings"])
             
             with driver_analysis_tabs[0]:
                 # Points Progression
@@ -2223,130 +2354,32 @@ def display_driver_standings_after_race(race_id, data):
                         st.info("No driver data available")
                 except Exception as e:
                     st.error(f"Error generating points distribution: {e}")
+
+            with driver_analysis_tabs[4]:
+                display_driver_ratings(race_id, data, standings_grid)
         else:
             st.info("Driver standings not available for this race")
     except Exception as e:
         st.error(f"Error loading driver standings: {e}")
         st.info("Driver standings not available for this race")
 
-def display_constructor_standings_after_race(race_id, data):
+def display_constructor_standings_after_race(race_id, data, artifacts=None):
     """Display constructor championship standings after this race"""
     st.markdown("### Constructor Championship Standings")
     
     try:
-        if 'constructor_standings' in data:
-            standings_data = data['constructor_standings']
-        else:
-            standings_data = pd.read_csv('f1_data/constructor_standings.csv', na_values=['\\N', 'N'])
-            for col in ['position', 'points', 'wins']:
-                if col in standings_data.columns:
-                    standings_data[col] = pd.to_numeric(standings_data[col], errors='coerce')
+        standings_data = data['constructor_standings']
         
-        race_standings = standings_data[standings_data['raceId'] == race_id]
+        if artifacts is None:
+            artifacts = get_race_artifacts(race_id, data)
         
-        has_sprint = race_has_sprint(race_id)
-        if has_sprint:
-            try:
-                sprint_data = pd.read_csv('f1_data/sprint_results.csv')
-                sprint_results = sprint_data[sprint_data['raceId'] == race_id]
-                
-                if not sprint_results.empty:
-                    sprint_points = {}
-                    for _, row in sprint_results.iterrows():
-                        if pd.notna(row['points']) and pd.notna(row['constructorId']):
-                            try:
-                                constructor_id = int(row['constructorId'])
-                                points = float(row['points'])
-                                sprint_points[constructor_id] = sprint_points.get(constructor_id, 0) + points
-                            except:
-                                pass
-                    
-                    for i, row in race_standings.iterrows():
-                        constructor_id = int(row['constructorId'])
-                        if constructor_id in sprint_points:
-                            race_standings.at[i, 'points'] += sprint_points[constructor_id]
-            except Exception as e:
-                st.warning(f"Could not add sprint points to constructor standings: {e}")
+        # Standings records with sprint points and podium counts, ordered by position
+        standings_grid = artifacts['constructor_standings']
         
-        if not race_standings.empty:
-            standings_display = race_standings.merge(data['constructors'], on='constructorId', how='left')
-            
-            # Calculate podium finishes for each constructor
-            try:
-                # Get all race results up to this race to count podiums
-                all_results = data['results'].copy()
-                current_race = data['races'][data['races']['raceId'] == race_id]
-                if not current_race.empty:
-                    current_season = current_race['year'].iloc[0]
-                    current_round = current_race['round'].iloc[0]
-                    
-                    # Get all races in current season up to this race
-                    season_races = data['races'][(data['races']['year'] == current_season) & 
-                                               (data['races']['round'] <= current_round)]
-                    season_race_ids = season_races['raceId'].tolist()
-                    
-                    # Ensure position column is numeric and filter for podiums (2nd and 3rd only)
-                    all_results['position'] = pd.to_numeric(all_results['position'], errors='coerce')
-                    
-                    # Count podiums (positions 2, 3 only - wins are counted separately) for each constructor
-                    podium_results = all_results[
-                        (all_results['raceId'].isin(season_race_ids)) & 
-                        (all_results['position'].isin([2, 3])) &
-                        (all_results['position'].notna())
-                    ]
-                    podium_counts = podium_results.groupby('constructorId').size().to_dict()
-                else:
-                    podium_counts = {}
-            except Exception as e:
-                st.warning(f"Could not calculate constructor podium finishes: {e}")
-                podium_counts = {}
-            
-            standings_grid = []
-
-            for _, row in standings_display.iterrows():
-                try:
-                    position = ''
-                    if pd.notna(row['position']):
-                        try:
-                            position = int(float(row['position']))
-                        except:
-                            position = row['position']
-                    
-                    points = 0
-                    if pd.notna(row['points']):
-                        try:
-                            points = int(float(row['points']))
-                        except:
-                            points = float(row['points']) if isinstance(row['points'], (int, float)) else 0
-                    
-                    wins = 0
-                    if pd.notna(row['wins']):
-                        try:
-                            wins = int(float(row['wins']))
-                        except:
-                            wins = float(row['wins']) if isinstance(row['wins'], (int, float)) else 0
-                    
-                    # Get podium count for this constructor
-                    constructor_id = int(row['constructorId']) if pd.notna(row['constructorId']) else 0
-                    podiums = podium_counts.get(constructor_id, 0)
-                    
-                    standings_grid.append({
-                        'POS.': position,
-                        'CONSTRUCTOR': row['name'] if pd.notna(row['name']) else 'N/A',
-                        'POINTS': points,
-                        'WINS': wins,
-                        'PODIUMS': podiums
-                    })
-                except Exception as row_error:
-                    st.warning(f"Skipped a constructor due to data issue: {row_error}")
-                    continue
-            
-            standings_grid = sorted(standings_grid, key=lambda x: (
-                999 if x['POS.'] == '' or not isinstance(x['POS.'], int) else x['POS.']
-            ))
-            
+        if standings_grid:
             # Create constructor standings cards
-            create_constructor_standings_cards(standings_grid, standings_display, data, race_id)
+            create_constructor_standings_cards(standings_grid, None, data, race_id)
+            display_title_contention(race_id, data, 'constructors')
             
             st.write("")
             st.markdown("### Constructor Championship Analysis")
@@ -0,0 +1,149 @@
+"""Elo-style driver ratings for the F1 Dashboard
+
+Every race is scored as pairwise matchups between its classified finishers:
+a driver beats everyone classified behind them. Ratings are updated race by
+race in chronological order with one vectorized n x n expectation matrix per
+race, and the rating of every finisher after every race is checkpointed.
+The state lives in the data dictionary under '_ratings'; when a refresh
+changes some races, ratings are restored from the checkpoints just before
+the earliest changed race and only the races from there on are replayed, so
+ingesting a new race is a single step. Like race_artifacts, this module must
+not import streamlit.
+"""
+
+import numpy as np
+import pandas as pd
+
+INITIAL_RATING = 1500.0
+# Rating points at stake per race, spread over a driver's matchups
+K_FACTOR = 32.0
+
+# Tables whose change recomputes every rating (race order)
+FULL_REBUILD_SOURCES = ['races']
+
+HISTORY_COLUMNS = ['order', 'raceId', 'driverId', 'position', 'rating', 'change']
+
+def race_order(data):
+    """raceId -> chronological index of every race"""
+    races = data['races'].sort_values(['year', 'round', 'raceId'])
+    return pd.Series(np.arange(len(races)), index=races['raceId'].to_numpy())
+
+def finishers(data, race_ids=None):
+    """Classified finishers of every race (or the given raceIds), in race order and finishing position"""
+    results = data['results']
+    if race_ids is not None:
+        results = results[results['raceId'].isin(race_ids)]
+    position = pd.to_numeric(results['position'], errors='coerce')
+    classified = results[position.notna()]
+    entries = pd.DataFrame({
+        'order': race_order(data).reindex(classified['raceId']).to_numpy(),
+        'raceId': classified['raceId'].to_numpy(),
+        'driverId': classified['driverId'].to_numpy(),
+        'position': position[position.notna()].to_numpy(),
+    }).dropna(subset=['order'])
+    entries['order'] = entries['order'].astype(int)
+    return entries.sort_values(['order', 'position']).drop_duplicates(['raceId', 'driverId']).reset_index(drop=True)
+
+def rating_step(ratings, positions):
+    """New ratings of one race's finishers from their ratings and finishing positions
+
+    Each finisher plays every other: the actual score against a rival is 1
+    for finishing ahead, 0.5 for a tie and 0 behind, and the expectation is
+    the logistic Elo curve of the rating difference.
+    """
+    n = len(ratings)
+    if n < 2:
+        return ratings.copy()
+    expected = 1.0 / (1.0 + 10.0 ** ((ratings[None, :] - ratings[:, None]) / 400.0))
+    actual = (positions[:, None] < positions[None, :]) + 0.5 * (positions[:, None] == positions[None, :])
+    np.fill_diagonal(expected, 0.0)
+    np.fill_diagonal(actual, 0.0)
+    return ratings + K_FACTOR / (n - 1) * (actual - expected).sum(axis=1)
+
+def _replay(entries, start_ratings):
+    """Run the races of a finisher table in order from the given ratings (driverId -> rating)
+
+    Returns:
+        DataFrame: the finisher rows with rating after the race and change
+    """
+    driver_ids, drivers = np.unique(entries['driverId'].to_numpy(), return_inverse=True)
+    ratings = pd.Series(start_ratings, dtype=float).reindex(driver_ids).fillna(INITIAL_RATING).to_numpy()
+    positions = entries['position'].to_numpy(dtype=float)
+    orders = entries['order'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, orders[1:] != orders[:-1]]) if len(orders) else np.array([], dtype=int)
+    ends = np.r_[starts[1:], len(orders)]
+
+    after = np.empty(len(entries))
+    change = np.empty(len(entries))
+    for start, end in zip(starts, ends):
+        race_drivers = drivers[start:end]
+        before = ratings[race_drivers]
+        updated = rating_step(before, positions[start:end])
+        ratings[race_drivers] = updated
+        after[start:end] = updated
+        change[start:end] = updated - before
+    return entries.assign(rating=after, change=change)[HISTORY_COLUMNS]
+
+def _build(history):
+    """Ratings state stored in the data dictionary"""
+    latest = history.drop_duplicates('driverId', keep='last').set_index('driverId')['rating']
+    return {'history': history, 'latest': latest, 'orders': history['order'].to_numpy()}
+
+def driver_ratings(data):
+    """Ratings state of a snapshot, computed over the whole history on first access"""
+    if '_ratings' not in data:
+        data['_ratings'] = _build(_replay(finishers(data), {}))
+    return data['_ratings']
+
+def ratings_before(history, order):
+    """driverId -> latest rating of every driver before a race order index (the checkpoint)"""
+    earlier = history[history['order'].to_numpy() < order]
+    return earlier.drop_duplicates('driverId', keep='last').set_index('driverId')['rating']
+
+def update_ratings(data, changed, previous_career):
+    """Replay only the races from the earliest one that changed in a snapshot refresh
+
+    previous_career is the career state before update_career_stats ran; the
+    raceIds it found changed decide where the replay starts. A changed races
+    table, or no career state to compare against, recomputes everything.
+    """
+    current = data.get('_ratings')
+    if current is None or not set(changed) & (set(FULL_REBUILD_SOURCES) | {'results'}):
+        return current
+    career = data.get('_career')
+    if set(changed) & set(FULL_REBUILD_SOURCES) or career is None or career is previous_career:
+        data['_ratings'] = _build(_replay(finishers(data), {}))
+        return data['_ratings']
+    if not career['changed_races']:
+        return current
+
+    order = race_order(data)
+    first = int(order.reindex(list(career['changed_races'])).min())
+    history = current['history']
+    kept = history[history['order'].to_numpy() < first]
+    replayed = _replay(finishers(data, order.index[order.to_numpy() >= first]), ratings_before(history, first))
+    data['_ratings'] = _build(pd.concat([kept, replayed], ignore_index=True))
+    return data['_ratings']
+
+def ratings_after(race_id, data):
+    """Latest rating of every rated driver after a race, highest first, with the race's changes
+
+    Returns:
+        DataFrame: driverId, rating, change (NaN for drivers not classified in the race)
+    """
+    order = race_order(data).get(race_id)
+    if order is None:
+        return pd.DataFrame(columns=['driverId', 'rating', 'change'])
+    state = driver_ratings(data)
+    history = state['history'].iloc[:np.searchsorted(state['orders'], order, side='right')]
+    latest = history.drop_duplicates('driverId', keep='last')
+    change = latest['change'].where(latest['order'] == order)
+    table = pd.DataFrame({'driverId': latest['driverId'].to_numpy(), 'rating': latest['rating'].to_numpy(),
+                          'change': change.to_numpy()})
+    return table.sort_values('rating', ascending=False).reset_index(drop=True)
+
+def season_ratings(year, data):
+    """Rating of every finisher after each race of a season, with the round"""
+    races = data['races'][data['races']['year'] == year][['raceId', 'round']]
+    history = driver_ratings(data)['history']
+    return history[history['raceId'].isin(races['raceId'])].merge(races, on='raceId')
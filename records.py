@@ -0,0 +1,146 @@
+"""All-time records for the F1 Dashboard
+
+Ranked leaderboards for most wins, most poles, most consecutive wins,
+youngest winner, most points in a season and biggest winning margin. Career
+counts come from career_stats; the per-race values (winner age, margin) and
+per-driver win streaks are computed in vectorized passes and kept in the
+data dictionary under '_records', so a refresh only recomputes the races and
+drivers that changed. Like race_artifacts, this module must not import
+streamlit.
+"""
+
+import numpy as np
+import pandas as pd
+
+from career_stats import NON_STARTERS, career_stats
+
+# Rows kept per leaderboard (more on ties)
+RECORD_ROWS = 10
+
+# Leaderboards: name -> (title, value label)
+RECORDS = {
+    'most_wins': ("Most Wins", "Wins"),
+    'most_poles': ("Most Pole Positions", "Poles"),
+    'consecutive_wins': ("Most Consecutive Wins", "Wins in a Row"),
+    'youngest_winner': ("Youngest Race Winner", "Age (years)"),
+    'season_points': ("Most Points in a Season", "Points"),
+    'winning_margin': ("Biggest Winning Margin", "Margin (s)"),
+}
+
+# Tables whose change recomputes every record (dates of birth, race dates)
+FULL_REBUILD_SOURCES = ['drivers', 'races']
+
+DAYS_PER_YEAR = 365.25
+
+def race_winners(data, race_ids=None):
+    """Winner, winner's age and winning margin of every race, or only of the given raceIds
+
+    The margin is the race time gap to second place in seconds, NaN when the
+    runner-up has no race time (lapped or not classified).
+    """
+    results = data['results']
+    if race_ids is not None:
+        results = results[results['raceId'].isin(race_ids)]
+    times = pd.to_numeric(results['milliseconds'], errors='coerce')
+    first = results['positionOrder'] == 1
+    winners = pd.DataFrame({'raceId': results.loc[first, 'raceId'], 'driverId': results.loc[first, 'driverId'],
+                            'time': times[first]}).drop_duplicates('raceId').set_index('raceId')
+    runner_up = times[results['positionOrder'] == 2].groupby(results['raceId']).first()
+    winners['margin'] = (runner_up.reindex(winners.index) - winners['time']) / 1000.0
+
+    races = data['races'].set_index('raceId')
+    race_dates = pd.to_datetime(races['date'].reindex(winners.index), errors='coerce')
+    dob = pd.to_datetime(data['drivers'].set_index('driverId')['dob'], errors='coerce')
+    winners['age'] = (race_dates - dob.reindex(winners['driverId']).to_numpy()).dt.days / DAYS_PER_YEAR
+    winners['year'] = races['year'].reindex(winners.index)
+    return winners.drop(columns='time')
+
+def win_streaks(data, driver_ids=None):
+    """Longest run of consecutive race wins of every driver, or only of the given driverIds
+
+    Runs are counted over the races a driver started, in date order.
+    """
+    results = data['results']
+    if driver_ids is not None:
+        results = results[results['driverId'].isin(driver_ids)]
+    results = results[~results['positionText'].isin(NON_STARTERS)]
+    dates = data['races'].set_index('raceId')['date']
+    entries = pd.DataFrame({
+        'driverId': results['driverId'].to_numpy(),
+        'raceId': results['raceId'].to_numpy(),
+        'date': dates.reindex(results['raceId']).to_numpy(),
+        'win': (pd.to_numeric(results['position'], errors='coerce') == 1).to_numpy(),
+    }).sort_values(['driverId', 'date'])
+
+    driver = entries['driverId'].to_numpy()
+    win = entries['win'].to_numpy()
+    new_run = np.ones(len(entries), dtype=bool)
+    new_run[1:] = (driver[1:] != driver[:-1]) | (win[1:] != win[:-1])
+    entries['run'] = np.cumsum(new_run)
+    runs = entries[entries['win']].groupby('run').agg(
+        driverId=('driverId', 'first'), wins=('raceId', 'size'),
+        from_race=('raceId', 'first'), to_race=('raceId', 'last'))
+    return runs.sort_values('wins', ascending=False).drop_duplicates('driverId').set_index('driverId')
+
+def _ranked(table, column, ascending=False):
+    """Top RECORD_ROWS rows of a table by one column, ties sharing a rank"""
+    table = table.dropna(subset=[column])
+    ranks = table[column].rank(method='min', ascending=ascending)
+    top = table.assign(rank=ranks.astype(int))
+    top = top[top['rank'] <= RECORD_ROWS].sort_index()
+    return top.sort_values('rank', kind='stable').reset_index()
+
+def leaderboards(data, winners, streaks):
+    """Every ranked leaderboard from the career aggregates, race winners and win streaks"""
+    careers = career_stats(data)
+    drivers, seasons = careers['careers']['drivers'], careers['seasons']['drivers']
+    season_points = seasons['championship_points'].fillna(seasons['points']).rename('points')
+    return {
+        'most_wins': _ranked(drivers[['wins', 'starts']], 'wins'),
+        'most_poles': _ranked(drivers[['poles', 'starts']], 'poles'),
+        'consecutive_wins': _ranked(streaks, 'wins'),
+        'youngest_winner': _ranked(winners.sort_values('age').drop_duplicates('driverId'), 'age', ascending=True),
+        'season_points': _ranked(season_points.reset_index(level='year'), 'points'),
+        'winning_margin': _ranked(winners, 'margin'),
+    }
+
+def _build(data, winners, streaks):
+    """Records state stored in the data dictionary; results is kept to find the drivers of changed races"""
+    return {'winners': winners, 'streaks': streaks, 'results': data['results'],
+            'tables': leaderboards(data, winners, streaks)}
+
+def record_tables(data):
+    """Ranked record leaderboards of a snapshot, built in full on first access"""
+    if '_records' not in data:
+        data['_records'] = _build(data, race_winners(data), win_streaks(data))
+    return data['_records']['tables']
+
+def update_records(data, changed, previous_career):
+    """Recompute only the races and drivers affected by a snapshot refresh
+
+    previous_career is the career state before update_career_stats ran; the
+    raceIds it found changed decide which winners and win streaks are
+    recomputed. A changed drivers or races table recomputes everything.
+    """
+    current = data.get('_records')
+    if current is None:
+        return None
+    if set(changed) & set(FULL_REBUILD_SOURCES):
+        data['_records'] = _build(data, race_winners(data), win_streaks(data))
+        return data['_records']
+    career = data.get('_career')
+    if career is previous_career or not career['changed_races']:
+        return current
+
+    race_ids = list(career['changed_races'])
+    winners = pd.concat([current['winners'].drop(index=race_ids, errors='ignore'),
+                         race_winners(data, race_ids)]).sort_index()
+
+    # A driver's streaks only change when one of their races did, before or after the refresh
+    driver_ids = set()
+    for results in (current['results'], data['results']):
+        driver_ids |= set(results.loc[results['raceId'].isin(race_ids), 'driverId'])
+    streaks = pd.concat([current['streaks'].drop(index=list(driver_ids), errors='ignore'),
+                         win_streaks(data, driver_ids)])
+    data['_records'] = _build(data, winners, streaks)
+    return data['_records']
@@ -0,0 +1,53 @@
+"""All-time records page display functions"""
+
+import streamlit as st
+import pandas as pd
+
+from records import RECORDS, record_tables
+
+def display_records_page(data):
+    """Display the ranked all-time record leaderboards"""
+    st.markdown("# 🏆 All-Time Records")
+
+    try:
+        tables = record_tables(data)
+        drivers = data['drivers'].set_index('driverId')
+        driver_names = drivers['forename'] + ' ' + drivers['surname']
+        races = data['races'].set_index('raceId')
+        race_names = races['year'].astype(str) + ' ' + races['name']
+
+        tabs = st.tabs([title for title, _ in RECORDS.values()])
+        for tab, (name, (title, value_label)) in zip(tabs, RECORDS.items()):
+            with tab:
+                table = tables[name]
+                if table.empty:
+                    st.info("No results recorded for this record")
+                    continue
+                display = pd.DataFrame({'Rank': table['rank'], 'Driver': table['driverId'].map(driver_names)})
+                if name == 'most_wins':
+                    display[value_label] = table['wins']
+                    display['Starts'] = table['starts']
+                    display['Win Rate'] = (table['wins'] / table['starts']).map(lambda v: f"{v:.1%}")
+                elif name == 'most_poles':
+                    display[value_label] = table['poles']
+                    display['Starts'] = table['starts']
+                elif name == 'consecutive_wins':
+                    display[value_label] = table['wins']
+                    display['From'] = table['from_race'].map(race_names)
+                    display['To'] = table['to_race'].map(race_names)
+                elif name == 'youngest_winner':
+                    display[value_label] = table['age'].round(2)
+                    display['Race'] = table['raceId'].map(race_names)
+                elif name == 'season_points':
+                    display['Season'] = table['year']
+                    display[value_label] = table['points']
+                elif name == 'winning_margin':
+                    display[value_label] = table['margin'].round(3)
+                    display['Race'] = table['raceId'].map(race_names)
+                st.dataframe(display.fillna('-'), use_container_width=True, hide_index=True)
+
+        st.caption("Season points are championship points where standings exist, race points otherwise. "
+                   "Winning margins only count runners-up on the lead lap.")
+    except Exception as e:
+        st.error(f"Error loading records: {e}")
+        st.info("Records not available")
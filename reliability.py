@@ -0,0 +1,131 @@
+"""Result status classification and reliability aggregates for the F1 Dashboard
+
+The ~140 free-text statuses of status.csv are classified once, when the
+status table is loaded, into a handful of categories (finished, lapped,
+mechanical, accident, disqualified, did not start, other). Results and
+sprint results carry the category as a categorical 'status_category' column
+mapped from statusId in one vectorized lookup, so no view matches status
+strings per row. Retirement counts per season and constructor are
+scatter-added into one dense table kept in the data dictionary under
+'_reliability'. Like race_artifacts, this module must not import streamlit.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+STATUS_CATEGORIES = ['Finished', 'Lapped', 'Mechanical', 'Accident', 'Disqualified', 'Did Not Start', 'Other']
+# Categories that count as retirements after taking the start
+DNF_CATEGORIES = ['Mechanical', 'Accident', 'Other']
+
+# Statuses that are not mechanical failures; everything else unlisted is mechanical
+STATUS_RULES = {
+    'Finished': ['Finished'],
+    # Crashes and the damage they leave, wings included
+    'Accident': ['Accident', 'Collision', 'Collision damage', 'Spun off', 'Fatal accident', 'Damage', 'Debris',
+                 'Front wing', 'Rear wing', 'Broken wing'],
+    'Disqualified': ['Disqualified', 'Excluded', 'Underweight'],
+    'Did Not Start': ['Did not qualify', 'Did not prequalify', '107% Rule', 'Withdrew'],
+    # Tyre failures, driver and team errors, driver health and unspecified retirements
+    'Other': ['Retired', 'Not classified', 'Not restarted', 'Safety', 'Safety concerns', 'Physical', 'Injured',
+              'Injury', 'Eye injury', 'Illness', 'Driver unwell',
+              'Tyre', 'Puncture', 'Tyre puncture',
+              'Out of fuel', 'Refuelling', 'Fuel rig', 'Wheel nut', 'Stalled', 'Handling',
+              'Safety belt', 'Seat', 'Driver Seat'],
+}
+LAPPED_STATUS = re.compile(r'^\+\d+ Laps?$')
+
+# Tables that carry a statusId
+CLASSIFIED_TABLES = ['results', 'sprint_results']
+
+RELIABILITY_COLUMNS = ['year', 'constructorId', 'entries', 'starts'] + STATUS_CATEGORIES
+
+def classify_status(status):
+    """Category of one status string"""
+    if LAPPED_STATUS.match(status):
+        return 'Lapped'
+    for category, statuses in STATUS_RULES.items():
+        if status in statuses:
+            return category
+    return 'Mechanical'
+
+def classify_statuses(status):
+    """The status table with a categorical 'category' column"""
+    categories = [classify_status(str(value)) for value in status['status']]
+    return status.assign(category=pd.Categorical(categories, categories=STATUS_CATEGORIES))
+
+def _status_categories(table, status):
+    """Categorical status category of every row of a table with a statusId (Other when unknown)"""
+    codes = pd.Series(status['category'].cat.codes.to_numpy(), index=status['statusId'].to_numpy())
+    codes = codes[~codes.index.duplicated()]
+    other = STATUS_CATEGORIES.index('Other')
+    row_codes = codes.reindex(table['statusId'].to_numpy()).fillna(other).to_numpy(dtype=np.int8)
+    return pd.Categorical.from_codes(row_codes, categories=STATUS_CATEGORIES)
+
+def classify_tables(data, changed):
+    """Classify the status table and add status_category to the tables with a statusId
+
+    Tables that are shared with a previous snapshot are replaced, not
+    modified. Returns the keys of the tables rewritten besides the changed ones.
+    """
+    if 'status' not in data:
+        return set()
+    if 'status' in changed or 'category' not in data['status']:
+        data['status'] = classify_statuses(data['status'])
+    rewritten = set()
+    for key in CLASSIFIED_TABLES:
+        if key in data and ('status' in changed or key in changed or 'status_category' not in data[key]):
+            data[key] = data[key].assign(status_category=_status_categories(data[key], data['status']))
+            if key not in changed:
+                rewritten.add(key)
+    return rewritten
+
+def build_reliability(data):
+    """Entries, starts and finishes by status category of every constructor in every season"""
+    results = data['results']
+    if 'status_category' not in results:
+        results = results.assign(status_category=_status_categories(results, classify_statuses(data['status'])))
+    years = data['races'].set_index('raceId')['year'].reindex(results['raceId']).to_numpy()
+    known = ~np.isnan(years)
+    pairs, entries = np.unique(np.column_stack([years[known].astype(int), results['constructorId'].to_numpy()[known]]),
+                               axis=0, return_inverse=True)
+    counts = np.zeros((len(pairs), len(STATUS_CATEGORIES)), dtype=int)
+    np.add.at(counts, (entries.ravel(), results['status_category'].cat.codes.to_numpy()[known]), 1)
+
+    table = pd.DataFrame(counts, columns=STATUS_CATEGORIES)
+    table.insert(0, 'year', pairs[:, 0])
+    table.insert(1, 'constructorId', pairs[:, 1])
+    table.insert(2, 'entries', counts.sum(axis=1))
+    table.insert(3, 'starts', table['entries'] - table['Did Not Start'])
+    return table[RELIABILITY_COLUMNS]
+
+def reliability_table(data):
+    """Reliability counts of a snapshot, built on first access"""
+    if '_reliability' not in data:
+        data['_reliability'] = build_reliability(data)
+    return data['_reliability']
+
+def with_rates(table):
+    """Add finish, mechanical and accident rates (share of starts) and the DNF count"""
+    starts = table['starts'].where(table['starts'] > 0)
+    return table.assign(
+        dnfs=table[DNF_CATEGORIES].sum(axis=1),
+        finish_rate=(table['Finished'] + table['Lapped']) / starts,
+        mechanical_rate=table['Mechanical'] / starts,
+        accident_rate=table['Accident'] / starts,
+    )
+
+def season_reliability(year, data):
+    """Reliability of every constructor in a season, most reliable first"""
+    table = reliability_table(data)
+    season = with_rates(table[table['year'] == year])
+    return season.sort_values(['mechanical_rate', 'starts'], ascending=[True, False]).reset_index(drop=True)
+
+def reliability_by_season(data, constructor_id=None):
+    """Reliability per season over the whole grid, or of one constructor"""
+    table = reliability_table(data)
+    if constructor_id is not None:
+        table = table[table['constructorId'] == constructor_id]
+    counts = table.groupby('year')[['entries', 'starts'] + STATUS_CATEGORIES].sum()
+    return with_rates(counts).reset_index()
@@ -0,0 +1,98 @@
+"""Reliability display functions"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from race_artifacts import race_rows
+from reliability import STATUS_CATEGORIES, DNF_CATEGORIES, season_reliability, reliability_by_season
+
+# Category colors of the stacked reliability charts
+CATEGORY_COLORS = {
+    'Finished': '#2E7D32',
+    'Lapped': '#81C784',
+    'Mechanical': '#E65100',
+    'Accident': '#C62828',
+    'Disqualified': '#6A1B9A',
+    'Did Not Start': '#9E9E9E',
+    'Other': '#FBC02D',
+}
+
+def _percent(rate):
+    """Rate as a percentage string, '-' without starts"""
+    return '-' if pd.isna(rate) else f"{rate * 100:.1f}%"
+
+def display_reliability(race_id, data):
+    """Display the retirements of this race and the reliability of every constructor this season"""
+    st.markdown("### Reliability")
+
+    try:
+        race = data['races'].set_index('raceId').loc[race_id]
+        year = int(race['year'])
+
+        race_results = race_rows(data, 'results', race_id)
+        if 'status_category' in race_results and not race_results.empty:
+            race_counts = race_results['status_category'].value_counts()
+            cols = st.columns(len(DNF_CATEGORIES) + 1)
+            cols[0].metric("Classified", int(race_counts['Finished'] + race_counts['Lapped']))
+            for col, category in zip(cols[1:], DNF_CATEGORIES):
+                col.metric(category, int(race_counts[category]))
+
+        season = season_reliability(year, data)
+        if season.empty:
+            st.info("No results recorded for this season")
+            return
+        constructor_names = data['constructors'].set_index('constructorId')['name']
+        season = season.assign(constructor=season['constructorId'].map(constructor_names).fillna('Unknown'))
+
+        counts = season.melt(id_vars='constructor', value_vars=STATUS_CATEGORIES, var_name='category', value_name='count')
+        fig_season = px.bar(
+            counts[counts['count'] > 0],
+            x='constructor',
+            y='count',
+            color='category',
+            category_orders={'category': STATUS_CATEGORIES, 'constructor': list(season['constructor'])},
+            color_discrete_map=CATEGORY_COLORS,
+            title=f"{year} Results by Outcome (fewest mechanical failures first)",
+            labels={'constructor': '', 'count': 'Entries', 'category': 'Outcome'}
+        )
+        fig_season.update_layout(height=500, xaxis_title="", yaxis_title="Entries", font=dict(size=14))
+        st.plotly_chart(fig_season, use_container_width=True)
+
+        st.dataframe(
+            pd.DataFrame({
+                'Constructor': season['constructor'],
+                'Starts': season['starts'],
+                'Finish Rate': season['finish_rate'].map(_percent),
+                'Mechanical DNFs': season['Mechanical'],
+                'Accidents': season['Accident'],
+                'Other DNFs': season['Other'],
+                'Mechanical Rate': season['mechanical_rate'].map(_percent),
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+
+        with st.expander("Reliability across seasons"):
+            history = reliability_by_season(data)
+            trend = history.melt(id_vars='year', value_vars=['mechanical_rate', 'accident_rate'],
+                                 var_name='rate', value_name='share')
+            trend['rate'] = trend['rate'].map({'mechanical_rate': 'Mechanical', 'accident_rate': 'Accident'})
+            fig_history = px.line(
+                trend,
+                x='year',
+                y='share',
+                color='rate',
+                color_discrete_map=CATEGORY_COLORS,
+                title="Share of Starts Ending in a Retirement",
+                labels={'year': 'Season', 'share': 'Share of Starts', 'rate': 'Cause'}
+            )
+            fig_history.update_layout(height=400, yaxis_tickformat='.0%', font=dict(size=14))
+            st.plotly_chart(fig_history, use_container_width=True)
+
+        st.caption("Statuses are grouped into outcome categories when the data is loaded. Wing damage counts as "
+                   "an accident; tyre failures, running out of fuel and other driver or team errors count as "
+                   "Other. Recent seasons record many retirements only as 'Retired', which is counted as Other.")
+    except Exception as e:
+        st.error(f"Error loading reliability data: {e}")
+        st.info("Reliability analysis not available")
@@ -0,0 +1,89 @@
+"""Season comparison page display functions"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from season_summary import season_summaries, compare_seasons
+
+# Seasons compared by default (the latest ones with races)
+DEFAULT_SEASONS = 3
+
+# Summary columns charted across seasons: column -> (label, format)
+SEASON_METRICS = {
+    'races': ("Races", "{:.0f}"),
+    'different_winners': ("Different Winners", "{:.0f}"),
+    'different_pole_sitters': ("Different Pole Sitters", "{:.0f}"),
+    'title_margin': ("Drivers' Title Margin (pts)", "{:g}"),
+    'constructor_title_margin': ("Constructors' Title Margin (pts)", "{:g}"),
+    'avg_winning_margin': ("Average Winning Margin (s)", "{:.3f}"),
+    'dnf_rate': ("DNF Rate", "{:.1%}"),
+    'mechanical_rate': ("Mechanical DNF Rate", "{:.1%}"),
+    'lead_changes': ("Lead Changes", "{:.0f}"),
+    'lead_changes_per_race': ("Lead Changes per Race", "{:.2f}"),
+}
+
+def _format(value, fmt):
+    """Format a summary value, '-' when missing"""
+    return '-' if pd.isna(value) else fmt.format(value)
+
+def _standings_top(compared, prefix, names):
+    """Champion of each complete season, the leader marked '(leading)' for seasons still in progress"""
+    return ['-' if pd.isna(leader) else names.get(leader, '-') + ('' if complete else ' (leading)')
+            for leader, complete in zip(compared[f'{prefix}leader_id'], compared['complete'])]
+
+def display_season_comparison_page(data):
+    """Display two or more seasons side by side from the precomputed season summaries"""
+    st.markdown("# 📊 Season Comparison")
+
+    try:
+        summary = season_summaries(data)
+        seasons = [int(year) for year in summary.index[summary['races'] > 0]]
+        if not seasons:
+            st.info("No seasons with results available")
+            return
+        selected = st.multiselect("Seasons", seasons[::-1], default=seasons[::-1][:DEFAULT_SEASONS], key="season_compare")
+        if len(selected) < 2:
+            st.info("Select at least two seasons to compare")
+            return
+        selected = sorted(selected)
+        compared = compare_seasons(selected, data)
+
+        drivers = data['drivers'].set_index('driverId')
+        driver_names = drivers['forename'] + ' ' + drivers['surname']
+        constructor_names = data['constructors'].set_index('constructorId')['name']
+
+        rows = [("Drivers' Champion", _standings_top(compared, '', driver_names)),
+                ("Constructors' Champion", _standings_top(compared, 'constructor_', constructor_names))]
+        rows += [(label, [_format(value, fmt) for value in compared[column]])
+                 for column, (label, fmt) in SEASON_METRICS.items()]
+        st.dataframe(
+            pd.DataFrame([values for _, values in rows], index=[label for label, _ in rows],
+                         columns=[str(year) for year in selected]),
+            use_container_width=True
+        )
+        st.caption("Title margins are the final standings gap between champion and runner-up; for a season "
+                   "still in progress they are the current leader's lead. Winning margins "
+                   "only count races where the runner-up finished on the lead lap; lead changes need lap charts "
+                   "(from 1996).")
+
+        metric = st.selectbox("Trend", list(SEASON_METRICS), index=list(SEASON_METRICS).index('different_winners'),
+                              format_func=lambda column: SEASON_METRICS[column][0], key="season_trend_metric")
+        trend = summary[summary['races'] > 0][[metric]].reset_index()
+        trend['Compared'] = trend['year'].isin(selected).map({True: 'Selected', False: 'Other seasons'})
+        fig_trend = px.bar(
+            trend,
+            x='year',
+            y=metric,
+            color='Compared',
+            color_discrete_map={'Selected': '#E10600', 'Other seasons': '#B0B0B0'},
+            title=f"{SEASON_METRICS[metric][0]} by Season",
+            labels={'year': 'Season', metric: SEASON_METRICS[metric][0], 'Compared': ''}
+        )
+        if metric in ('dnf_rate', 'mechanical_rate'):
+            fig_trend.update_yaxes(tickformat='.0%')
+        fig_trend.update_layout(height=450, xaxis_title="Season", yaxis_title=SEASON_METRICS[metric][0], font=dict(size=14))
+        st.plotly_chart(fig_trend, use_container_width=True)
+    except Exception as e:
+        st.error(f"Error loading season comparison: {e}")
+        st.info("Season comparison not available")
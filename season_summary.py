@@ -0,0 +1,158 @@
+"""Season summaries for the F1 Dashboard
+
+One row per season of seasons.csv with the figures the season comparison
+view puts side by side: races, different winners and pole sitters, the
+drivers' and constructors' title margins (champions are only named once
+every scheduled race of the season has results; until then the standings
+leader and lead are kept), the average winning margin, DNF
+and mechanical failure rates and lead changes. Every season is summarized in
+vectorized passes over the whole history and the table is kept in the data
+dictionary under '_season_summary'; on a refresh only the seasons whose
+races changed (as found by career_stats) are summarized again. Like
+race_artifacts, this module must not import streamlit.
+"""
+
+import numpy as np
+import pandas as pd
+
+from career_stats import career_stats, pole_sitters
+from records import race_winners
+from reliability import DNF_CATEGORIES
+from race_artifacts import leadership_stint_table
+
+# Tables whose change re-summarizes every season (season list, race calendar,
+# status categories, lap charts not covered by the career fingerprints)
+FULL_REBUILD_SOURCES = ['seasons', 'races', 'status', 'lap_times']
+
+SUMMARY_COLUMNS = ['races', 'scheduled_races', 'complete', 'different_winners', 'different_pole_sitters',
+                   'leader_id', 'champion_id', 'title_margin',
+                   'constructor_leader_id', 'constructor_champion_id', 'constructor_title_margin', 'avg_winning_margin',
+                   'dnf_rate', 'mechanical_rate', 'lead_changes', 'lead_changes_per_race']
+
+def completed_seasons(races, results):
+    """Whether every scheduled race of each season has results, indexed by year"""
+    scheduled = races['year'].value_counts()
+    held = races.loc[races['raceId'].isin(results['raceId'].unique()), 'year'].value_counts()
+    return held.reindex(scheduled.index, fill_value=0) == scheduled
+
+def _title_margins(standings, races, key):
+    """Leader and points gap to the runner-up in the latest standings of each season"""
+    if standings is None or standings.empty:
+        return pd.DataFrame(columns=['leader_id', 'title_margin'])
+    final = standings.join(races[['year', 'round']], on='raceId', how='inner')
+    final = final[final['round'] == final.groupby('year')['round'].transform('max')]
+    final = final.sort_values(['year', 'position'])
+    rank = final.groupby('year').cumcount()
+    top = final[rank == 0].set_index('year')
+    second = final[rank == 1].set_index('year')['points']
+    return pd.DataFrame({'leader_id': top[key], 'title_margin': top['points'] - second.reindex(top.index)})
+
+def _lead_changes(data, race_years):
+    """Changes of the race leader on the road per season, with the races counted (seasons without lap charts are left out)"""
+    stints = leadership_stint_table(data)
+    stints = stints[stints['raceId'].isin(race_years.index)]
+    if stints.empty:
+        return pd.Series(dtype=float)
+    race = stints['raceId'].to_numpy()
+    driver = stints['driverId'].to_numpy()
+    changes = pd.Series((race[1:] == race[:-1]) & (driver[1:] != driver[:-1]), index=race[1:])
+    per_race = changes.groupby(level=0).sum().reindex(np.unique(race), fill_value=0)
+    return per_race.groupby(race_years.reindex(per_race.index).to_numpy()).agg(['sum', 'size'])
+
+def summarize_seasons(data, years=None):
+    """Summary rows of every season, or only of the given seasons, indexed by year"""
+    seasons = np.sort(data['seasons']['year'].unique()) if 'seasons' in data else np.sort(data['races']['year'].unique())
+    if years is not None:
+        seasons = seasons[np.isin(seasons, list(years))]
+    races = data['races'].set_index('raceId')
+    races = races[races['year'].isin(seasons)]
+    race_years = races['year']
+    results = data['results'][data['results']['raceId'].isin(races.index)]
+    summary = pd.DataFrame(index=pd.Index(seasons, name='year'), columns=SUMMARY_COLUMNS, dtype=float)
+
+    winners = race_winners(data, races.index)
+    summary['races'] = results['raceId'].groupby(results['raceId'].map(race_years)).nunique()
+    summary['scheduled_races'] = race_years.value_counts()
+    # Champions are only named once every scheduled race has results
+    complete = completed_seasons(races.reset_index(), results).reindex(summary.index, fill_value=False)
+    summary['different_winners'] = winners.groupby('year')['driverId'].nunique()
+    qualifying = data['qualifying'][data['qualifying']['raceId'].isin(races.index)]
+    poles = pole_sitters(results, qualifying)
+    summary['different_pole_sitters'] = poles.groupby(poles['raceId'].map(race_years))['driverId'].nunique()
+    summary['avg_winning_margin'] = winners.groupby('year')['margin'].mean()
+
+    for prefix, table_key, key in [('', 'driver_standings', 'driverId'),
+                                   ('constructor_', 'constructor_standings', 'constructorId')]:
+        standings = data.get(table_key)
+        if standings is not None:
+            standings = standings[standings['raceId'].isin(races.index)]
+        margins = _title_margins(standings, races, key)
+        summary[f'{prefix}leader_id'] = margins['leader_id']
+        summary[f'{prefix}champion_id'] = margins['leader_id'].reindex(summary.index).where(complete)
+        summary[f'{prefix}title_margin'] = margins['title_margin']
+
+    if 'status_category' in results:
+        category = results['status_category']
+        started = category != 'Did Not Start'
+        year = results['raceId'].map(race_years)
+        starts = started.groupby(year).sum()
+        summary['dnf_rate'] = category.isin(DNF_CATEGORIES).groupby(year).sum() / starts.where(starts > 0)
+        summary['mechanical_rate'] = (category == 'Mechanical').groupby(year).sum() / starts.where(starts > 0)
+
+    lead_changes = _lead_changes(data, race_years)
+    if not lead_changes.empty:
+        summary['lead_changes'] = lead_changes['sum']
+        summary['lead_changes_per_race'] = lead_changes['sum'] / lead_changes['size']
+
+    summary[['races', 'scheduled_races']] = summary[['races', 'scheduled_races']].fillna(0).astype(int)
+    summary['complete'] = complete
+    ids = ['leader_id', 'champion_id', 'constructor_leader_id', 'constructor_champion_id']
+    summary[ids] = summary[ids].astype('Int64')
+    return summary
+
+def season_summaries(data):
+    """Season summary table of a snapshot, built in full on first access
+
+    The career state is built alongside: its race fingerprints find the
+    seasons to re-summarize on a refresh.
+    """
+    if '_season_summary' not in data:
+        career_stats(data)
+        data['_season_summary'] = summarize_seasons(data)
+    return data['_season_summary']
+
+def update_season_summary(data, changed, previous_career):
+    """Re-summarize only the seasons whose races changed in a snapshot refresh
+
+    previous_career is the career state before update_career_stats ran; the
+    seasons of the raceIds it found changed are summarized again. Does
+    nothing until the table has been built once.
+    """
+    current = data.get('_season_summary')
+    if current is None:
+        return None
+    if set(changed) & set(FULL_REBUILD_SOURCES):
+        data['_season_summary'] = summarize_seasons(data)
+        return data['_season_summary']
+    career = data.get('_career')
+    if career is None:
+        data['_season_summary'] = summarize_seasons(data)
+        return data['_season_summary']
+    if career is previous_career or not career['changed_races']:
+        return current
+
+    race_ids = list(career['changed_races'])
+    years = set(data['races'].set_index('raceId')['year'].reindex(race_ids).dropna().astype(int))
+    if previous_career is not None:
+        # Seasons of races that were removed
+        years |= set(previous_career['fingerprints']['year'].reindex(race_ids).dropna().astype(int))
+    if not years:
+        return current
+    updated = summarize_seasons(data, years)
+    data['_season_summary'] = pd.concat([current.drop(index=list(years), errors='ignore'), updated]).sort_index()
+    return data['_season_summary']
+
+def compare_seasons(years, data):
+    """Summary rows of the given seasons, in the order given"""
+    summary = season_summaries(data)
+    return summary.reindex([year for year in years if year in summary.index])
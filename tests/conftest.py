@@ -0,0 +1,37 @@
+"""Shared fixtures for the F1 Dashboard tests"""
+
+import os
+import sys
+import shutil
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import data_loader
+from dataset import build_dataset
+
+@pytest.fixture(scope='session')
+def data():
+    """Dataset built once from the repository's f1_data"""
+    cwd = os.getcwd()
+    os.chdir(REPO_DIR)
+    try:
+        data, _ = build_dataset()
+    finally:
+        os.chdir(cwd)
+    return data
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Copy of f1_data in a temporary working directory, with no snapshot loaded
+
+    A data watcher started by the test is stopped before the next one runs.
+    """
+    shutil.copytree(os.path.join(REPO_DIR, 'f1_data'), tmp_path / 'f1_data')
+    monkeypatch.chdir(tmp_path)
+    data_loader.clear_data_cache()
+    yield tmp_path / 'f1_data'
+    data_loader.stop_data_watcher(timeout=5)
+    data_loader.clear_data_cache()
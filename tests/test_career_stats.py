@@ -0,0 +1,17 @@
+"""Career aggregates"""
+
+from career_stats import career_stats, pole_sitters
+
+HAMILTON = 1
+SCHUMACHER = 30
+MALDONADO = 813
+
+def test_pole_counts_match_official_records(data):
+    drivers = career_stats(data)['careers']['drivers']
+    assert drivers.loc[HAMILTON, 'poles'] == 104
+    assert drivers.loc[SCHUMACHER, 'poles'] == 68
+
+def test_pole_sitter_starts_from_grid_slot_one(data):
+    poles = pole_sitters(data['results'], data['qualifying']).set_index('raceId')['driverId']
+    # 2012 Spanish Grand Prix: Hamilton was fastest in qualifying but sent to the back of the grid
+    assert poles[864] == MALDONADO
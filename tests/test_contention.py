@@ -0,0 +1,32 @@
+"""Title contention and clinches"""
+
+import warnings
+
+from contention import points_remaining, title_clinch
+from points_systems import POINTS_SYSTEMS, maximum_points, season_points_system
+
+FERRARI = 6
+HAMILTON = 1
+
+def test_excluded_constructor_is_not_champion(data):
+    # McLaren were excluded from the 2007 constructors' championship
+    assert title_clinch(2007, data, 'constructors')['constructorId'] == FERRARI
+
+def test_double_points_final_keeps_title_open(data):
+    # 2014 was decided at the double-points final round
+    clinch = title_clinch(2014, data)
+    assert clinch['driverId'] == HAMILTON
+    assert clinch['round'] == 19
+
+def test_maximum_points_follow_the_rules():
+    assert maximum_points(POINTS_SYSTEMS['2022']) == (26, 8)
+    assert maximum_points(POINTS_SYSTEMS['2022'], 'constructors') == (44, 15)
+    assert maximum_points(season_points_system(1995)) == (10, 0)
+    assert maximum_points(season_points_system(2025)) == (25, 8)
+
+def test_points_remaining_parses_without_warnings(data):
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        remaining = points_remaining(data)
+    last_round = remaining[remaining['year'] == 2024]['round'].max()
+    assert remaining.loc[(remaining['year'] == 2024) & (remaining['round'] == last_round), 'drivers'].iloc[0] == 0
@@ -0,0 +1,90 @@
+"""Hot reload of changed data files"""
+
+import time
+import threading
+
+import pandas as pd
+
+import data_loader
+from career_stats import career_stats
+from dataset import build_dataset
+from season_summary import season_summaries
+
+NEW_DRIVER = '9999,"hotreload",\\N,"HOT","Hot","Reload","2000-01-01","Test",""\n'
+# More fields than the header: read_csv fails on it
+MALFORMED_ROW = '1,2,3,4,5,6,7,8,9,10,11,12\n'
+
+def _append(path, line):
+    with open(path, 'a') as f:
+        f.write(line)
+
+def test_malformed_csv_keeps_old_table(data_dir):
+    data = data_loader.load_data(watch=False)
+    drivers = data['drivers']
+    original = (data_dir / 'drivers.csv').read_text()
+
+    _append(data_dir / 'drivers.csv', MALFORMED_ROW)
+    data_loader.refresh_data()
+    assert data_loader.load_data(watch=False)['drivers'] is drivers
+
+    # The failed file is retried on the next check once it parses
+    (data_dir / 'drivers.csv').write_text(original + NEW_DRIVER)
+    data_loader.refresh_data()
+    reloaded = data_loader.load_data(watch=False)['drivers']
+    assert len(reloaded) == len(drivers) + 1
+    assert 9999 in set(reloaded['driverId'])
+
+def test_unchanged_files_keep_snapshot(data_dir):
+    data = data_loader.load_data(watch=False)
+    assert data_loader.refresh_data() == []
+    assert data_loader.load_data(watch=False) is data
+
+def test_watcher_serves_new_snapshot(data_dir):
+    data = data_loader.load_data(watch=False)
+    drivers_before = len(data['drivers'])
+    results = data['results']
+    data_loader.start_data_watcher(interval=0.1)
+
+    _append(data_dir / 'drivers.csv', NEW_DRIVER)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        current = data_loader.load_data(watch=False)
+        if len(current['drivers']) == drivers_before + 1:
+            break
+        time.sleep(0.05)
+    else:
+        raise AssertionError("The watcher did not swap in the changed drivers.csv")
+
+    # Unchanged tables are shared with the old snapshot, which is left as it was
+    assert current['results'] is results
+    assert len(data['drivers']) == drivers_before
+
+    data_loader.stop_data_watcher(timeout=5)
+    assert not any(thread.name == 'f1-data-watcher' for thread in threading.enumerate())
+
+def test_reload_updates_derived_state(data_dir):
+    data = data_loader.load_data(watch=False)
+    summary = season_summaries(data)
+    career = career_stats(data)
+
+    # Drop the results of the latest race with results
+    results = pd.read_csv(data_dir / 'results.csv')
+    races = data['races'].set_index('raceId')
+    last_race = races.loc[results['raceId'].unique()].sort_values(['year', 'round']).index[-1]
+    year = int(races.loc[last_race, 'year'])
+    results[results['raceId'] != last_race].to_csv(data_dir / 'results.csv', index=False, na_rep='\\N')
+    data_loader.refresh_data()
+
+    reloaded = data_loader.load_data(watch=False)
+    assert reloaded is not data
+    assert reloaded['_career'] is not career
+    assert last_race in reloaded['_career']['changed_races']
+    assert reloaded['_season_summary'].loc[year, 'races'] == summary.loc[year, 'races'] - 1
+    # The old snapshot keeps its own derived state
+    assert data['_season_summary'] is summary
+
+    # Derived state updated in place of a full rebuild matches one
+    rebuilt, _ = build_dataset()
+    pd.testing.assert_frame_equal(reloaded['_season_summary'], season_summaries(rebuilt))
+    pd.testing.assert_frame_equal(reloaded['_career']['careers']['drivers'],
+                                  career_stats(rebuilt)['careers']['drivers'])
@@ -0,0 +1,23 @@
+"""What-if champions under another points system"""
+
+from points_systems import POINTS_SYSTEMS, what_if_champions
+
+SCHUMACHER = 30
+VILLENEUVE = 35
+
+def test_excluded_driver_cannot_win(data):
+    champions = what_if_champions(data, POINTS_SYSTEMS['current']).set_index('year')
+    # Schumacher was excluded from the 1997 championship
+    assert champions.loc[1997, 'driverId'] == VILLENEUVE
+    # The exclusion only applies to that season
+    assert champions.loc[1995, 'driverId'] == SCHUMACHER
+
+def test_seasons_in_progress_are_skipped(data):
+    races = data['races']
+    run = races['raceId'].isin(data['results']['raceId'])
+    in_progress = set(races.loc[~run & races['year'].isin(races.loc[run, 'year']), 'year'])
+    assert 2025 in in_progress
+
+    champions = what_if_champions(data, POINTS_SYSTEMS['current'])
+    assert not set(champions['year']) & in_progress
+    assert champions['actual_driverId'].notna().all()
@@ -0,0 +1,38 @@
+"""JSON service encoding and validators"""
+
+import gzip
+import json
+
+import pytest
+
+from race_api import RaceDataService, accepts_gzip, race_payload
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip', True),
+    ('gzip, deflate, br', True),
+    ('deflate, gzip;q=0.5', True),
+    ('GZIP', True),
+    ('x-gzip', True),
+    ('*', True),
+    ('gzip;q=0', False),
+    ('gzip; q=0.0, deflate', False),
+    ('br, *;q=0', False),
+    ('deflate', False),
+    ('', False),
+])
+def test_accepts_gzip(header, expected):
+    assert accepts_gzip(header) == expected
+
+def test_etag_is_cached_with_its_body(data):
+    service = RaceDataService(data)
+    etag, body, compressed = service.response('/race/1144', race_payload, 1144)
+    assert gzip.decompress(compressed) == body
+    assert json.loads(body)['race']['raceId'] == 1144
+
+    # Served again from the cache with the same validator
+    assert service.response('/race/1144', race_payload, 1144) == (etag, body, compressed)
+    other_etag, other_body, _ = service.response('/race/1143', race_payload, 1143)
+    assert other_body != body and other_etag != etag
+
+def test_unknown_race_is_not_found(data):
+    assert RaceDataService(data).response('/race/999999', race_payload, 999999) is None
@@ -0,0 +1,45 @@
+"""Result status classification"""
+
+import pandas as pd
+import pytest
+
+from reliability import STATUS_CATEGORIES, classify_status, classify_statuses
+
+@pytest.mark.parametrize('status, category', [
+    ('Finished', 'Finished'),
+    ('+1 Lap', 'Lapped'),
+    ('+3 Laps', 'Lapped'),
+    ('Engine', 'Mechanical'),
+    ('Gearbox', 'Mechanical'),
+    ('Fuel pump', 'Mechanical'),
+    ('Collision', 'Accident'),
+    ('Front wing', 'Accident'),
+    ('Rear wing', 'Accident'),
+    ('Broken wing', 'Accident'),
+    ('Tyre', 'Other'),
+    ('Puncture', 'Other'),
+    ('Tyre puncture', 'Other'),
+    ('Out of fuel', 'Other'),
+    ('Refuelling', 'Other'),
+    ('Fuel rig', 'Other'),
+    ('Wheel nut', 'Other'),
+    ('Stalled', 'Other'),
+    ('Handling', 'Other'),
+    ('Safety belt', 'Other'),
+    ('Seat', 'Other'),
+    ('Retired', 'Other'),
+    ('Disqualified', 'Disqualified'),
+    ('Did not qualify', 'Did Not Start'),
+])
+def test_classify_status(status, category):
+    assert classify_status(status) == category
+
+def test_classify_statuses_is_categorical(data):
+    status = classify_statuses(pd.DataFrame({'statusId': [1, 2], 'status': ['Finished', 'Puncture']}))
+    assert list(status['category']) == ['Finished', 'Other']
+    assert list(status['category'].cat.categories) == STATUS_CATEGORIES
+
+    # Every status of the dataset is classified, and loaded results carry the category
+    assert data['status']['category'].notna().all()
+    results = data['results'].merge(data['status'][['statusId', 'status']], on='statusId')
+    assert (results.loc[results['status'] == 'Out of fuel', 'status_category'] == 'Other').all()
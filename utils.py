@@ -3,11 +3,10 @@
 import pandas as pd
 from datetime import datetime
 
-def race_has_sprint(race_id):
+def race_has_sprint(race_id, data):
     """Check if a race has sprint data"""
     try:
-        # Try to load sprint results data
-        sprint_data = pd.read_csv('f1_data/sprint_results.csv')
+        sprint_data = data['sprint_results']
         sprint_results = sprint_data[sprint_data['raceId'] == race_id]
         return not sprint_results.empty
     except Exception:
@@ -0,0 +1,132 @@
+"""What-if standings display functions"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from artifact_store import get_race_artifacts
+from points_systems import POINTS_SYSTEMS, points_system, what_if_standings, what_if_champions
+
+# Drivers shown in the what-if points progression chart
+PROGRESSION_DRIVERS = 10
+
+def parse_points_table(text):
+    """Comma-separated points per finishing position, e.g. '25, 18, 15'"""
+    return [float(value) for value in text.replace(' ', '').split(',') if value]
+
+def select_points_system(key_prefix="what_if"):
+    """Preset or custom points system picked by the user"""
+    options = list(POINTS_SYSTEMS) + ['custom']
+    choice = st.selectbox("Points System", options, key=f"{key_prefix}_system",
+                          format_func=lambda key: POINTS_SYSTEMS[key]['label'] if key in POINTS_SYSTEMS else "Custom")
+    if choice != 'custom':
+        return POINTS_SYSTEMS[choice]
+
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        race = st.text_input("Race Points", "25, 18, 15, 12, 10, 8, 6, 4, 2, 1", key=f"{key_prefix}_race_points")
+    with col2:
+        sprint = st.text_input("Sprint Points", "8, 7, 6, 5, 4, 3, 2, 1", key=f"{key_prefix}_sprint_points")
+    with col3:
+        fastest_lap = st.number_input("Fastest Lap", min_value=0.0, value=1.0, step=0.5, key=f"{key_prefix}_fastest_lap")
+    return points_system(parse_points_table(race), parse_points_table(sprint), fastest_lap, fastest_lap_top=10)
+
+def _position_change(what_if, actual):
+    """Arrow and places gained (▲) or lost (▼) against the actual standings"""
+    if pd.isna(actual):
+        return '-'
+    change = int(actual) - int(what_if)
+    if change > 0:
+        return f"▲{change}"
+    if change < 0:
+        return f"▼{-change}"
+    return "="
+
+def _standings_table(after, actual, key, names):
+    """What-if standings after a round next to the actual positions and points"""
+    actual = pd.DataFrame(actual)
+    actual = actual.set_index(key) if not actual.empty else pd.DataFrame(columns=['POS.', 'POINTS'])
+    actual_position = pd.to_numeric(after[key].map(actual['POS.']), errors='coerce')
+    return pd.DataFrame({
+        'Pos': after['position'],
+        'Driver' if key == 'driverId' else 'Constructor': after[key].map(names).fillna('Unknown'),
+        'Points': after['points'].map(lambda points: f"{points:g}"),
+        'Wins': after['wins'],
+        'Actual Pos': actual_position.map(lambda position: '-' if pd.isna(position) else str(int(position))),
+        'Actual Points': after[key].map(actual['POINTS']).map(lambda points: '-' if pd.isna(points) else f"{points:g}"),
+        'Change': [_position_change(what_if, actual) for what_if, actual in zip(after['position'], actual_position)],
+    })
+
+def display_what_if_standings(race_id, data, artifacts=None):
+    """Display the championship standings after this race re-scored under another points system"""
+    st.markdown("### What-If Standings")
+
+    try:
+        if artifacts is None:
+            artifacts = get_race_artifacts(race_id, data)
+        race = data['races'].set_index('raceId').loc[race_id]
+        system = select_points_system()
+        standings = what_if_standings(int(race['year']), data, system)
+
+        drivers = standings['drivers']
+        drivers = drivers[drivers['round'] <= race['round']]
+        if drivers.empty:
+            st.info("No results to re-score for this season yet")
+            return
+        after = drivers[drivers['round'] == drivers['round'].max()]
+
+        driver_names = data['drivers'].set_index('driverId')
+        driver_names = driver_names['forename'] + ' ' + driver_names['surname']
+        constructor_names = data['constructors'].set_index('constructorId')['name']
+
+        st.caption(f"Standings after round {int(after['round'].iloc[0])} of {int(race['year'])} under "
+                   f"{system['label']}; ties are broken by countback. Dropped scores and other historical "
+                   f"rules are not applied.")
+        st.dataframe(_standings_table(after, artifacts['driver_standings'], 'driverId', driver_names),
+                     use_container_width=True, hide_index=True)
+
+        leaders = after['driverId'].head(PROGRESSION_DRIVERS)
+        progression = drivers[drivers['driverId'].isin(leaders)].assign(driver_name=lambda df: df['driverId'].map(driver_names))
+        fig_progression = px.line(
+            progression,
+            x='round',
+            y='points',
+            color='driver_name',
+            title="What-If Points Progression",
+            labels={'round': 'Race Round', 'points': 'Points', 'driver_name': 'Driver'},
+            markers=True
+        )
+        try:
+            from graph_styling import apply_team_colors_to_existing_chart
+            fig_progression = apply_team_colors_to_existing_chart(fig_progression, progression, 'driver_name', data, race_id)
+        except:
+            pass
+        fig_progression.update_layout(height=500, xaxis_title="Race Round", yaxis_title="Points", font=dict(size=14))
+        st.plotly_chart(fig_progression, use_container_width=True)
+
+        constructors = standings['constructors']
+        constructors = constructors[constructors['round'] == after['round'].iloc[0]]
+        if not constructors.empty:
+            st.markdown("**Constructors:**")
+            st.dataframe(_standings_table(constructors, artifacts['constructor_standings'], 'constructorId', constructor_names),
+                         use_container_width=True, hide_index=True)
+
+        with st.expander("Champions under this system"):
+            champions = what_if_champions(data, system)
+            changed = champions[champions['actual_driverId'].notna() & (champions['driverId'] != champions['actual_driverId'])]
+            st.caption(f"{len(changed)} of {int(champions['actual_driverId'].notna().sum())} drivers' championships "
+                       f"change hands under {system['label']}.")
+            if not changed.empty:
+                st.dataframe(
+                    pd.DataFrame({
+                        'Season': changed['year'],
+                        'What-If Champion': changed['driverId'].map(driver_names),
+                        'Points': changed['points'].map(lambda points: f"{points:g}"),
+                        'Actual Champion': changed['actual_driverId'].map(driver_names),
+                    }),
+                    use_container_width=True,
+                    hide_index=True
+                )
+    except Exception as e:
+        st.error(f"Error loading what-if standings: {e}")
+        st.info("What-if standings not available")